@@ -0,0 +1,81 @@
+"""
+Overhead per pydbg_obj(...) statement in every PyDBG_Obj mode.
+
+Usage: python -m benchmarks.bench_pydbg_modes [--number N]
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import argparse
+import inspect
+import textwrap
+import timeit
+
+import pycolor_palette_loguru.logger.logger as pydbg_logger
+from pycolor_palette_loguru.logger.strip import strip_calls
+
+
+def statement(pydbg_obj, value):
+    pydbg_obj(value, 42)
+
+
+def baseline(pydbg_obj, value):
+    pass
+
+
+def stripped_statement():
+    """
+    Get statement function compiled without pydbg_obj call.
+
+    :returns:   function
+    :rtype:     Callable
+    """
+    source = textwrap.dedent(inspect.getsource(statement))
+    namespace = {}
+    exec(compile(strip_calls(source), __file__, "exec"), namespace)
+    return namespace["statement"]
+
+
+def measure(function, pydbg_obj, number: int) -> float:
+    """
+    Measure the best time of function call.
+
+    :param      function:   The function
+    :type       function:   Callable
+    :param      pydbg_obj:  The PyDBG_Obj
+    :type       pydbg_obj:  PyDBG_Obj
+    :param      number:     The number of calls per repeat
+    :type       number:     int
+
+    :returns:   nanoseconds per call
+    :rtype:     float
+    """
+    timer = timeit.Timer(lambda: function(pydbg_obj, 12))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=20000)
+    number = parser.parse_args().number
+
+    pydbg_obj = pydbg_logger.PyDBG_Obj(outputFunction=lambda text: None)
+
+    results = {"enabled (no output)": measure(statement, pydbg_obj, number // 10)}
+
+    pydbg_obj.disable()
+    results["disabled"] = measure(statement, pydbg_obj, number)
+
+    pydbg_logger.setProductionMode(True)
+    results["production mode"] = measure(statement, pydbg_obj, number)
+    pydbg_logger.setProductionMode(False)
+
+    results["stripped"] = measure(stripped_statement(), pydbg_obj, number)
+
+    empty = measure(baseline, pydbg_obj, number)
+    for mode, elapsed in results.items():
+        print(f"{mode:>20}: {max(elapsed - empty, 0.0):10.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Throughput of pydbg_obj(...) calls from N threads writing to one file.
+
+Formatting takes no lock, so throughput is limited by the GIL (or by cores on
+free-threaded builds) and the output file, not by PyDBG_Obj.
+
+Usage: python -m benchmarks.bench_threads [--calls N] [--threads 1 2 4 8]
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import pycolor_palette_loguru.logger.logger as pydbg_logger
+from pycolor_palette_loguru.sinks import write_atomic
+
+
+def run(pydbg_obj, threads: int, calls: int) -> float:
+    """
+    Run calls from threads.
+
+    :param      pydbg_obj:  The PyDBG_Obj
+    :type       pydbg_obj:  PyDBG_Obj
+    :param      threads:    The number of threads
+    :type       threads:    int
+    :param      calls:      The number of calls per thread
+    :type       calls:      int
+
+    :returns:   calls per second
+    :rtype:     float
+    """
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for i in range(calls):
+            pydbg_obj(i, threads)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+
+    return threads * calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pydbg.log")
+
+        with open(path, "a", encoding="utf-8") as stream:
+            pydbg_obj = pydbg_logger.PyDBG_Obj(
+                outputFunction=lambda text: write_atomic(stream, f"{text}\n")
+            )
+
+            for threads in args.threads:
+                throughput = run(pydbg_obj, threads, args.calls)
+                print(f"{threads:>3} threads: {throughput:12.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
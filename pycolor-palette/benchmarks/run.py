@@ -0,0 +1,315 @@
+"""
+Benchmark suite of the hot paths: paint messages, PyDBG_Obj calls, colorize,
+argumentToString, InterceptHandler and import time.
+
+Results are saved as JSON (ns per operation, lower is better). With a
+baseline file the run fails if a benchmark is slower than the baseline by
+more than the threshold.
+
+Usage: python -m benchmarks.run [--output FILE] [--baseline FILE]
+                                [--threshold 0.2] [--quick] [NAME ...]
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import argparse
+import io
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_THRESHOLD = 0.2  # Allowed slowdown relative to baseline.
+REPEAT = 5
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str) -> Callable:
+    """
+    Register benchmark function. It gets the scale (1 for full runs) and
+    returns ns per operation.
+
+    :param      name:  The name
+    :type       name:  str
+
+    :returns:   decorator
+    :rtype:     Callable
+    """
+
+    def register(function: Callable[[float], float]) -> Callable[[float], float]:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def measure(function: Callable[[], object], number: int) -> float:
+    """
+    Measure the best time of function call.
+
+    :param      function:  The function
+    :type       function:  Callable[[], object]
+    :param      number:    The number of calls per repeat
+    :type       number:    int
+
+    :returns:   nanoseconds per call
+    :rtype:     float
+    """
+    number = max(int(number), 1)
+    return min(timeit.repeat(function, repeat=REPEAT, number=number)) / number * 1e9
+
+
+class NullStream(io.TextIOBase):
+    """
+    Stream which discards everything.
+    """
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+@benchmark("paint.info_message")
+def bench_info_message(scale: float) -> float:
+    from pycolor_palette_loguru import paint, sinks
+
+    sink = sinks.get_sink()
+    sinks.set_sink(sinks.StreamSink(NullStream()))
+    try:
+        return measure(lambda: paint.info_message("service started"), 20000 * scale)
+    finally:
+        sinks.set_sink(sink)
+
+
+def pydbg_statement(pydbg_obj, value):
+    pydbg_obj(value, 42)
+
+
+@benchmark("PyDBG_Obj.enabled")
+def bench_pydbg_enabled(scale: float) -> float:
+    from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+
+    pydbg_obj = PyDBG_Obj(outputFunction=lambda text: None)
+    return measure(lambda: pydbg_statement(pydbg_obj, 12), 2000 * scale)
+
+
+@benchmark("PyDBG_Obj.disabled")
+def bench_pydbg_disabled(scale: float) -> float:
+    from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+
+    pydbg_obj = PyDBG_Obj(outputFunction=lambda text: None)
+    pydbg_obj.disable()
+    return measure(lambda: pydbg_statement(pydbg_obj, 12), 50000 * scale)
+
+
+def colorize_benchmark(theme_name: str) -> Callable[[float], float]:
+    def bench_colorize(scale: float) -> float:
+        import pycolor_palette_loguru.logger.logger as pydbg_logger
+        from pycolor_palette_loguru import pygments_colorschemes
+
+        # distinct lines, so every line is highlighted and not cached
+        lines = [
+            f"pydbg_obj | value_{i}: {i}; items: [{i}, 'text', 1.5, None]"
+            for i in range(max(int(2000 * scale), 1))
+        ]
+
+        def colorize_lines():
+            pydbg_logger.highlightCache.clear()
+            for line in lines:
+                pydbg_logger.colorize(line)
+
+        theme = pydbg_logger.default_theme
+        pydbg_logger.set_default_theme(getattr(pygments_colorschemes, theme_name))
+        try:
+            return measure(colorize_lines, 1) / len(lines)
+        finally:
+            if theme is not None:
+                pydbg_logger.set_default_theme(theme.style, theme.mode)
+
+    return bench_colorize
+
+
+for _theme_name in ("CatppuccinMocha", "SolarizedDark", "GruvboxDark"):
+    benchmark(f"colorize.{_theme_name}")(colorize_benchmark(_theme_name))
+
+
+@benchmark("argumentToString.large_container")
+def bench_argument_to_string(scale: float) -> float:
+    from pycolor_palette_loguru.logger.logger import argumentToString
+
+    container = {i: list(range(10)) for i in range(int(200000 * scale) or 1)}
+    return measure(lambda: argumentToString(container), 10)
+
+
+@benchmark("InterceptHandler.emit")
+def bench_intercept_handler(scale: float) -> float:
+    from loguru import logger
+
+    from pycolor_palette_loguru.logger.logger import InterceptHandler
+
+    stdlib_logger = logging.getLogger("pycolor_palette_benchmark")
+    stdlib_logger.propagate = False
+    stdlib_logger.setLevel(logging.DEBUG)
+    handler = InterceptHandler()
+    stdlib_logger.addHandler(handler)
+
+    logger.remove()
+    handler_id = logger.add(NullStream(), level="DEBUG")
+    try:
+        return measure(lambda: stdlib_logger.info("request %d", 1), 10000 * scale)
+    finally:
+        logger.remove(handler_id)
+        logger.add(sys.stderr)
+        stdlib_logger.removeHandler(handler)
+
+
+def run_interpreter(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+@benchmark("import")
+def bench_import(scale: float) -> float:
+    repeat = max(int(REPEAT * scale), 1)
+    startup = min(run_interpreter("pass") for _ in range(repeat))
+    imported = min(
+        run_interpreter("import pycolor_palette_loguru") for _ in range(repeat)
+    )
+    return max(imported - startup, 0.0) * 1e9
+
+
+def run_benchmarks(names: List[str], scale: float = 1.0) -> Dict[str, float]:
+    """
+    Run benchmarks.
+
+    :param      names:  The names of benchmarks
+    :type       names:  List[str]
+    :param      scale:  The scale of iteration counts
+    :type       scale:  float
+
+    :returns:   ns per operation by name
+    :rtype:     Dict[str, float]
+    """
+    results = {}
+
+    for name in names:
+        results[name] = BENCHMARKS[name](scale)
+        rate = 1e9 / results[name] if results[name] else float("inf")
+        print(f"{name:>34}: {format_ns(results[name])} {rate:14.1f} ops/s")
+
+    return results
+
+
+def format_ns(value: float) -> str:
+    """
+    Format duration.
+
+    :param      value:  The value (ns)
+    :type       value:  float
+
+    :returns:   formatted duration
+    :rtype:     str
+    """
+    for unit, size in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if value >= size:
+            return f"{value / size:10.2f} {unit}"
+
+    return f"{value:10.1f} ns"
+
+
+def find_regressions(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Dict[str, float]:
+    """
+    Find benchmarks slower than baseline by more than threshold.
+
+    :param      results:    The results (ns per operation)
+    :type       results:    Dict[str, float]
+    :param      baseline:   The baseline results
+    :type       baseline:   Dict[str, float]
+    :param      threshold:  The allowed slowdown (0.2 is 20%)
+    :type       threshold:  float
+
+    :returns:   slowdown ratio by name
+    :rtype:     Dict[str, float]
+    """
+    regressions = {}
+
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base and value > base * (1 + threshold):
+            regressions[name] = value / base - 1
+
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, float]:
+    """
+    Load results saved by main.
+
+    :param      path:  The path
+    :type       path:  str
+
+    :returns:   ns per operation by name
+    :rtype:     Dict[str, float]
+    """
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("names", nargs="*", metavar="NAME", help="benchmarks to run")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--baseline", help="compare with results saved before")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--quick", action="store_true", help="fewer iterations")
+    parser.add_argument("--list", action="store_true", help="list benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(args.names or list(BENCHMARKS), 0.1 if args.quick else 1)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "unit": "ns",
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.baseline:
+        regressions = find_regressions(
+            results, load_results(args.baseline), args.threshold
+        )
+
+        for name, slowdown in regressions.items():
+            print(f"regression: {name} is {slowdown:.0%} slower than baseline")
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,3 @@
-from pycolor_palette_loguru.logger import (
-    PyDBG_Obj,
-    benchmark,
-    set_default_theme,
-    debug_func,
-    setup_logger,
-)
 from pycolor_palette_loguru.paint import (
     info_message,
     warn_message,
@@ -16,28 +9,47 @@ from pycolor_palette_loguru.paint import (
     run_exception,
     BG,
 )
-from pycolor_palette_loguru.pygments_colorschemes import (
-    CatppuccinMocha,
-    SolarizedDark,
-    GruvboxDark,
-)
+from pycolor_palette_loguru.context import bind_context
+from pycolor_palette_loguru.lazy import lazy_attributes
+from pycolor_palette_loguru.ratelimit import RateLimiter
+
+# Loaded on first access (PEP 562): they pull in pygments, executing, colorama
+# and loguru, which are not needed to use paint.
+_LAZY_ATTRIBUTES = {
+    "PyDBG_Obj": "pycolor_palette_loguru.logger",
+    "benchmark": "pycolor_palette_loguru.logger",
+    "set_default_theme": "pycolor_palette_loguru.logger",
+    "debug_func": "pycolor_palette_loguru.logger",
+    "setup_logger": "pycolor_palette_loguru.logger",
+    "CatppuccinMocha": "pycolor_palette_loguru.pygments_colorschemes",
+    "SolarizedDark": "pycolor_palette_loguru.pygments_colorschemes",
+    "GruvboxDark": "pycolor_palette_loguru.pygments_colorschemes",
+}
+
 
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
+
+
+# A star import resolves every name of __all__ and so loads the lazy modules;
+# import names explicitly to keep the import light.
 __all__ = (
-    PyDBG_Obj,
-    benchmark,
-    set_default_theme,
-    debug_func,
-    setup_logger,
-    info_message,
-    error_message,
-    other_message,
-    FG,
-    Style,
-    BG,
-    debug_message,
-    run_exception,
-    BG,
-    CatppuccinMocha,
-    SolarizedDark,
-    GruvboxDark,
+    "PyDBG_Obj",
+    "benchmark",
+    "set_default_theme",
+    "debug_func",
+    "setup_logger",
+    "info_message",
+    "warn_message",
+    "error_message",
+    "other_message",
+    "FG",
+    "Style",
+    "BG",
+    "debug_message",
+    "run_exception",
+    "bind_context",
+    "RateLimiter",
+    "CatppuccinMocha",
+    "SolarizedDark",
+    "GruvboxDark",
 )
@@ -0,0 +1,246 @@
+"""
+asyncio-native output of paint messages and PyDBG_Obj.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import TextIO, Union
+
+from pycolor_palette_loguru.paint import message_template, render_message
+
+DEFAULT_HIGH_WATER = 64 * 1024
+
+
+class AsyncSink:
+    """
+    Event loop friendly sink.
+
+    write() only appends to a buffer; everything written during one loop tick
+    is joined and handed to a single writer thread, so a slow stream never
+    blocks the event loop and writes keep their order. drain() waits only when
+    more than high_water characters are pending.
+
+    A dedicated thread is used instead of a non-blocking pipe transport: making
+    a shared stdio descriptor non-blocking breaks synchronous writers (print,
+    loguru) to the same stream.
+    """
+
+    def __init__(
+        self,
+        stream: Union[TextIO, str, None] = None,
+        high_water: int = DEFAULT_HIGH_WATER,
+    ):
+        """
+        Initialization.
+
+        :param      stream:      The stream or name of sys stream ("stdout" if None)
+        :type       stream:      Union[TextIO, str, None]
+        :param      high_water:  The pending size limit of drain()
+        :type       high_water:  int
+        """
+        self._stream = stream
+        self.high_water = high_water
+
+        self._buffer = []
+        self._pending = 0
+        self._scheduled = False
+        self._last_write = None
+        self._executor = None
+
+    @property
+    def stream(self) -> TextIO:
+        """
+        Target stream.
+
+        :returns:   stream
+        :rtype:     TextIO
+        """
+        if self._stream is None:
+            return sys.stdout
+        elif isinstance(self._stream, str):
+            return getattr(sys, self._stream)
+
+        return self._stream
+
+    def write(self, text: str) -> None:
+        """
+        Append text, it is written at the end of the current loop tick.
+        Must be called from the event loop thread.
+
+        :param      text:  The text
+        :type       text:  str
+        """
+        self._buffer.append(text)
+        self._pending += len(text)
+
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self._write_tick)
+
+    def _write_tick(self) -> None:
+        self._scheduled = False
+
+        if not self._buffer:
+            return
+
+        data = "".join(self._buffer)
+        self._buffer.clear()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pycolor-palette-aio"
+            )
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._write_blocking, data)
+        future.add_done_callback(lambda _: self._written(len(data)))
+        self._last_write = future
+
+    def _write_blocking(self, data: str) -> None:
+        stream = self.stream
+        stream.write(data)
+        stream.flush()
+
+    def _written(self, size: int) -> None:
+        self._pending -= size
+
+    def drain(self) -> asyncio.Future:
+        """
+        Get awaitable which waits for written data if too much is pending.
+
+        :returns:   future
+        :rtype:     asyncio.Future
+        """
+        if self._pending > self.high_water:
+            return self._flush_future()
+
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+    def _flush_future(self) -> asyncio.Future:
+        self._write_tick()
+
+        if self._last_write is None or self._last_write.done():
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(None)
+            return future
+
+        return asyncio.shield(self._last_write)
+
+    async def aflush(self) -> None:
+        """
+        Write pending data and wait until it is written.
+        """
+        await self._flush_future()
+
+    async def aclose(self) -> None:
+        """
+        Flush pending data and stop the writer thread.
+        """
+        await self.aflush()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+stdout_sink = AsyncSink()
+stderr_sink = AsyncSink("stderr")
+
+
+async def _emit(template, text) -> None:
+    stdout_sink.write(f"{render_message(template, text)}\n")
+    await stdout_sink.drain()
+
+
+async def ainfo_message(text: str, highlight: bool = False) -> None:
+    """
+    print info message without blocking the event loop
+
+    :param      text:       The text
+    :type       text:       str
+    :param      highlight:  The highlight
+    :type       highlight:  bool
+    """
+    await _emit(message_template("green", "INFO", highlight), text)
+
+
+async def awarn_message(text: str, highlight: bool = False) -> None:
+    """
+    print warn message without blocking the event loop
+
+    :param      text:       The text
+    :type       text:       str
+    :param      highlight:  The highlight
+    :type       highlight:  bool
+    """
+    await _emit(message_template("yellow", "WARNING", highlight), text)
+
+
+async def aerror_message(text: str, highlight: bool = False) -> None:
+    """
+    print error message without blocking the event loop
+
+    :param      text:       The text
+    :type       text:       str
+    :param      highlight:  The highlight
+    :type       highlight:  bool
+    """
+    await _emit(message_template("red", "ERROR", highlight), text)
+
+
+async def adebug_message(text: str, highlight: bool = False) -> None:
+    """
+    print debug message without blocking the event loop
+
+    :param      text:       The text
+    :type       text:       str
+    :param      highlight:  The highlight
+    :type       highlight:  bool
+    """
+    await _emit(message_template("blue", "DEBUG", highlight), text)
+
+
+async def aother_message(text: str, msg_type: str, highlight: bool = False) -> None:
+    """
+    print message without blocking the event loop
+
+    :param      text:       The text
+    :type       text:       str
+    :param      msg_type:   The message type
+    :type       msg_type:   str
+    :param      highlight:  The highlight
+    :type       highlight:  bool
+    """
+    await _emit(message_template("magenta", msg_type, highlight), text)
+
+
+def acolorized_stderr_print(obj) -> asyncio.Future:
+    """
+    Awaitable output function of PyDBG_Obj, use it with PyDBG_Obj.acall:
+
+    >>> pydbg_obj = PyDBG_Obj(outputFunction=acolorized_stderr_print)
+    >>> await pydbg_obj.acall(value)
+
+    :param      obj:  The object
+    :type       obj:  object
+
+    :returns:   drain future of stderr sink
+    :rtype:     asyncio.Future
+    """
+    from pycolor_palette_loguru.logger.logger import colorizeOutput
+
+    stderr_sink.write(colorizeOutput(obj))
+    return stderr_sink.drain()
+
+
+async def aclose() -> None:
+    """
+    Flush pending output of all async sinks.
+    """
+    await stdout_sink.aclose()
+    await stderr_sink.aclose()
@@ -0,0 +1,115 @@
+"""
+Bounded caches with statistics.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+from collections import OrderedDict, namedtuple
+from typing import Any, Hashable
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+_missing = object()
+
+
+class LRUCache:
+    """
+    Bounded least recently used cache with hit, miss and eviction counters.
+
+    Single operations are safe to use from several threads without a lock,
+    counters are approximate under concurrency.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialization.
+
+        :param      maxsize:     The maximum number of entries
+        :type       maxsize:     int
+
+        :raises     ValueError:  maxsize is not positive
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get cached value and mark it as recently used.
+
+        :param      key:      The key
+        :type       key:      Hashable
+        :param      default:  The default value
+        :type       default:  Any
+
+        :returns:   cached value or default
+        :rtype:     Any
+        """
+        value = self._data.get(key, _missing)
+
+        if value is _missing:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            pass
+
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Put value to cache, evicting the least recently used entry if full.
+
+        :param      key:    The key
+        :type       key:    Hashable
+        :param      value:  The value
+        :type       value:  Any
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            try:
+                self._data.popitem(last=False)
+            except KeyError:
+                break
+            self.evictions += 1
+
+    def clear(self, reset_stats: bool = True) -> None:
+        """
+        Remove all entries.
+
+        :param      reset_stats:  Reset hit, miss and eviction counters
+        :type       reset_stats:  bool
+        """
+        self._data.clear()
+
+        if reset_stats:
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Get cache statistics.
+
+        :returns:   hits, misses, evictions, maxsize and current size
+        :rtype:     CacheInfo
+        """
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._data)
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
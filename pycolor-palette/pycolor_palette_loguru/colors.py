@@ -0,0 +1,186 @@
+"""
+ANSI color escapes: cached truecolor sequences, precomputed 256/16-color tables
+and nearest-color quantization.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+RGB = Tuple[int, int, int]
+
+COLOR_MODES = ("truecolor", "256", "16")
+TRUECOLOR_CACHE_SIZE = 4096
+
+# xterm default system colors
+ANSI_16_PALETTE = (
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+GRAY_LEVELS = tuple(8 + 10 * i for i in range(24))
+
+XTERM_256_PALETTE = (
+    ANSI_16_PALETTE
+    + tuple((r, g, b) for r in CUBE_LEVELS for g in CUBE_LEVELS for b in CUBE_LEVELS)
+    + tuple((v, v, v) for v in GRAY_LEVELS)
+)
+
+FG_256 = tuple(f"\u001b[38;5;{i}m" for i in range(256))
+BG_256 = tuple(f"\u001b[48;5;{i}m" for i in range(256))
+FG_16 = tuple(f"\u001b[{code}m" for code in (*range(30, 38), *range(90, 98)))
+BG_16 = tuple(f"\u001b[{code}m" for code in (*range(40, 48), *range(100, 108)))
+
+
+def _nearest_index(value: float, levels: Tuple[int, ...]) -> int:
+    return min(range(len(levels)), key=lambda i: abs(levels[i] - value))
+
+
+# nearest cube level of every channel value and nearest gray level of every
+# r + g + b sum (the closest gray is the one closest to the channel mean)
+_CUBE_INDEX = tuple(_nearest_index(v, CUBE_LEVELS) for v in range(256))
+_GRAY_INDEX = tuple(
+    _nearest_index(total / 3, GRAY_LEVELS) for total in range(3 * 255 + 1)
+)
+
+_ANSI_16_GRID_BITS = 4
+_ansi_16_table = None
+
+
+def _distance(first: RGB, second: RGB) -> int:
+    return (
+        (first[0] - second[0]) ** 2
+        + (first[1] - second[1]) ** 2
+        + (first[2] - second[2]) ** 2
+    )
+
+
+def rgb_to_256(r: int, g: int, b: int) -> int:
+    """
+    Quantize RGB color to the nearest xterm-256 color (cube or grayscale ramp).
+
+    Uses per-channel lookup tables, the 16 system colors are not used as they
+    are configurable in terminals.
+
+    :param      r:    red color
+    :type       r:    int
+    :param      g:    green color
+    :type       g:    int
+    :param      b:    blue color
+    :type       b:    int
+
+    :returns:   color index (16-255)
+    :rtype:     int
+    """
+    ri, gi, bi = _CUBE_INDEX[r], _CUBE_INDEX[g], _CUBE_INDEX[b]
+    cube = (CUBE_LEVELS[ri], CUBE_LEVELS[gi], CUBE_LEVELS[bi])
+
+    gray_index = _GRAY_INDEX[r + g + b]
+    gray_level = GRAY_LEVELS[gray_index]
+    gray = (gray_level, gray_level, gray_level)
+
+    color = (r, g, b)
+    if _distance(color, gray) < _distance(color, cube):
+        return 232 + gray_index
+
+    return 16 + 36 * ri + 6 * gi + bi
+
+
+def _build_ansi_16_table() -> Tuple[int, ...]:
+    step = 1 << _ANSI_16_GRID_BITS
+    centers = range(step // 2, 256, step)
+    table = []
+
+    for r in centers:
+        for g in centers:
+            for b in centers:
+                table.append(
+                    min(
+                        range(16),
+                        key=lambda i: _distance((r, g, b), ANSI_16_PALETTE[i]),
+                    )
+                )
+
+    return tuple(table)
+
+
+def rgb_to_16(r: int, g: int, b: int) -> int:
+    """
+    Quantize RGB color to the nearest of 16 ANSI colors.
+
+    Uses a lookup table over a 16x16x16 grid of the RGB cube, built on first use.
+
+    :param      r:    red color
+    :type       r:    int
+    :param      g:    green color
+    :type       g:    int
+    :param      b:    blue color
+    :type       b:    int
+
+    :returns:   color index (0-15)
+    :rtype:     int
+    """
+    global _ansi_16_table
+
+    if _ansi_16_table is None:
+        _ansi_16_table = _build_ansi_16_table()
+
+    shift = 8 - _ANSI_16_GRID_BITS
+    bits = _ANSI_16_GRID_BITS
+    return _ansi_16_table[
+        ((r >> shift) << (2 * bits)) | ((g >> shift) << bits) | (b >> shift)
+    ]
+
+
+@lru_cache(maxsize=TRUECOLOR_CACHE_SIZE)
+def fg_truecolor(r: int, g: int, b: int) -> str:
+    return f"\u001b[38;2;{r};{g};{b}m"
+
+
+@lru_cache(maxsize=TRUECOLOR_CACHE_SIZE)
+def bg_truecolor(r: int, g: int, b: int) -> str:
+    return f"\u001b[48;2;{r};{g};{b}m"
+
+
+@lru_cache(maxsize=TRUECOLOR_CACHE_SIZE)
+def fg_256(r: int, g: int, b: int) -> str:
+    return FG_256[rgb_to_256(r, g, b)]
+
+
+@lru_cache(maxsize=TRUECOLOR_CACHE_SIZE)
+def bg_256(r: int, g: int, b: int) -> str:
+    return BG_256[rgb_to_256(r, g, b)]
+
+
+@lru_cache(maxsize=TRUECOLOR_CACHE_SIZE)
+def fg_16(r: int, g: int, b: int) -> str:
+    return FG_16[rgb_to_16(r, g, b)]
+
+
+@lru_cache(maxsize=TRUECOLOR_CACHE_SIZE)
+def bg_16(r: int, g: int, b: int) -> str:
+    return BG_16[rgb_to_16(r, g, b)]
+
+
+# color mode -> (foreground, background) escape functions
+RGB_ESCAPES: Dict[str, Tuple[Callable[..., str], Callable[..., str]]] = {
+    "truecolor": (fg_truecolor, bg_truecolor),
+    "256": (fg_256, bg_256),
+    "16": (fg_16, bg_16),
+}
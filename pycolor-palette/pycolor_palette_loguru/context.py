@@ -0,0 +1,121 @@
+"""
+Context values added to paint messages and PyDBG_Obj output.
+
+Values are bound in a ContextVar, so every thread and every asyncio task
+(which copies the context of the code creating it) has its own stack, e.g. a
+request id bound by a handler is shown only on lines of that request. The
+text added to messages is rendered when values are bound, not per message.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, NamedTuple, Tuple
+
+
+class BoundContext(NamedTuple):
+    """
+    Bound values (converted to str) and their rendered text.
+    """
+
+    items: Tuple[Tuple[str, str], ...]
+    text: str
+
+
+EMPTY_CONTEXT = BoundContext((), "")
+
+_context: ContextVar[BoundContext] = ContextVar(
+    "pycolor_palette_context", default=EMPTY_CONTEXT
+)
+
+
+def render_context(items: Tuple[Tuple[str, str], ...]) -> str:
+    """
+    Render text of context values: "[key=value key=value] ".
+
+    :param      items:  The items
+    :type       items:  Tuple[Tuple[str, str], ...]
+
+    :returns:   text ("" without values)
+    :rtype:     str
+    """
+    if not items:
+        return ""
+
+    return "[%s] " % " ".join(f"{key}={value}" for key, value in items)
+
+
+def push_context(**values) -> Token:
+    """
+    Bind values in the current context, values of the same key are replaced.
+    Use reset_context with the returned token to restore the previous values.
+
+    :param      values:  The values
+    :type       values:  dict
+
+    :returns:   token
+    :rtype:     Token
+    """
+    items = dict(_context.get().items)
+    items.update((key, str(value)) for key, value in values.items())
+    items = tuple(items.items())
+
+    return _context.set(BoundContext(items, render_context(items)))
+
+
+def reset_context(token: Token) -> None:
+    """
+    Restore values bound before push_context.
+
+    :param      token:  The token of push_context
+    :type       token:  Token
+    """
+    _context.reset(token)
+
+
+@contextmanager
+def bind_context(**values) -> Iterator[None]:
+    """
+    Bind values for the duration of with block, e.g.
+    ``with bind_context(request_id=42, task="worker"): ...``
+
+    :param      values:  The values
+    :type       values:  dict
+    """
+    token = push_context(**values)
+
+    try:
+        yield
+    finally:
+        reset_context(token)
+
+
+def get_context() -> Dict[str, str]:
+    """
+    Get bound values.
+
+    :returns:   values
+    :rtype:     Dict[str, str]
+    """
+    return dict(_context.get().items)
+
+
+def context_items() -> Tuple[Tuple[str, str], ...]:
+    """
+    Get bound values as (key, value) pairs.
+
+    :returns:   items
+    :rtype:     Tuple[Tuple[str, str], ...]
+    """
+    return _context.get().items
+
+
+def context_text() -> str:
+    """
+    Get rendered text of bound values ("" without values).
+
+    :returns:   text
+    :rtype:     str
+    """
+    return _context.get().text
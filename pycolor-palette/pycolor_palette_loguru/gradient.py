@@ -0,0 +1,203 @@
+"""
+Bulk colorization of cells and gradient generators built on FG/BG.
+
+NumPy is used when available, otherwise a pure-Python fallback is used.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from pycolor_palette_loguru.paint import BG, FG, Style
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+RGB = Tuple[int, int, int]
+
+
+def _runs(colors) -> List[Tuple[int, int, RGB]]:
+    """
+    Split colors into runs of equal adjacent colors.
+
+    :param      colors:  The colors (sequence of RGB or array of shape (N, 3))
+    :type       colors:  Sequence[RGB]
+
+    :returns:   (start, end, color) runs
+    :rtype:     List[Tuple[int, int, RGB]]
+    """
+    if np is not None:
+        array = np.asarray(colors, dtype=np.int64).reshape(-1, 3)
+        if not len(array):
+            return []
+
+        changes = np.flatnonzero(np.any(array[1:] != array[:-1], axis=1)) + 1
+        starts = np.concatenate(([0], changes)).tolist()
+        ends = starts[1:] + [len(array)]
+        values = array[starts].tolist()
+        return [(s, e, tuple(c)) for s, e, c in zip(starts, ends, values)]
+
+    runs = []
+    previous = None
+
+    for index, color in enumerate(colors):
+        color = tuple(color)
+        if color != previous:
+            if runs:
+                runs[-1][1] = index
+            runs.append([index, index + 1, color])
+            previous = color
+
+    if runs:
+        runs[-1][1] = len(colors)
+
+    return [tuple(run) for run in runs]
+
+
+def colorize_cells(
+    cells: Sequence[str],
+    colors: Sequence[RGB],
+    background: bool = False,
+    reset: bool = True,
+) -> str:
+    """
+    Render cells with per-cell RGB colors into one string.
+
+    Adjacent cells with the same color share one escape sequence.
+
+    :param      cells:       The cells (sequence of strings or a string)
+    :type       cells:       Sequence[str]
+    :param      colors:      The colors (sequence of RGB or array of shape (N, 3))
+    :type       colors:      Sequence[RGB]
+    :param      background:  Color background instead of foreground
+    :type       background:  bool
+    :param      reset:       Append reset sequence
+    :type       reset:       bool
+
+    :returns:   rendered string
+    :rtype:     str
+
+    :raises     ValueError:  cells and colors have different length
+    """
+    if len(cells) != len(colors):
+        raise ValueError("cells and colors must have the same length")
+
+    escape = BG.rgb if background else FG.rgb
+    joined = isinstance(cells, str)
+    parts = []
+
+    for start, end, (r, g, b) in _runs(colors):
+        parts.append(escape(r, g, b))
+        parts.append(cells[start:end] if joined else "".join(cells[start:end]))
+
+    if reset and parts:
+        parts.append(Style.reset)
+
+    return "".join(parts)
+
+
+def linear_gradient(start: RGB, end: RGB, steps: int):
+    """
+    Make linear gradient between two colors.
+
+    :param      start:  The start color
+    :type       start:  RGB
+    :param      end:    The end color
+    :type       end:    RGB
+    :param      steps:  The number of colors
+    :type       steps:  int
+
+    :returns:   colors (array of shape (steps, 3) with NumPy, list of RGB otherwise)
+    :rtype:     Sequence[RGB]
+    """
+    return multi_stop_gradient([start, end], steps)
+
+
+def multi_stop_gradient(
+    stops: Sequence[RGB], steps: int, positions: Optional[Iterable[float]] = None
+):
+    """
+    Make gradient through several color stops.
+
+    :param      stops:       The stop colors
+    :type       stops:       Sequence[RGB]
+    :param      steps:       The number of colors
+    :type       steps:       int
+    :param      positions:   Increasing stop positions in [0, 1], even if None
+    :type       positions:   Optional[Iterable[float]]
+
+    :returns:   colors (array of shape (steps, 3) with NumPy, list of RGB otherwise)
+    :rtype:     Sequence[RGB]
+
+    :raises     ValueError:  invalid stops or positions
+    """
+    if not stops:
+        raise ValueError("at least one stop is required")
+
+    if positions is None:
+        count = len(stops)
+        positions = [i / (count - 1) for i in range(count)] if count > 1 else [0.0]
+    else:
+        positions = list(positions)
+        if len(positions) != len(stops):
+            raise ValueError("positions and stops must have the same length")
+        if any(a > b for a, b in zip(positions, positions[1:])):
+            raise ValueError("positions must be increasing")
+
+    offsets = [i / (steps - 1) for i in range(steps)] if steps > 1 else [0.0] * steps
+
+    if np is not None:
+        stops_array = np.asarray(stops, dtype=np.float64)
+        x = np.asarray(offsets)
+        channels = [np.interp(x, positions, stops_array[:, i]) for i in range(3)]
+        return np.rint(np.stack(channels, axis=1)).astype(np.int64)
+
+    colors = []
+    segment = 0
+
+    for x in offsets:
+        while segment < len(positions) - 2 and x > positions[segment + 1]:
+            segment += 1
+
+        if x <= positions[0]:
+            colors.append(tuple(stops[0]))
+            continue
+        elif x >= positions[-1]:
+            colors.append(tuple(stops[-1]))
+            continue
+
+        left, right = positions[segment], positions[segment + 1]
+        ratio = (x - left) / (right - left) if right > left else 0.0
+        colors.append(
+            tuple(
+                int(round(a + (b - a) * ratio))
+                for a, b in zip(stops[segment], stops[segment + 1])
+            )
+        )
+
+    return colors
+
+
+def gradient_text(
+    text: str, stops: Sequence[RGB], background: bool = False, reset: bool = True
+) -> str:
+    """
+    Color every character of text with a gradient through stops.
+
+    :param      text:        The text
+    :type       text:        str
+    :param      stops:       The stop colors
+    :type       stops:       Sequence[RGB]
+    :param      background:  Color background instead of foreground
+    :type       background:  bool
+    :param      reset:       Append reset sequence
+    :type       reset:       bool
+
+    :returns:   rendered text
+    :rtype:     str
+    """
+    return colorize_cells(
+        text, multi_stop_gradient(stops, len(text)), background, reset
+    )
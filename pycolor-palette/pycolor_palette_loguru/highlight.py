@@ -0,0 +1,129 @@
+"""
+Fast-path highlighter for PyDBG_Obj output.
+
+PyDBG_Obj lines are made of argument labels and reprs of plain values: names,
+numbers, simple strings, brackets, operators and True/False/None. For this
+restricted grammar tokens are matched with one regular expression and mapped
+to the same token types Python3Lexer produces, so the output is identical to
+pygments.highlight with the theme formatter. Text outside the grammar is
+reported as unsupported and should be highlighted by Pygments.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import builtins
+import keyword
+import re
+from typing import Optional
+
+from pygments.token import Keyword, Name, Number, Operator, Punctuation, String, Text
+
+from pycolor_palette_loguru.themes import EscapeTable
+
+_TOKEN_REGEX = re.compile(
+    r"""
+    (?P<space>[ ]+)
+    |(?P<newline>\n)
+    |(?P<float>(?:\d(?:_?\d)*\.(?:\d(?:_?\d)*)?|(?:\d(?:_?\d)*)?\.\d(?:_?\d)*)
+        (?:[eE][+-]?\d(?:_?\d)*)?(?![\w'"])
+        |\d(?:_?\d)*[eE][+-]?\d(?:_?\d)*(?![\w'"]))
+    |(?P<hex>0[xX](?:_?[a-fA-F0-9])+(?![\w'"]))
+    |(?P<oct>0[oO](?:_?[0-7])+(?![\w'"]))
+    |(?P<bin>0[bB](?:_?[01])+(?![\w'"]))
+    |(?P<integer>\d(?:_?\d)*(?![\w'"]))
+    |(?P<name>[A-Za-z_][A-Za-z0-9_]*(?![\w'"]))
+    |(?P<single>'[^\\'"%{\n]*')
+    |(?P<double>"[^\\'"%{\n]*")
+    |(?P<operator>!=|==|<<|>>|:=|[-~+/*%=<>&^|.])
+    |(?P<punctuation>[\[\]{}:(),;])
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+CONSTANTS = frozenset(("True", "False", "None"))
+
+# names which Python3Lexer may highlight as anything but Name
+SPECIAL_NAMES = frozenset(
+    set(keyword.kwlist)
+    | set(getattr(keyword, "softkwlist", ()))
+    | set(dir(builtins))
+    | {"self", "cls", "print", "exec", "unicode", "basestring", "file", "reduce"}
+)
+
+GROUP_TOKEN_TYPES = {
+    "space": Text,
+    "float": Number.Float,
+    "hex": Number.Hex,
+    "oct": Number.Oct,
+    "bin": Number.Bin,
+    "integer": Number.Integer,
+    "operator": Operator,
+    "punctuation": Punctuation,
+}
+
+
+def is_plain_name(name: str) -> bool:
+    """
+    Check if Python3Lexer highlights name as plain Name.
+
+    :param      name:  The name
+    :type       name:  str
+
+    :returns:   True if name is plain, False otherwise.
+    :rtype:     bool
+    """
+    return name not in SPECIAL_NAMES and not (
+        name.startswith("__") and name.endswith("__")
+    )
+
+
+def fast_highlight(text: str, table: EscapeTable) -> Optional[str]:
+    """
+    Highlight text of the restricted PyDBG_Obj grammar.
+
+    :param      text:   The text
+    :type       text:   str
+    :param      table:  The escape table of compiled theme
+    :type       table:  EscapeTable
+
+    :returns:   highlighted text or None if text is not supported
+    :rtype:     Optional[str]
+    """
+    if not text or text[0] == "\n" or text[-1] == "\n" or "\r" in text:
+        return None
+
+    parts = []
+    append = parts.append
+
+    for match in _TOKEN_REGEX.finditer(text):
+        group = match.lastgroup
+        value = match.group()
+
+        if group == "newline":
+            append("\n")
+            continue
+        elif group == "name":
+            if value in CONSTANTS:
+                ttype = Keyword.Constant
+            elif is_plain_name(value):
+                ttype = Name
+            else:
+                return None
+        elif group == "single" or group == "double":
+            on, off = table[String.Single if group == "single" else String.Double]
+            quote = value[0]
+            append(f"{on}{quote}{off}")
+            if len(value) > 2:
+                append(f"{on}{value[1:-1]}{off}")
+            append(f"{on}{quote}{off}")
+            continue
+        elif group == "other":
+            return None
+        else:
+            ttype = GROUP_TOKEN_TYPES[group]
+
+        on, off = table[ttype]
+        append(f"{on}{value}{off}")
+
+    return "".join(parts)
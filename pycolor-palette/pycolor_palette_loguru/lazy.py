@@ -0,0 +1,45 @@
+"""
+Module attributes loaded on first access (PEP 562).
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_attributes(
+    namespace: Dict[str, Any], attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Make module __getattr__ and __dir__ which import attributes on first access.
+
+    A loaded value is stored in the module namespace, so later accesses do not
+    reach __getattr__.
+
+    :param      namespace:   The globals() of the module
+    :type       namespace:   Dict[str, Any]
+    :param      attributes:  The attribute names and the modules defining them
+    :type       attributes:  Dict[str, str]
+
+    :returns:   The __getattr__ and __dir__ functions of the module
+    :rtype:     Tuple[Callable[[str], Any], Callable[[], List[str]]]
+    """
+    module_name = namespace["__name__"]
+
+    def __getattr__(name):
+        try:
+            module = attributes[name]
+        except KeyError:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}"
+            ) from None
+
+        value = getattr(importlib.import_module(module), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
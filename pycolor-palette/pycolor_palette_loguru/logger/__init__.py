@@ -1,9 +1,35 @@
-from pycolor_palette_loguru.logger.logger import (
-    PyDBG_Obj,
-    set_default_theme,
-    benchmark,
-    debug_func,
-    setup_logger,
-)
+from pycolor_palette_loguru.lazy import lazy_attributes
+
+# Loaded on first access (PEP 562), so importing one submodule (e.g. timing)
+# does not pull in pygments, executing, colorama and loguru.
+_LAZY_ATTRIBUTES = {
+    "PyDBG_Obj": "pycolor_palette_loguru.logger.logger",
+    "set_default_theme": "pycolor_palette_loguru.logger.logger",
+    "setup_logger": "pycolor_palette_loguru.logger.logger",
+    "TimingStats": "pycolor_palette_loguru.logger.timing",
+    "benchmark": "pycolor_palette_loguru.logger.timing",
+    "debug_func": "pycolor_palette_loguru.logger.tracing",
+    "disable_tracing": "pycolor_palette_loguru.logger.tracing",
+    "enable_tracing": "pycolor_palette_loguru.logger.tracing",
+    "install_strip_hook": "pycolor_palette_loguru.logger.strip",
+    "uninstall_strip_hook": "pycolor_palette_loguru.logger.strip",
+}
+
 
-__all__ = (set_default_theme, PyDBG_Obj, debug_func, benchmark, setup_logger)
+__getattr__, __dir__ = lazy_attributes(globals(), _LAZY_ATTRIBUTES)
+
+
+# A star import resolves every name of __all__ and so loads the lazy modules;
+# import names explicitly to keep the import light.
+__all__ = (
+    "set_default_theme",
+    "PyDBG_Obj",
+    "debug_func",
+    "benchmark",
+    "setup_logger",
+    "TimingStats",
+    "enable_tracing",
+    "disable_tracing",
+    "install_strip_hook",
+    "uninstall_strip_hook",
+)
@@ -0,0 +1,231 @@
+"""
+Size-aware argument formatting behind argumentToString.
+
+Before pretty printing, an argument is copied with at most max_items items in
+total and max_depth levels of nesting; long strings, bytes and NumPy arrays are
+summarized. The copy is made lazily, an argument within the limits is formatted
+as is. The work is bounded by the limits, not by the size of the argument.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+from collections import UserString
+from collections.abc import Mapping, Sequence, Set, Sized
+from contextvars import ContextVar
+from typing import NamedTuple
+
+CONTAINER_TYPES = (list, tuple, set, frozenset, dict)
+SCALAR_TYPES = frozenset((int, float, complex, bool, type(None)))
+# sequences whose repr does not list their items, formatted as is
+COMPACT_TYPES = (range, memoryview, UserString)
+# copies which may stay dict keys and set elements
+HASHABLE_COPY_TYPES = (tuple, frozenset)
+
+
+class ReprLimits(NamedTuple):
+    """
+    Limits of argument formatting.
+    """
+
+    max_items: int = 1000  # Items of all containers in total.
+    max_depth: int = 8  # Levels of nested containers.
+    max_length: int = 10000  # Characters of strings and formatted output.
+
+
+DEFAULT_REPR_LIMITS = ReprLimits()
+
+# limits of the argument being formatted, set by PyDBG_Obj
+repr_limits: ContextVar[ReprLimits] = ContextVar(
+    "repr_limits", default=DEFAULT_REPR_LIMITS
+)
+
+
+class Summary:
+    """
+    Placeholder of omitted data, its repr is the summary text.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self) -> str:
+        return self.text
+
+
+class _Budget:
+    __slots__ = ("items",)
+
+    def __init__(self, items: int):
+        self.items = items
+
+
+def _is_ndarray(obj) -> bool:
+    cls = type(obj)
+    return cls.__name__ == "ndarray" and cls.__module__ == "numpy"
+
+
+def _summarize_sequence(obj, limit: int):
+    if isinstance(obj, str):
+        if len(obj) > limit:
+            return Summary(f"{obj[:limit]!r}... <{len(obj)} characters>")
+    elif isinstance(obj, (bytes, bytearray)):
+        if len(obj) > limit:
+            return Summary(f"{bytes(obj[:limit])!r}... <{len(obj)} bytes>")
+    elif _is_ndarray(obj):
+        if obj.size > limit:
+            return Summary(f"<ndarray shape={obj.shape} dtype={obj.dtype}>")
+
+    return obj
+
+
+def _copy_type(obj):
+    # builtin type of the shortened copy of a container subclass or ABC
+    # instance (OrderedDict, defaultdict, namedtuple, deque, ...)
+    if isinstance(obj, Mapping):
+        return dict
+    elif isinstance(obj, tuple):
+        return tuple
+    elif isinstance(obj, Sequence):
+        return list
+    elif isinstance(obj, frozenset):
+        return frozenset
+    elif isinstance(obj, Set):
+        return set
+
+    return None
+
+
+def _truncate(
+    obj, limits: ReprLimits, depth: int, budget: _Budget, hashable: bool = False
+):
+    # hashable: obj is a dict key or set element, so its copy must be hashable
+    cls = type(obj)
+
+    if cls in SCALAR_TYPES:
+        return obj
+    elif cls in CONTAINER_TYPES:
+        return _truncate_container(obj, cls, limits, depth, budget, hashable)
+    elif isinstance(obj, (str, bytes, bytearray)):
+        return _summarize_sequence(obj, limits.max_length)
+    elif _is_ndarray(obj):
+        return _summarize_sequence(obj, budget.items)
+    elif isinstance(obj, COMPACT_TYPES):
+        return obj
+
+    copy_type = _copy_type(obj)
+    if copy_type is not None:
+        try:
+            return _truncate_container(obj, copy_type, limits, depth, budget, hashable)
+        except Exception:
+            # broken __len__ or __iter__ of a user type, formatted as is
+            return obj
+    elif isinstance(obj, Sized):
+        # other sized objects can't be copied, only huge ones are summarized
+        try:
+            size = len(obj)
+        except Exception:
+            return obj
+
+        if size > budget.items:
+            return Summary(f"<{cls.__name__} with {size} items>")
+
+    return obj
+
+
+def _truncate_container(
+    obj,
+    copy_type: type,
+    limits: ReprLimits,
+    depth: int,
+    budget: _Budget,
+    hashable: bool = False,
+):
+    if not obj:
+        return obj
+    elif depth >= limits.max_depth:
+        return Summary(f"<{type(obj).__name__} with {len(obj)} items>")
+
+    size = len(obj)
+    available = budget.items
+    count = min(size, available)
+    budget.items -= count
+    changed = count < size
+    items = []
+
+    if copy_type is dict:
+        for index, (key, value) in enumerate(obj.items()):
+            if index == count:
+                break
+            new_key = _truncate(key, limits, depth + 1, budget, True)
+            new_value = _truncate(value, limits, depth + 1, budget)
+            changed = changed or new_key is not key or new_value is not value
+            items.append((new_key, new_value))
+    else:
+        # set elements must stay hashable, tuple items if the tuple must
+        item_hashable = hashable or copy_type is set or copy_type is frozenset
+        for index, value in enumerate(obj):
+            if index == count:
+                break
+            new_value = _truncate(value, limits, depth + 1, budget, item_hashable)
+            changed = changed or new_value is not value
+            items.append(new_value)
+
+    if not changed:
+        return obj
+    elif hashable and copy_type not in HASHABLE_COPY_TYPES:
+        # e.g. a hashable Sequence used as dict key can't become a list, the
+        # budget spent on its items is given back
+        budget.items = available
+        return Summary(f"<{type(obj).__name__} with {size} items>")
+
+    if count < size:
+        omitted = Summary(f"<{size - count} more items>")
+        if copy_type is dict:
+            items.append((omitted, Summary("...")))
+        else:
+            items.append(omitted)
+
+    return copy_type(items)
+
+
+def truncate(obj, limits: ReprLimits = DEFAULT_REPR_LIMITS):
+    """
+    Get copy of obj within limits, obj itself if it is within limits.
+
+    Containers are shortened (the rest is replaced with a summary), dict keys
+    included. Subclasses and other mappings, sequences and sets (OrderedDict,
+    defaultdict, namedtuple, deque, ...) are shortened to a plain dict, list,
+    tuple or set; dict keys and set elements which would not stay hashable
+    are replaced with summaries. Sequences with compact repr (range, ...) are
+    kept. Containers below max_depth, long strings, bytes and NumPy arrays are
+    replaced with summaries.
+
+    :param      obj:     The object
+    :type       obj:     object
+    :param      limits:  The limits
+    :type       limits:  ReprLimits
+
+    :returns:   object to format
+    :rtype:     object
+    """
+    return _truncate(obj, limits, 0, _Budget(limits.max_items))
+
+
+def clip(text: str, max_length: int) -> str:
+    """
+    Clip formatted text to max_length characters.
+
+    :param      text:        The text
+    :type       text:        str
+    :param      max_length:  The maximum length
+    :type       max_length:  int
+
+    :returns:   clipped text
+    :rtype:     str
+    """
+    if len(text) <= max_length:
+        return text
+
+    return f"{text[:max_length]}... <{len(text)} characters>"
@@ -0,0 +1,77 @@
+"""
+Background compression of rotated log files.
+
+Loguru compresses a rotated file in the thread which writes the message that
+triggered the rotation. The compression functions here hand the file over to
+a separate thread, so logging is not stalled while large files are packed.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import threading
+from typing import Callable, Optional
+
+COMPRESSORS = {"gz": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+_threads = []
+_threads_lock = threading.Lock()
+
+
+def _compress(path: str, extension: str) -> None:
+    with open(path, "rb") as source:
+        with COMPRESSORS[extension](f"{path}.{extension}", "wb") as target:
+            shutil.copyfileobj(source, target)
+
+    os.remove(path)
+
+
+def background_compression(extension: str = "gz") -> Callable[[str], None]:
+    """
+    Make compression function for loguru which compresses rotated files in a
+    background thread. Threads are not daemonic, so files are completed before
+    the interpreter exits.
+
+    :param      extension:   The extension ("gz", "bz2" or "xz")
+    :type       extension:   str
+
+    :returns:   compression function
+    :rtype:     Callable[[str], None]
+
+    :raises     ValueError:  unknown extension
+    """
+    if extension not in COMPRESSORS:
+        raise ValueError(f"extension must be one of {tuple(COMPRESSORS)}")
+
+    def compress(path: str) -> None:
+        thread = threading.Thread(
+            target=_compress,
+            args=(path, extension),
+            name="pycolor-palette-compression",
+        )
+
+        with _threads_lock:
+            _threads[:] = [t for t in _threads if t.is_alive()]
+            _threads.append(thread)
+
+        thread.start()
+
+    return compress
+
+
+def wait_compression(timeout: Optional[float] = None) -> None:
+    """
+    Wait until started background compressions are finished.
+
+    :param      timeout:  The timeout of every compression (sec)
+    :type       timeout:  Optional[float]
+    """
+    with _threads_lock:
+        threads = list(_threads)
+
+    for thread in threads:
+        thread.join(timeout)
@@ -3,11 +3,15 @@
 Copyright Alexeev Bronislav (C) 2024
 """
 
-from time import time
 import ast
+import asyncio
+import contextvars
 import inspect
+import os
 import pprint
 import sys
+import threading
+import time
 import warnings
 from datetime import datetime
 import functools
@@ -17,75 +21,395 @@ from textwrap import dedent
 import colorama
 import executing
 from pygments import highlight
-from pygments.formatters import Terminal256Formatter
-from pygments.lexers import PythonLexer as PyLexer, Python3Lexer as Py3Lexer
-from typing import Union, List
+from typing import Callable, List, NamedTuple, Optional, Sequence, Union
 import logging
 from loguru import logger
 
-from pycolor_palette_loguru.paint import debug_message
+from pycolor_palette_loguru.cache import LRUCache
+from pycolor_palette_loguru.context import context_items, context_text
+from pycolor_palette_loguru.highlight import fast_highlight
+from pycolor_palette_loguru.logger.bounded import (
+    DEFAULT_REPR_LIMITS,
+    ReprLimits,
+    clip,
+    repr_limits,
+    truncate,
+)
+from pycolor_palette_loguru.logger.compression import (
+    COMPRESSORS,
+    background_compression,
+)
 from pycolor_palette_loguru.pygments_colorschemes import *
+from pycolor_palette_loguru.ratelimit import (
+    RateLimiter,
+    loguru_filter,
+    repeated_message,
+    repeated_summary,
+)
+from pycolor_palette_loguru.sinks import BufferedSink, QueueSink, write_atomic
+from pycolor_palette_loguru.structured import Record, get_encoder, write_record
+from pycolor_palette_loguru.terminal import supports_color
+from pycolor_palette_loguru.themes import compile_theme
 
 
 PYTHON2 = sys.version_info[0] == 2
 
 _absent = object()
-default_theme = Terminal256Formatter(style=CatppuccinMocha)
+default_theme = None  # CatppuccinMocha, compiled on first use.
+
+DEFAULT_HIGHLIGHT_CACHE_SIZE = 1024
+MAX_CACHED_HIGHLIGHT_LENGTH = 4096  # Characters, longer texts are not cached.
+highlightCache = LRUCache(DEFAULT_HIGHLIGHT_CACHE_SIZE)
+
+# argument types rate limited by value, their strings are fixed by the value
+RATE_KEY_TYPES = frozenset((int, bool, str, bytes, type(None)))
 
 
-def set_default_theme(theme):
+def set_default_theme(theme, mode="256"):
+    """
+    Sets the theme of PyDBG_Obj output. Themes are compiled once, switching
+    back to a used theme is a cache lookup.
+
+    :param      theme:  The theme (pygments style, e.g. GruvboxDark)
+    :type       theme:  Type[Style]
+    :param      mode:   The color mode ("256" or "truecolor")
+    :type       mode:   str
+    """
     global default_theme
-    default_theme = Terminal256Formatter(style=theme)
+    default_theme = compile_theme(theme, mode)
+    highlightCache.clear(reset_stats=False)
+
+
+def highlightCacheInfo():
+    """
+    Statistics of colorize cache.
+
+    :returns:   hits, misses, evictions, maxsize and current size
+    :rtype:     CacheInfo
+    """
+    return highlightCache.info()
 
 
 class InterceptHandler(logging.Handler):
     """
     This class describes an intercept handler.
+
+    Level names are mapped to Loguru levels once (the map is rebuilt when
+    levels are added), records below the minimal level of Loguru handlers are
+    rejected before frame inspection and the depth of the caller frame is
+    memoized per call site.
+
+    The level map and the minimal level are read from logger._core.levels and
+    logger._core.min_level, internals of loguru 0.7 (checked with 0.7.3). If
+    they are missing, levels are looked up with the public logger.level and
+    records are not rejected early.
     """
 
-    def emit(self, record) -> None:
+    def __init__(self, level=logging.NOTSET):
+        """
+        Initialization.
+
+        :param      level:  The level
+        :type       level:  Union[str, int]
+        """
+        super().__init__(level)
+        self.levels = {}
+        self.levelsCount = 0
+        self.depths = LRUCache(DEFAULT_CALL_SITE_CACHE_SIZE)
+
+    def loguruLevel(self, record):
         """
         Get corresponding Loguru level if it exists
 
         :param      record:  The record
         :type       record:  record
 
-        :returns:   None
-        :rtype:     None
+        :returns:   level (name or number) and its number
+        :rtype:     tuple
         """
+        levels = getattr(getattr(logger, "_core", None), "levels", None)
+        if levels is None:
+            return self.publicLoguruLevel(record)
+
+        # Loguru levels can be added but not removed
+        if len(levels) != self.levelsCount:
+            self.levels.clear()
+            self.levelsCount = len(levels)
+
+        try:
+            return self.levels[record.levelname]
+        except KeyError:
+            pass
+
         try:
-            level = logger.level(record.levelname).name
+            level = levels[record.levelname]
+            result = (level.name, level.no)
+        except KeyError:
+            result = (record.levelno, record.levelno)
+
+        self.levels[record.levelname] = result
+        return result
+
+    def publicLoguruLevel(self, record):
+        """
+        Get corresponding Loguru level with the public API, for loguru versions
+        without logger._core.levels. Only found levels are memoized, since
+        levels added later can not be detected.
+
+        :param      record:  The record
+        :type       record:  record
+
+        :returns:   level (name or number) and its number
+        :rtype:     tuple
+        """
+        try:
+            return self.levels[record.levelname]
+        except KeyError:
+            pass
+
+        try:
+            level = logger.level(record.levelname)
         except ValueError:
-            level = record.levelno
+            return (record.levelno, record.levelno)
+
+        result = self.levels[record.levelname] = (level.name, level.no)
+        return result
+
+    def callerDepth(self, record):
+        """
+        Get depth of the frame which logged record, relative to the caller of
+        this method, skipping frames of logging.
 
-        frame, depth = logging.currentframe(), 2
+        :param      record:  The record
+        :type       record:  record
 
-        while frame.f_code.co_filename == logging.__file__:
+        :returns:   depth
+        :rtype:     int
+        """
+        key = (record.pathname, record.lineno)
+        depth = self.depths.get(key)
+
+        if depth is not None:
+            try:
+                frame = sys._getframe(depth + 1)
+            except ValueError:
+                frame = None
+
+            if (
+                frame is not None
+                and frame.f_lineno == record.lineno
+                and frame.f_code.co_filename == record.pathname
+            ):
+                return depth
+
+        frame, depth = sys._getframe(2), 1
+        while frame is not None and frame.f_code.co_filename == logging.__file__:
             frame = frame.f_back
             depth += 1
 
-        logger.opt(depth=depth, exception=record.exc_info).log(
+        self.depths.put(key, depth)
+        return depth
+
+    def emit(self, record) -> None:
+        """
+        Log record with Loguru.
+
+        :param      record:  The record
+        :type       record:  record
+
+        :returns:   None
+        :rtype:     None
+        """
+        level, levelNo = self.loguruLevel(record)
+
+        minLevel = getattr(getattr(logger, "_core", None), "min_level", None)
+        if minLevel is not None and levelNo < minLevel:
+            return
+
+        logger.opt(depth=self.callerDepth(record), exception=record.exc_info).log(
             level, record.getMessage()
         )
 
 
-def setup_logger(level: Union[str, int] = "DEBUG", ignored: List[str] = "") -> None:
+# levels of stdlib loggers before silenceStdlibLoggers changed them, by name
+originalStdlibLevels = {}
+# modules disabled in loguru by the last setup_logger call
+disabledModules = set()
+
+
+def silenceStdlibLoggers(level, ignored=()):
+    """
+    Set levels of stdlib loggers from their original levels (before the first
+    change): loggers set below level are raised to level, so their records are
+    not created at all, ignored loggers are disabled. Levels changed by an
+    earlier call are recomputed, e.g. lowered back by a lower level.
+
+    :param      level:    The level number
+    :type       level:    int
+    :param      ignored:  The names of ignored loggers
+    :type       ignored:  Sequence[str]
+    """
+    for name in ignored:
+        logging.getLogger(name)
+
+    for name, stdlibLogger in list(logging.root.manager.loggerDict.items()):
+        if not isinstance(stdlibLogger, logging.Logger):
+            continue
+
+        original = originalStdlibLevels.get(name, stdlibLogger.level)
+        if name in ignored:
+            target = logging.CRITICAL + 1
+        elif 0 < original < level:
+            target = level
+        else:
+            target = original
+
+        if target != stdlibLogger.level:
+            originalStdlibLevels.setdefault(name, stdlibLogger.level)
+            stdlibLogger.setLevel(target)
+
+
+# (stream, sink) of bufferedStderrSink, shared by setup_logger calls
+_stderrSink = (None, None)
+
+
+def bufferedStderrSink():
     """
-    Setup logger
+    Get loguru sink which writes to stderr through sinks.BufferedSink.
+    Messages of ERROR and higher levels are flushed at once. The sink is made
+    once and reused while sys.stderr is the same stream.
 
-    :param      level:    The level
-    :type       level:    str
-    :param      ignored:  The ignored
-    :type       ignored:  List[str]
+    :returns:   The sink
+    :rtype:     function
+    """
+    global _stderrSink
+    stream, sink = _stderrSink
+
+    if stream is not sys.stderr:
+        buffered = BufferedSink(sys.stderr)
+
+        def sink(message):
+            buffered.write(message)
+            if message.record["level"].no >= logging.ERROR:
+                buffered.flush()
+
+        sink.flush = buffered.flush
+        _stderrSink = (sys.stderr, sink)
+
+    return sink
+
+
+def setup_logger(
+    level: Union[str, int] = "DEBUG",
+    ignored: List[str] = "",
+    files: Sequence[Union[str, os.PathLike, dict]] = (),
+    stderr: bool = True,
+    buffered: bool = False,
+    enqueue: bool = False,
+    rotation=None,
+    retention=None,
+    compression=None,
+    format: Optional[str] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> List[int]:
     """
-    logging.basicConfig(
-        handlers=[InterceptHandler()], level=logging.getLevelName(level)
-    )
+    Setup logger: intercept stdlib logging and replace loguru handlers with a
+    stderr sink and file sinks.
+
+    Format strings are compiled by loguru once per sink. With enqueue=True
+    messages are written by a background thread and sinks are safe to use
+    from several processes. Compression "gz", "bz2" or "xz" runs in a
+    background thread, other values are passed to loguru.
+
+    :param      level:        The level
+    :type       level:        str
+    :param      ignored:      The ignored modules
+    :type       ignored:      List[str]
+    :param      files:        The file paths or loguru.add() keyword arguments
+                              (with "sink") which override the defaults
+    :type       files:        Sequence[Union[str, os.PathLike, dict]]
+    :param      stderr:       Add stderr sink
+    :type       stderr:       bool
+    :param      buffered:     Buffer stderr sink (see sinks.BufferedSink), its
+                              text may come out after PyDBG_Obj output
+                              written to stderr later
+    :type       buffered:     bool
+    :param      enqueue:      Write messages from a background thread
+    :type       enqueue:      bool
+    :param      rotation:     The rotation of files (size, time or interval)
+    :type       rotation:     Union[str, int, datetime.time, datetime.timedelta]
+    :param      retention:    The retention of rotated files
+    :type       retention:    Union[str, int, datetime.timedelta]
+    :param      compression:  The compression of rotated files
+    :type       compression:  Union[str, function]
+    :param      format:       The format (loguru default if None)
+    :type       format:       Optional[str]
+    :param      rate_limiter: The rate limiter of records, keyed by level and
+                              message (see ratelimit.loguru_filter)
+    :type       rate_limiter: Optional[RateLimiter]
+
+    :returns:   loguru handler ids
+    :rtype:     List[int]
+    """
+    levelNo = logger.level(level).no if isinstance(level, str) else level
+
+    if compression in COMPRESSORS:
+        compression = background_compression(compression)
+
+    common = {"level": levelNo, "enqueue": enqueue}
+    if format is not None:
+        common["format"] = format
+
+    if rate_limiter is not None:
+        common["filter"] = loguru_filter(rate_limiter)
+
+    logger.remove()
+    handlerIds = []
+
+    if stderr:
+        sink = bufferedStderrSink() if buffered else sys.stderr
+        handlerIds.append(
+            logger.add(sink, colorize=supports_color(sys.stderr), **common)
+        )
+
+    for file in files:
+        options = dict(
+            common, rotation=rotation, retention=retention, compression=compression
+        )
+        options.update(file if isinstance(file, dict) else {"sink": file})
+        handlerIds.append(logger.add(**options))
 
+    logging.basicConfig(handlers=[InterceptHandler()], level=levelNo, force=True)
+    silenceStdlibLoggers(levelNo, ignored)
+
+    for ignore in disabledModules.difference(ignored):
+        logger.enable(ignore)
     for ignore in ignored:
         logger.disable(ignore)
+    disabledModules.clear()
+    disabledModules.update(ignored)
 
     logger.info("Logging is successfully configured")
+    return handlerIds
+
+
+windowsColorsEnabled = False
+
+
+def enableWindowsColors():
+    """
+    Enable terminal colors in Windows OS with colorama. Streams are set up once
+    per process, on other platforms nothing is done.
+    """
+    global windowsColorsEnabled
+
+    if windowsColorsEnabled:
+        return
+
+    windowsColorsEnabled = True
+
+    if sys.platform == "win32":
+        colorama.just_fix_windows_console()
 
 
 @contextmanager
@@ -93,9 +417,8 @@ def supportTerminalColorsInWindows():
     """
     Support terminal colors in Windows OS with colorama.
     """
-    colorama.init()
+    enableWindowsColors()
     yield
-    colorama.deinit()
 
 
 def stderrPrint(*args):
@@ -105,7 +428,7 @@ def stderrPrint(*args):
     :param      args:  The arguments
     :type       args:  list
     """
-    print(*args)
+    print(*args, file=sys.stderr)
 
 
 def isLiteral(s):
@@ -125,26 +448,25 @@ def isLiteral(s):
     return True
 
 
-def bindStaticVariable(name, value):
-    def decorator(fn):
-        """
-        Wrapper
+@functools.lru_cache(maxsize=None)
+def getLexer():
+    """
+    Gets the lexer of pygments fallback, created on first use.
 
-        :param      fn:   The function
-        :type       fn:   Function
-        """
-        setattr(fn, name, value)
-        return fn
+    :returns:   The lexer
+    :rtype:     Lexer
+    """
+    if PYTHON2:
+        from pygments.lexers import PythonLexer as PyLexer
+    else:
+        from pygments.lexers import Python3Lexer as PyLexer
 
-    return decorator
+    return PyLexer(ensurenl=False)
 
 
-@bindStaticVariable(
-    "lexer", PyLexer(ensurenl=False) if PYTHON2 else Py3Lexer(ensurenl=False)
-)
 def colorize(s):
     """
-    Colorize with pygments.
+    Colorize with fast-path highlighter or pygments.
 
     :param      s:    string
     :type       s:    str
@@ -152,15 +474,36 @@ def colorize(s):
     :returns:   highlighted
     :rtype:     str
     """
-    self = colorize
-    return highlight(s, self.lexer, default_theme)
+    if default_theme is None:
+        set_default_theme(CatppuccinMocha)
+
+    theme = default_theme
+    cacheable = len(s) <= MAX_CACHED_HIGHLIGHT_LENGTH
+
+    if cacheable:
+        key = (s, id(theme))
+        highlighted = highlightCache.get(key)
+        if highlighted is not None:
+            return highlighted
+
+    # Pygments is the fallback for text outside of the fast-path grammar
+    highlighted = fast_highlight(s, theme.escapes)
+    if highlighted is None:
+        highlighted = highlight(s, getLexer(), theme.formatter)
+
+    if cacheable:
+        highlightCache.put(key, highlighted)
+
+    return highlighted
 
 
 DEFAULT_PREFIX = "pydbg_obj | "
 DEFAULT_LINE_WRAP_WIDTH = 80  # Characters.
 DEFAULT_CONTEXT_DELIMITER = "~ "
-DEFAULT_OUTPUT_FUNCTION = colorized_stderr_print
 DEFAULT_ARG_TO_STRING_FUNCTION = pprint.pformat
+DEFAULT_CALL_SITE_CACHE_SIZE = 512
+PRODUCTION_ENV_VARIABLE = "PYCOLOR_PYDBG"
+PRODUCTION_VALUES = ("0", "off", "false", "no")  # Enable production mode.
 
 
 NO_SOURCE_AVAILABLE_WARNING_MESSAGE = (
@@ -171,20 +514,59 @@ NO_SOURCE_AVAILABLE_WARNING_MESSAGE = (
 )
 
 
-def colorized_stderr_print(obj):
+outputStream = None
+
+
+def setOutputStream(stream):
+    """
+    Set stream of colorized_stderr_print (the default output of PyDBG_Obj).
+
+    :param      stream:  The stream (sys.stderr at write time if None)
+    :type       stream:  Optional[TextIO]
+    """
+    global outputStream
+    outputStream = stream
+
+
+def colorized_stderr_print(obj, stream=None):
+    """
+    Colorized print to stream, stderr by default. The output is written
+    directly with one write, so lines of concurrent calls are not interleaved.
+
+    :param      obj:     The object
+    :type       obj:     object
+    :param      stream:  The stream (see setOutputStream if None)
+    :type       stream:  Optional[TextIO]
+    """
+    if stream is None:
+        stream = sys.stderr if outputStream is None else outputStream
+
+    enableWindowsColors()
+    write_atomic(stream, colorizeOutput(obj))
+
+
+def colorizeOutput(obj):
     """
-    Colorized stderr print.
+    Colorize output of PyDBG_Obj without printing, e.g. to format it on the
+    writer thread of sinks.QueueSink.
 
     :param      obj:  The object
     :type       obj:  object
+
+    :returns:   highlighted lines
+    :rtype:     str
     """
+    lines = []
+
     for s in obj.split("; "):
         if not s.startswith(f"{DEFAULT_PREFIX} |"):
             s = f"{DEFAULT_PREFIX} | {s}"
-        colored = colorize(s)
+        lines.append(colorize(s))
+
+    return "\n".join(lines) + "\n"
+
 
-        with supportTerminalColorsInWindows():
-            stderrPrint(colored)
+DEFAULT_OUTPUT_FUNCTION = colorized_stderr_print
 
 
 def callOrValue(obj):
@@ -222,6 +604,107 @@ class Source(executing.Source):
         return result
 
 
+callSiteCache = LRUCache(DEFAULT_CALL_SITE_CACHE_SIZE)
+
+
+class CallSite:
+    """
+    Snapshot of the frame attributes which call-site analysis and context
+    read, and of the call time, so a call can be formatted after its frame has
+    moved on (e.g. on the writer thread of sinks.QueueSink).
+    """
+
+    __slots__ = ("f_code", "f_lasti", "f_lineno", "f_globals", "timestamp")
+
+    def __init__(self, frame):
+        """
+        Initialization.
+
+        :param      frame:  The call frame
+        :type       frame:  call frame
+        """
+        self.f_code = frame.f_code
+        self.f_lasti = frame.f_lasti
+        self.f_lineno = frame.f_lineno
+        self.f_globals = frame.f_globals
+        self.timestamp = time.time()
+
+
+def analyzeCallSite(callFrame):
+    """
+    Get argument labels of call site with their literal flags.
+
+    Results are cached by code object and bytecode offset, so a cache hit needs
+    no system call. The source file is checked for changes only on a miss
+    (executing calls linecache.checkcache); labels of a cached call site match
+    the code which runs, even if its file is edited later.
+
+    :param      callFrame:  The call frame
+    :type       callFrame:  call frame
+
+    :returns:   (label, isLiteral) pairs or None if source is not available
+    :rtype:     Optional[tuple]
+    """
+    code = callFrame.f_code
+    key = (code, callFrame.f_lasti)
+
+    site = callSiteCache.get(key)
+    if site is not None:
+        return site
+
+    callNode = Source.executing(callFrame).node
+    if callNode is None:
+        return None
+
+    source = Source.for_frame(callFrame)
+    labels = [source.get_text_with_indentation(arg) for arg in callNode.args]
+    site = tuple((label, isLiteral(label)) for label in labels)
+
+    callSiteCache.put(key, site)
+    return site
+
+
+@functools.lru_cache(maxsize=DEFAULT_CALL_SITE_CACHE_SIZE)
+def contextPath(filename, absolute):
+    """
+    Get path of source file shown in context, cached by filename.
+
+    :param      filename:  The filename of code object
+    :type       filename:  str
+    :param      absolute:  Resolve absolute path instead of basename
+    :type       absolute:  bool
+
+    :returns:   path
+    :rtype:     str
+    """
+    return realpath(filename) if absolute else basename(filename)
+
+
+codeContextCache = LRUCache(DEFAULT_CALL_SITE_CACHE_SIZE)
+
+
+def codeContext(code, absolute):
+    """
+    Get path and function name of code object, memoized per code object.
+
+    :param      code:      The code object
+    :type       code:      code
+    :param      absolute:  Resolve absolute path instead of basename
+    :type       absolute:  bool
+
+    :returns:   (path, function name)
+    :rtype:     tuple
+    """
+    key = (code, absolute)
+
+    context = codeContextCache.get(key)
+    if context is None:
+        context = (contextPath(code.co_filename, absolute), code.co_name)
+        codeContextCache.put(key, context)
+
+    return context
+
+
 def prefixLines(prefix, s, startAtLine=0):
     """
     Prefix lines.
@@ -321,7 +804,8 @@ def singledispatch(func):
 @singledispatch
 def argumentToString(obj):
     """
-    Convert argument to string.
+    Convert argument to string. Huge and deep arguments are truncated to the
+    limits of PyDBG_Obj (maxItems, maxDepth, maxLength) before formatting.
 
     :param      obj:  The object
     :type       obj:  obj
@@ -329,9 +813,86 @@ def argumentToString(obj):
     :returns:   String representation of the argument.
     :rtype:     string
     """
-    s = DEFAULT_ARG_TO_STRING_FUNCTION(obj)
+    limits = repr_limits.get()
+    s = DEFAULT_ARG_TO_STRING_FUNCTION(truncate(obj, limits))
     s = s.replace("\\n", "\n")  # Preserve string newlines in output.
-    return s
+    return clip(s, limits.max_length)
+
+
+async def awaitPassthrough(pending, passthrough):
+    """
+    Await pending output and return passthrough.
+
+    :param      pending:      The pending output (awaitable or None)
+    :type       pending:      awaitable
+    :param      passthrough:  The passthrough
+    :type       passthrough:  object
+
+    :returns:   passthrough
+    :rtype:     object
+    """
+    if inspect.isawaitable(pending):
+        await pending
+
+    return passthrough
+
+
+class OutputConfig(NamedTuple):
+    """
+    Output configuration of PyDBG_Obj. It is immutable and replaced as a whole
+    by configureOutput, so a call reads it once and never sees a half-applied
+    change, and formatting needs no lock.
+    """
+
+    prefix: object
+    outputFunction: Callable
+    argToStringFunction: Callable
+    includeContext: bool
+    contextAbsPath: bool
+    recordFormat: Optional[str]
+    recordEncoder: Optional[Callable]
+    recordOutputFunction: Callable
+    reprLimits: ReprLimits
+    rateLimiter: Optional[RateLimiter]
+    queue: Optional[QueueSink]
+
+
+def checkQueueFormat(queue, recordFormat):
+    """
+    Check that output of queue is text: msgpack records are bytes.
+
+    :param      queue:         The queue sink
+    :type       queue:         Optional[QueueSink]
+    :param      recordFormat:  The record format
+    :type       recordFormat:  Optional[str]
+
+    :raises     ValueError:    msgpack records with queue
+    """
+    if queue is not None and recordFormat == "msgpack":
+        raise ValueError("msgpack records can't be written to a text queue sink")
+
+
+def configProperty(name, writable=True):
+    """
+    Make property of PyDBG_Obj which reads a field of its output configuration
+    and writes it through configureOutput.
+
+    :param      name:      The field name
+    :type       name:      str
+    :param      writable:  The field can be set
+    :type       writable:  bool
+
+    :returns:   property
+    :rtype:     property
+    """
+
+    def getter(self):
+        return getattr(self.config, name)
+
+    def setter(self, value):
+        self.configureOutput(**{name: value})
+
+    return property(getter, setter if writable else None, doc=f"Output {name}.")
 
 
 class PyDBG_Obj:
@@ -350,6 +911,18 @@ class PyDBG_Obj:
     lineWrapWidth = DEFAULT_LINE_WRAP_WIDTH
     contextDelimiter = DEFAULT_CONTEXT_DELIMITER
 
+    prefix = configProperty("prefix")
+    outputFunction = configProperty("outputFunction")
+    argToStringFunction = configProperty("argToStringFunction")
+    includeContext = configProperty("includeContext")
+    contextAbsPath = configProperty("contextAbsPath")
+    recordFormat = configProperty("recordFormat")
+    recordEncoder = configProperty("recordEncoder", writable=False)
+    recordOutputFunction = configProperty("recordOutputFunction")
+    reprLimits = configProperty("reprLimits", writable=False)
+    rateLimiter = configProperty("rateLimiter")
+    queue = configProperty("queue")
+
     def __init__(
         self,
         prefix=DEFAULT_PREFIX,
@@ -357,6 +930,13 @@ class PyDBG_Obj:
         argToStringFunction=argumentToString,
         includeContext=False,
         contextAbsPath=False,
+        recordFormat=None,
+        recordOutputFunction=write_record,
+        maxItems=DEFAULT_REPR_LIMITS.max_items,
+        maxDepth=DEFAULT_REPR_LIMITS.max_depth,
+        maxLength=DEFAULT_REPR_LIMITS.max_length,
+        rateLimiter=None,
+        queue=None,
     ):
         """
         Initialization.
@@ -371,13 +951,44 @@ class PyDBG_Obj:
         :type       includeContext:       bool
         :param      contextAbsPath:       The context absolute path
         :type       contextAbsPath:       bool
+        :param      recordFormat:         The record format ("json", "msgpack")
+                                          or None for colored text
+        :type       recordFormat:         Optional[str]
+        :param      recordOutputFunction: The output function of records
+        :type       recordOutputFunction: output function
+        :param      maxItems:             The items limit of all containers of
+                                          an argument
+        :type       maxItems:             int
+        :param      maxDepth:             The nesting limit of containers
+        :type       maxDepth:             int
+        :param      maxLength:            The length limit of strings and
+                                          formatted arguments
+        :type       maxLength:            int
+        :param      rateLimiter:          The rate limiter of calls, keyed by
+                                          call site
+        :type       rateLimiter:          Optional[RateLimiter]
+        :param      queue:                The queue sink which formats calls on
+                                          its writer thread (see _enqueue)
+        :type       queue:                Optional[QueueSink]
+
+        :raises     ValueError:           msgpack records with queue
         """
+        checkQueueFormat(queue, recordFormat)
         self.enabled = True
-        self.prefix = prefix
-        self.includeContext = includeContext
-        self.outputFunction = outputFunction
-        self.argToStringFunction = argToStringFunction
-        self.contextAbsPath = contextAbsPath
+        self._configLock = threading.Lock()
+        self.config = OutputConfig(
+            prefix=prefix,
+            outputFunction=outputFunction,
+            argToStringFunction=argToStringFunction,
+            includeContext=includeContext,
+            contextAbsPath=contextAbsPath,
+            recordFormat=recordFormat,
+            recordEncoder=None if recordFormat is None else get_encoder(recordFormat),
+            recordOutputFunction=recordOutputFunction,
+            reprLimits=ReprLimits(maxItems, maxDepth, maxLength),
+            rateLimiter=rateLimiter,
+            queue=queue,
+        )
 
     def __call__(self, *args):
         """
@@ -390,8 +1001,23 @@ class PyDBG_Obj:
         :rtype:     list
         """
         if self.enabled:
+            config = self.config
             callFrame = inspect.currentframe().f_back
-            self.outputFunction(self._format(callFrame, *args))
+            if config.queue is not None:
+                self._enqueue(callFrame, args, config)
+            else:
+                repeated, strings = self._checkRate(callFrame, args, config)
+                if repeated is None:
+                    pass  # suppressed by the rate limiter
+                elif config.recordEncoder is not None:
+                    config.recordOutputFunction(
+                        self._formatRecord(callFrame, args, config, repeated, strings)
+                    )
+                else:
+                    out = self._format(callFrame, *args, config=config, strings=strings)
+                    config.outputFunction(
+                        repeated_message(out, repeated) if repeated else out
+                    )
 
         if not args:
             passthrough = None
@@ -402,6 +1028,203 @@ class PyDBG_Obj:
 
         return passthrough
 
+    def acall(self, *args):
+        """
+        Call from coroutine with awaitable output function, e.g.
+        aio.acolorized_stderr_print: `await pydbg_obj.acall(value)`.
+
+        :param      args:  The arguments
+        :type       args:  list
+
+        :returns:   awaitable of passthrough
+        :rtype:     coroutine
+        """
+        pending = None
+        if self.enabled:
+            config = self.config
+            callFrame = inspect.currentframe().f_back
+            if config.queue is not None:
+                self._enqueue(callFrame, args, config)
+            else:
+                repeated, strings = self._checkRate(callFrame, args, config, True)
+                if repeated is None:
+                    pass  # suppressed by the rate limiter
+                elif config.recordEncoder is not None:
+                    pending = config.recordOutputFunction(
+                        self._formatRecord(callFrame, args, config, repeated, strings)
+                    )
+                else:
+                    out = self._format(callFrame, *args, config=config, strings=strings)
+                    pending = config.outputFunction(
+                        repeated_message(out, repeated) if repeated else out
+                    )
+
+        if not args:
+            passthrough = None
+        elif len(args) == 1:
+            passthrough = args[0]
+        else:
+            passthrough = args
+
+        return awaitPassthrough(pending, passthrough)
+
+    def _enqueue(self, callFrame, args, config, repeated=None):
+        """
+        Enqueue raw arguments and call site to the queue of configuration. The
+        caller does no formatting: rate limiting, call-site analysis, repr and
+        highlighting run on the writer thread, in a copy of the caller's
+        context (bound values and repr limits). Arguments are formatted as they
+        are at that time, so mutable arguments changed right after the call may
+        show the new state.
+
+        :param      callFrame:  The call frame
+        :type       callFrame:  call frame
+        :param      args:       The arguments
+        :type       args:       tuple
+        :param      config:     The output configuration
+        :type       config:     OutputConfig
+        :param      repeated:   The number of suppressed calls to report (None
+                                to check the call with the rate limiter)
+        :type       repeated:   Optional[int]
+        """
+        config.queue.submit(
+            contextvars.copy_context().run,
+            self._formatQueued,
+            CallSite(callFrame),
+            args,
+            config,
+            repeated,
+        )
+
+    def _formatQueued(self, callSite, args, config, repeated):
+        """
+        Format enqueued call on the writer thread: colorized text or JSON
+        record line.
+
+        :param      callSite:  The call site
+        :type       callSite:  CallSite
+        :param      args:      The arguments
+        :type       args:      tuple
+        :param      config:    The output configuration
+        :type       config:    OutputConfig
+        :param      repeated:  The number of suppressed calls to report (None
+                               to check the call with the rate limiter)
+        :type       repeated:  Optional[int]
+
+        :returns:   text ("" if call is suppressed)
+        :rtype:     str
+        """
+        strings = None
+        if repeated is None:
+            repeated, strings = self._checkRate(callSite, args, config)
+            if repeated is None:
+                return ""  # suppressed by the rate limiter
+
+        if config.recordEncoder is not None:
+            record = self._formatRecord(callSite, args, config, repeated, strings)
+            return f"{record}\n"
+
+        out = self._format(callSite, *args, config=config, strings=strings)
+        return colorizeOutput(repeated_message(out, repeated) if repeated else out)
+
+    def _checkRate(self, callFrame, args, config, inLoop=False):
+        """
+        Check call with rate limiter of configuration. Calls are keyed by call
+        site and arguments, so only calls with the same output are counted as
+        repeats: arguments of RATE_KEY_TYPES by value, without formatting,
+        others by their strings, which are returned for formatting. Summary of
+        suppressed calls is output with the next call let through, or by the
+        flush timer of the limiter.
+
+        :param      callFrame:  The call frame
+        :type       callFrame:  call frame
+        :param      args:       The arguments
+        :type       args:       tuple
+        :param      config:     The output configuration
+        :type       config:     OutputConfig
+        :param      inLoop:     Output summary in the running event loop (acall)
+        :type       inLoop:     bool
+
+        :returns:   None if call is suppressed, otherwise the number of
+                    suppressed calls with the same output; argument strings
+                    (None if not computed)
+        :rtype:     Tuple[Optional[int], Optional[list]]
+        """
+        if config.rateLimiter is None:
+            return 0, None
+
+        if all(type(arg) in RATE_KEY_TYPES for arg in args):
+            strings = None
+            values = (args, tuple(map(type, args)))
+        else:
+            strings = self._argsToStrings(args, config)
+            values = tuple(strings)
+
+        summary = functools.partial(
+            contextvars.copy_context().run,
+            self._outputSummary,
+            CallSite(callFrame),
+            args,
+            config,
+        )
+        if inLoop:
+            summary = functools.partial(
+                self._outputSummaryInLoop, asyncio.get_running_loop(), summary
+            )
+
+        repeated = config.rateLimiter.check(
+            (callFrame.f_code, callFrame.f_lasti, values), summary
+        )
+        return repeated, strings
+
+    def _outputSummary(self, callSite, args, config, repeated):
+        """
+        Output summary of suppressed calls, flushed by the rate limiter.
+
+        :param      callSite:  The call site
+        :type       callSite:  CallSite
+        :param      args:      The arguments of the last suppressed call
+        :type       args:      tuple
+        :param      config:    The output configuration
+        :type       config:    OutputConfig
+        :param      repeated:  The number of suppressed calls
+        :type       repeated:  int
+
+        :returns:   result of output function
+        :rtype:     object
+        """
+        if config.queue is not None:
+            return self._enqueue(callSite, args, config, repeated)
+        elif config.recordEncoder is not None:
+            return config.recordOutputFunction(
+                self._formatRecord(callSite, args, config, repeated)
+            )
+
+        out = self._format(callSite, *args, config=config)
+        return config.outputFunction(repeated_message(out, repeated))
+
+    @staticmethod
+    def _outputSummaryInLoop(loop, summary, repeated):
+        """
+        Output summary of suppressed acall calls in their event loop, an
+        awaitable result of output function is run as a task.
+
+        :param      loop:      The event loop
+        :type       loop:      asyncio.AbstractEventLoop
+        :param      summary:   The summary output (see _outputSummary)
+        :type       summary:   Callable[[int], object]
+        :param      repeated:  The number of suppressed calls
+        :type       repeated:  int
+        """
+
+        def output():
+            pending = summary(repeated)
+            if inspect.isawaitable(pending):
+                asyncio.ensure_future(pending)
+
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(output)
+
     def format(self, *args):
         """
         Format arguments.
@@ -416,32 +1239,101 @@ class PyDBG_Obj:
         out = self._format(callFrame, *args)
         return out
 
-    def _format(self, callFrame, *args):
+    def _format(self, callFrame, *args, config=None, strings=None):
         """
-        Format helper function.
+        Format helper function. The prefix is followed by values bound with
+        context.bind_context.
 
         :param      callFrame:  The call frame
         :type       callFrame:  call frame
         :param      args:       The arguments
         :type       args:       list
+        :param      config:     The output configuration (current if None)
+        :type       config:     OutputConfig
+        :param      strings:    The argument strings (computed if None)
+        :type       strings:    Optional[list]
 
         :returns:   formatted
         :rtype:     formatted out
         """
-        prefix = callOrValue(self.prefix)
+        config = self.config if config is None else config
+        prefix = callOrValue(config.prefix) + context_text()
 
-        context = self._formatContext(callFrame)
         if not args:
+            context = self._formatContext(callFrame, config)
             time = self._formatTime()
             out = prefix + context + time
         else:
-            if not self.includeContext:
-                context = ""
-            out = self._formatArgs(callFrame, prefix, context, args)
+            # context is computed only when it is shown
+            context = (
+                self._formatContext(callFrame, config) if config.includeContext else ""
+            )
+            out = self._formatArgs(callFrame, prefix, context, args, config, strings)
 
         return out
 
-    def _formatArgs(self, callFrame, prefix, context, args):
+    def _formatRecord(self, callFrame, args, config, repeated=0, strings=None):
+        """
+        Format call as structured record, without padding, wrapping and
+        highlighting.
+
+        :param      callFrame:  The call frame
+        :type       callFrame:  call frame
+        :param      args:       The arguments
+        :type       args:       tuple
+        :param      config:     The output configuration
+        :type       config:     OutputConfig
+        :param      repeated:   The number of suppressed calls to report
+        :type       repeated:   int
+        :param      strings:    The argument strings (computed if None)
+        :type       strings:    Optional[list]
+
+        :returns:   encoded record
+        :rtype:     Union[str, bytes]
+        """
+        site = analyzeCallSite(callFrame) if args else None
+        if site is None:
+            site = [(_absent, False)] * len(args)
+
+        if strings is None:
+            strings = self._argsToStrings(args, config)
+
+        pairs = tuple(
+            (None if literal or label is _absent else label, value)
+            for (label, literal), value in zip(site, strings)
+        )
+
+        # queued calls are recorded with the time of the call
+        if isinstance(callFrame, CallSite):
+            timestamp = callFrame.timestamp
+        else:
+            timestamp = time.time()
+
+        context = self._getContext(callFrame, config)
+        message = repeated_summary(repeated) if repeated else None
+        record = Record(timestamp, "DEBUG", message, context, pairs, context_items())
+        return config.recordEncoder(record)
+
+    def _argsToStrings(self, values, config=None):
+        """
+        Convert arguments to strings within the repr limits of pydbg_obj.
+
+        :param      values:  The arguments
+        :type       values:  list
+        :param      config:  The output configuration (current if None)
+        :type       config:  OutputConfig
+
+        :returns:   string representations
+        :rtype:     list
+        """
+        config = self.config if config is None else config
+        token = repr_limits.set(config.reprLimits)
+        try:
+            return [config.argToStringFunction(value) for value in values]
+        finally:
+            repr_limits.reset(token)
+
+    def _formatArgs(self, callFrame, prefix, context, args, config=None, strings=None):
         """
         Format arguments.
 
@@ -453,30 +1345,34 @@ class PyDBG_Obj:
         :type       context:    content
         :param      args:       The arguments
         :type       args:       args
+        :param      config:     The output configuration (current if None)
+        :type       config:     OutputConfig
+        :param      strings:    The argument strings (computed if None)
+        :type       strings:    Optional[list]
 
         :returns:   formatted args
         :rtype:     args
         """
-        callNode = Source.executing(callFrame).node
-        if callNode is not None:
-            source = Source.for_frame(callFrame)
-            sanitizedArgStrs = [
-                source.get_text_with_indentation(arg) for arg in callNode.args
-            ]
-        else:
+        site = analyzeCallSite(callFrame)
+        if site is None:
             warnings.warn(
                 NO_SOURCE_AVAILABLE_WARNING_MESSAGE,
                 category=RuntimeWarning,
                 stacklevel=4,
             )
-            sanitizedArgStrs = [_absent] * len(args)
+            site = [(_absent, False)] * len(args)
 
-        pairs = list(zip(sanitizedArgStrs, args))
+        pairs = [(label, arg) for (label, _), arg in zip(site, args)]
+        literals = [literal for _, literal in site]
 
-        out = self._constructArgumentOutput(prefix, context, pairs)
+        out = self._constructArgumentOutput(
+            prefix, context, pairs, literals, config, strings
+        )
         return out
 
-    def _constructArgumentOutput(self, prefix, context, pairs):
+    def _constructArgumentOutput(
+        self, prefix, context, pairs, literals=None, config=None, strings=None
+    ):
         """
         Construct argument output.
 
@@ -486,6 +1382,12 @@ class PyDBG_Obj:
         :type       context:  context
         :param      pairs:    The pairs
         :type       pairs:    pairs
+        :param      literals: Flags of literal labels, computed if not given
+        :type       literals: list
+        :param      config:   The output configuration (current if None)
+        :type       config:   OutputConfig
+        :param      strings:  The value strings (computed if None)
+        :type       strings:  Optional[list]
 
         :returns:   argument output
         :rtype:     string
@@ -494,10 +1396,17 @@ class PyDBG_Obj:
         def argPrefix(arg):
             return "%s: " % arg
 
-        pairs = [(arg, self.argToStringFunction(val)) for arg, val in pairs]
+        if literals is None:
+            literals = [arg is not _absent and isLiteral(arg) for arg, _ in pairs]
+
+        if strings is None:
+            values = self._argsToStrings([val for _, val in pairs], config)
+        else:
+            values = strings
+        pairs = [(arg, val) for (arg, _), val in zip(pairs, values)]
         pairStrs = [
-            val if (isLiteral(arg) or arg is _absent) else (argPrefix(arg) + val)
-            for arg, val in pairs
+            val if (literal or arg is _absent) else (argPrefix(arg) + val)
+            for (arg, val), literal in zip(pairs, literals)
         ]
 
         allArgsOnOneLine = self._pairDelimiter.join(pairStrs)
@@ -520,17 +1429,19 @@ class PyDBG_Obj:
 
         return "\n".join(lines)
 
-    def _formatContext(self, callFrame):
+    def _formatContext(self, callFrame, config=None):
         """
         Function for format call frame.
 
         :param      callFrame:  callframe
         :type       callFrame:  call frame
+        :param      config:     The output configuration (current if None)
+        :type       config:     OutputConfig
 
         :returns:   context
         :rtype:     string
         """
-        filename, lineNumber, parentFunction = self._getContext(callFrame)
+        filename, lineNumber, parentFunction = self._getContext(callFrame, config)
 
         if parentFunction != "<module>":
             parentFunction = "%s()" % parentFunction
@@ -549,22 +1460,22 @@ class PyDBG_Obj:
         formatted = now.strftime("%H:%M:%S.%f")[:-3]
         return " at %s" % formatted
 
-    def _getContext(self, callFrame):
+    def _getContext(self, callFrame, config=None):
         """
         Get context of call frame.
 
         :param      callFrame:  The call frame
         :type       callFrame:  callFrame
+        :param      config:     The output configuration (current if None)
+        :type       config:     OutputConfig
 
         :returns:   The context.
         :rtype:     context
         """
-        frameInfo = inspect.getframeinfo(callFrame)
-        lineNumber = frameInfo.lineno
-        parentFunction = frameInfo.function
-
-        filepath = (realpath if self.contextAbsPath else basename)(frameInfo.filename)
-        return filepath, lineNumber, parentFunction
+        # frame attributes only, inspect.getframeinfo would read source lines
+        config = self.config if config is None else config
+        filepath, parentFunction = codeContext(callFrame.f_code, config.contextAbsPath)
+        return filepath, callFrame.f_lineno, parentFunction
 
     def enable(self):
         """
@@ -578,6 +1489,16 @@ class PyDBG_Obj:
         """
         self.enabled = False
 
+    @staticmethod
+    def callSiteCacheInfo():
+        """
+        Statistics of call site analysis cache.
+
+        :returns:   hits, misses, evictions, maxsize and current size
+        :rtype:     CacheInfo
+        """
+        return callSiteCache.info()
+
     def configureOutput(
         self,
         prefix=_absent,
@@ -585,6 +1506,13 @@ class PyDBG_Obj:
         argToStringFunction=_absent,
         includeContext=_absent,
         contextAbsPath=_absent,
+        recordFormat=_absent,
+        recordOutputFunction=_absent,
+        maxItems=_absent,
+        maxDepth=_absent,
+        maxLength=_absent,
+        rateLimiter=_absent,
+        queue=_absent,
     ):
         """
         Configure output of pydbg_obj.
@@ -599,8 +1527,30 @@ class PyDBG_Obj:
         :type       includeContext:       include context
         :param      contextAbsPath:       The context absolute path
         :type       contextAbsPath:       context abs path
+        :param      recordFormat:         The record format ("json", "msgpack")
+                                          or None for colored text
+        :type       recordFormat:         Optional[str]
+        :param      recordOutputFunction: The output function of records
+        :type       recordOutputFunction: output function
+        :param      maxItems:             The items limit of all containers of
+                                          an argument
+        :type       maxItems:             int
+        :param      maxDepth:             The nesting limit of containers
+        :type       maxDepth:             int
+        :param      maxLength:            The length limit of strings and
+                                          formatted arguments
+        :type       maxLength:            int
+        :param      rateLimiter:          The rate limiter of calls, keyed by
+                                          call site
+        :type       rateLimiter:          Optional[RateLimiter]
+        :param      queue:                The queue sink which formats calls on
+                                          its writer thread
+        :type       queue:                Optional[QueueSink]
 
         :raises     TypeError:            no parameter provided
+        :raises     ValueError:           unknown record format
+        :raises     ImportError:          msgpack is not installed
+        :raises     ValueError:           msgpack records with queue
         """
         noParameterProvided = all(
             v is _absent for k, v in locals().items() if k != "self"
@@ -608,55 +1558,114 @@ class PyDBG_Obj:
         if noParameterProvided:
             raise TypeError("configureOutput() missing at least one argument")
 
-        if prefix is not _absent:
-            self.prefix = prefix
+        with self._configLock:
+            updates = {}
+
+            if prefix is not _absent:
+                updates["prefix"] = prefix
+
+            if outputFunction is not _absent:
+                updates["outputFunction"] = outputFunction
+
+            if argToStringFunction is not _absent:
+                updates["argToStringFunction"] = argToStringFunction
 
-        if outputFunction is not _absent:
-            self.outputFunction = outputFunction
+            if includeContext is not _absent:
+                updates["includeContext"] = includeContext
 
-        if argToStringFunction is not _absent:
-            self.argToStringFunction = argToStringFunction
+            if contextAbsPath is not _absent:
+                updates["contextAbsPath"] = contextAbsPath
 
-        if includeContext is not _absent:
-            self.includeContext = includeContext
+            if recordFormat is not _absent:
+                updates["recordEncoder"] = (
+                    None if recordFormat is None else get_encoder(recordFormat)
+                )
+                updates["recordFormat"] = recordFormat
 
-        if contextAbsPath is not _absent:
-            self.contextAbsPath = contextAbsPath
+            if recordOutputFunction is not _absent:
+                updates["recordOutputFunction"] = recordOutputFunction
 
+            if rateLimiter is not _absent:
+                updates["rateLimiter"] = rateLimiter
 
-def debug_func(func, *args, **kwargs):
-    """Decorator for print info about function.
+            if queue is not _absent:
+                updates["queue"] = queue
+
+            checkQueueFormat(
+                updates.get("queue", self.config.queue),
+                updates.get("recordFormat", self.config.recordFormat),
+            )
+
+            limits = {
+                "max_items": maxItems,
+                "max_depth": maxDepth,
+                "max_length": maxLength,
+            }
+            updates["reprLimits"] = self.config.reprLimits._replace(
+                **{k: v for k, v in limits.items() if v is not _absent}
+            )
 
-    Arguments:
-    ---------
-    + func - executed func
+            # replaced as a whole, calls keep the configuration they have read
+            self.config = self.config._replace(**updates)
 
+
+def passthroughCall(self, arg=_absent, *args):
+    """
+    Call magic method of PyDBG_Obj in production mode: nothing is formatted or
+    written, only passthrough is returned. The first argument is separate to
+    skip packing of the common single argument call.
+
+    :param      arg:   The first argument
+    :type       arg:   object
+    :param      args:  The other arguments
+    :type       args:  list
+
+    :returns:   passthrough
+    :rtype:     list
+    """
+    if args:
+        return (arg,) + args
+
+    return None if arg is _absent else arg
+
+
+def passthroughACall(self, *args):
     """
+    acall method of PyDBG_Obj in production mode.
 
-    def wrapper():
-        func(*args, **kwargs)
+    :param      args:  The arguments
+    :type       args:  list
 
-    message = f"debug @ Function {func.__name__}() executed at {datetime.now()}"
-    debug_message(message, False)
-    return wrapper
+    :returns:   awaitable of passthrough
+    :rtype:     coroutine
+    """
+    return awaitPassthrough(None, passthroughCall(self, *args))
 
 
-def benchmark(func, *args, **kwargs):
-    """Measuring the speed of function execution (decorator).
+debugCall = PyDBG_Obj.__call__
+debugACall = PyDBG_Obj.acall
+productionMode = False
 
-    Arguments:
-    ---------
-    + func - executed func
 
+def setProductionMode(enabled=True):
     """
-    start = time()
+    Switch all PyDBG_Obj instances to production mode and back. In production
+    mode calls only return passthrough, enable() has no effect.
 
-    def wrapper():
-        func(*args, **kwargs)
+    The initial mode is read from the PYCOLOR_PYDBG environment variable ("0",
+    "off", "false" or "no" enable production mode, see PRODUCTION_VALUES). To
+    remove the calls completely see logger.strip.
 
-    end = time()
-    total = round(end - start, 2)
-    debug_message(
-        f"benchmark {func} @ Execution function {func.__name__} time: {total} sec", True
-    )
-    return wrapper
+    :param      enabled:  Enable production mode
+    :type       enabled:  bool
+    """
+    global productionMode
+
+    productionMode = enabled
+    PyDBG_Obj.__call__ = passthroughCall if enabled else debugCall
+    PyDBG_Obj.acall = passthroughACall if enabled else debugACall
+
+
+setProductionMode(
+    os.environ.get(PRODUCTION_ENV_VARIABLE, "1").strip().lower() in PRODUCTION_VALUES
+)
@@ -0,0 +1,157 @@
+"""
+Compile-time removal of PyDBG_Obj calls.
+
+Statements like `pydbg_obj(value)` or `await pydbg_obj.acall(value)` are
+replaced with `pass` when selected modules are imported, so they cost nothing
+at runtime. Calls used as expressions (`x = pydbg_obj(value)`) are kept,
+their passthrough value is needed.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import ast
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import sys
+from typing import Iterable, Optional
+
+DEFAULT_NAMES = ("pydbg_obj",)
+
+
+class StripTransformer(ast.NodeTransformer):
+    """
+    Replaces call statements of the given names with pass.
+    """
+
+    def __init__(self, names: Iterable[str] = DEFAULT_NAMES):
+        """
+        Initialization.
+
+        :param      names:  The names of PyDBG_Obj instances
+        :type       names:  Iterable[str]
+        """
+        self.names = frozenset(names)
+        self.removed = 0
+
+    def _is_debug_call(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Await):
+            node = node.value
+
+        if not isinstance(node, ast.Call):
+            return False
+
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr == "acall":
+            func = func.value
+
+        return isinstance(func, ast.Name) and func.id in self.names
+
+    def visit_Expr(self, node: ast.Expr) -> ast.AST:
+        if self._is_debug_call(node.value):
+            self.removed += 1
+            return ast.copy_location(ast.Pass(), node)
+
+        return node
+
+
+def strip_calls(source: str, names: Iterable[str] = DEFAULT_NAMES) -> ast.Module:
+    """
+    Parse source and remove PyDBG_Obj call statements.
+
+    :param      source:  The source code
+    :type       source:  str
+    :param      names:   The names of PyDBG_Obj instances
+    :type       names:   Iterable[str]
+
+    :returns:   module tree
+    :rtype:     ast.Module
+    """
+    return StripTransformer(names).visit(ast.parse(source))
+
+
+class StripLoader(importlib.machinery.SourceFileLoader):
+    """
+    Source loader which compiles modules without PyDBG_Obj call statements.
+
+    Bytecode cache is neither read nor written: the cached code of the module
+    must stay the unstripped one.
+    """
+
+    def __init__(self, fullname: str, path: str, names: Iterable[str]):
+        super().__init__(fullname, path)
+        self.names = tuple(names)
+
+    def get_code(self, fullname: str):
+        source = self.get_data(self.get_filename(fullname))
+        tree = strip_calls(importlib.util.decode_source(source), self.names)
+        return compile(tree, self.path, "exec", dont_inherit=True)
+
+
+class StripFinder(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder of modules to strip.
+    """
+
+    def __init__(self, modules: Iterable[str], names: Iterable[str]):
+        """
+        Initialization.
+
+        :param      modules:  The module names, submodules are included
+        :type       modules:  Iterable[str]
+        :param      names:    The names of PyDBG_Obj instances
+        :type       names:    Iterable[str]
+        """
+        self.modules = tuple(modules)
+        self.names = tuple(names)
+
+    def _selected(self, fullname: str) -> bool:
+        return any(
+            fullname == module or fullname.startswith(f"{module}.")
+            for module in self.modules
+        )
+
+    def find_spec(self, fullname, path, target=None):
+        if not self._selected(fullname):
+            return None
+
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or not isinstance(
+            spec.loader, importlib.machinery.SourceFileLoader
+        ):
+            return spec
+
+        spec.loader = StripLoader(fullname, spec.origin, self.names)
+        return spec
+
+
+_finder: Optional[StripFinder] = None
+
+
+def install_strip_hook(
+    modules: Iterable[str], names: Iterable[str] = DEFAULT_NAMES
+) -> None:
+    """
+    Strip PyDBG_Obj call statements from modules imported from now on.
+
+    :param      modules:  The module names, submodules are included
+    :type       modules:  Iterable[str]
+    :param      names:    The names of PyDBG_Obj instances
+    :type       names:    Iterable[str]
+    """
+    global _finder
+
+    uninstall_strip_hook()
+    _finder = StripFinder(modules, names)
+    sys.meta_path.insert(0, _finder)
+
+
+def uninstall_strip_hook() -> None:
+    """
+    Remove the import hook, already imported modules stay stripped.
+    """
+    global _finder
+
+    if _finder is not None:
+        sys.meta_path.remove(_finder)
+        _finder = None
@@ -0,0 +1,287 @@
+"""
+Timing engine behind the benchmark decorator.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import functools
+import math
+import random
+import threading
+from time import perf_counter_ns
+from typing import Callable, Optional, Tuple
+
+from pycolor_palette_loguru.paint import debug_message
+
+DEFAULT_RESERVOIR_SIZE = 1024
+REPORT_OUTPUTS = ("paint", "loguru", None)
+
+
+def format_duration(ns: float) -> str:
+    """
+    Format duration in nanoseconds with a human readable unit.
+
+    :param      ns:   duration in nanoseconds
+    :type       ns:   float
+
+    :returns:   formatted duration
+    :rtype:     str
+    """
+    if ns < 1e3:
+        return f"{ns:.0f} ns"
+    elif ns < 1e6:
+        return f"{ns / 1e3:.2f} us"
+    elif ns < 1e9:
+        return f"{ns / 1e6:.2f} ms"
+
+    return f"{ns / 1e9:.2f} sec"
+
+
+class TimingStats:
+    """
+    Running statistics of function execution time.
+
+    Count, min, max, mean and stddev are exact (Welford's algorithm), percentiles
+    are estimated from a bounded reservoir sample of the timings.
+    """
+
+    def __init__(self, reservoir_size: int = DEFAULT_RESERVOIR_SIZE):
+        """
+        Initialization.
+
+        :param      reservoir_size:  The maximum number of stored samples
+        :type       reservoir_size:  int
+
+        :raises     ValueError:      reservoir size is not positive
+        """
+        if reservoir_size < 1:
+            raise ValueError("reservoir_size must be positive")
+
+        self.reservoir_size = reservoir_size
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset collected statistics.
+        """
+        with self._lock:
+            self.count = 0
+            self.last = 0
+            self.min = 0
+            self.max = 0
+            self.mean = 0.0
+            self._m2 = 0.0
+            self._reservoir = []
+
+    def add(self, elapsed: int) -> None:
+        """
+        Add timing sample.
+
+        :param      elapsed:  The elapsed time in nanoseconds
+        :type       elapsed:  int
+        """
+        with self._lock:
+            self.count += 1
+            self.last = elapsed
+
+            if self.count == 1 or elapsed < self.min:
+                self.min = elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+
+            delta = elapsed - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (elapsed - self.mean)
+
+            if len(self._reservoir) < self.reservoir_size:
+                self._reservoir.append(elapsed)
+            else:
+                # cheaper than randrange, uniform enough for any realistic count
+                index = int(random.random() * self.count)
+                if index < self.reservoir_size:
+                    self._reservoir[index] = elapsed
+
+    @property
+    def stddev(self) -> float:
+        """
+        Sample standard deviation in nanoseconds.
+
+        :returns:   stddev
+        :rtype:     float
+        """
+        if self.count < 2:
+            return 0.0
+
+        return math.sqrt(self._m2 / (self.count - 1))
+
+    def percentiles(self, *percents: float) -> Tuple[float, ...]:
+        """
+        Estimate percentiles of timings with linear interpolation, sorting the
+        reservoir once.
+
+        :param      percents:  The percents (0-100)
+        :type       percents:  float
+
+        :returns:   percentiles in nanoseconds
+        :rtype:     Tuple[float, ...]
+        """
+        with self._lock:
+            samples = sorted(self._reservoir)
+
+        if not samples:
+            return (0.0,) * len(percents)
+
+        result = []
+        for percent in percents:
+            position = (len(samples) - 1) * percent / 100
+            lower = math.floor(position)
+            upper = math.ceil(position)
+            result.append(
+                samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+            )
+
+        return tuple(result)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimate percentile of timings with linear interpolation.
+
+        :param      percent:  The percent (0-100)
+        :type       percent:  float
+
+        :returns:   percentile in nanoseconds
+        :rtype:     float
+        """
+        return self.percentiles(percent)[0]
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    def as_dict(self) -> dict:
+        """
+        Get statistics as dictionary (all values in nanoseconds).
+
+        :returns:   statistics
+        :rtype:     dict
+        """
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            "count": self.count,
+            "last": self.last,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "stddev": self.stddev,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
+
+    def summary(self) -> str:
+        """
+        Get human readable summary of statistics.
+
+        :returns:   summary
+        :rtype:     str
+        """
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return (
+            f"calls: {self.count} | last: {format_duration(self.last)} | "
+            f"min: {format_duration(self.min)} | max: {format_duration(self.max)} | "
+            f"mean: {format_duration(self.mean)} +- {format_duration(self.stddev)} | "
+            f"p50: {format_duration(p50)} | p95: {format_duration(p95)} | "
+            f"p99: {format_duration(p99)}"
+        )
+
+
+def benchmark(
+    func: Optional[Callable] = None,
+    *,
+    repeat: int = 1,
+    warmup: int = 0,
+    report: Optional[str] = "paint",
+    report_every: int = 0,
+    reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+) -> Callable:
+    """Measuring the speed of function execution (decorator).
+
+    Every call is timed with `time.perf_counter_ns`, arguments and the return
+    value are passed through. Collected statistics are available as
+    `wrapper.stats` (see TimingStats), `wrapper.report()` reports them on
+    demand.
+
+    Can be used as `@benchmark` or `@benchmark(repeat=1000, warmup=10)`.
+
+    Arguments:
+    ---------
+    + func - executed func
+    + repeat - number of timed runs per call (micro-benchmark mode)
+    + warmup - number of untimed runs per call before the timed runs
+    + report - where reports go: "paint" (debug_message), "loguru" or None
+    + report_every - report every N calls, 0 (default) disables automatic
+      reports
+    + reservoir_size - number of samples kept for percentiles
+
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be positive")
+    if warmup < 0:
+        raise ValueError("warmup must not be negative")
+    if report not in REPORT_OUTPUTS:
+        raise ValueError(f"report must be one of {REPORT_OUTPUTS}")
+
+    if func is None:
+        return functools.partial(
+            benchmark,
+            repeat=repeat,
+            warmup=warmup,
+            report=report,
+            report_every=report_every,
+            reservoir_size=reservoir_size,
+        )
+
+    stats = TimingStats(reservoir_size)
+
+    def emit_report() -> None:
+        if report is None:
+            return
+
+        message = f"benchmark {func.__qualname__} @ {stats.summary()}"
+
+        if report == "loguru":
+            from loguru import logger
+
+            logger.opt(depth=2).debug(message)
+        elif report == "paint":
+            debug_message(message, True)
+
+    report_calls = report_every * repeat if report is not None else 0
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for _ in range(warmup):
+            func(*args, **kwargs)
+
+        for _ in range(repeat):
+            start = perf_counter_ns()
+            result = func(*args, **kwargs)
+            stats.add(perf_counter_ns() - start)
+
+        if report_calls and stats.count % report_calls == 0:
+            emit_report()
+
+        return result
+
+    wrapper.stats = stats
+    wrapper.report = emit_report
+    return wrapper
@@ -0,0 +1,168 @@
+"""
+Per-call tracing behind the debug_func decorator.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import functools
+import itertools
+import os
+import random
+import reprlib
+from time import perf_counter_ns
+from typing import Callable, Optional, Union
+
+from loguru import logger
+
+from pycolor_palette_loguru.logger.timing import format_duration
+
+TRACING_ENV_VARIABLE = "PYCOLOR_TRACING"
+TRACING_OFF_VALUES = ("0", "off", "false", "no")  # Disable tracing.
+
+_argsRepr = reprlib.Repr()
+_argsRepr.maxstring = 80
+_argsRepr.maxother = 80
+
+
+class TracingSwitch:
+    """
+    Process-wide kill switch of debug_func tracing.
+
+    Disabled tracing costs one attribute check per decorated call. The initial
+    state is read from the PYCOLOR_TRACING environment variable ("0", "off",
+    "false" or "no" disable tracing, see TRACING_OFF_VALUES).
+    """
+
+    def __init__(self):
+        """
+        Initialization.
+        """
+        value = os.environ.get(TRACING_ENV_VARIABLE, "1").strip().lower()
+        self.enabled = value not in TRACING_OFF_VALUES
+
+
+tracing = TracingSwitch()
+
+
+def enable_tracing() -> None:
+    """
+    Enable debug_func tracing in the whole process.
+    """
+    tracing.enabled = True
+
+
+def disable_tracing() -> None:
+    """
+    Disable debug_func tracing in the whole process.
+    """
+    tracing.enabled = False
+
+
+def _make_sampler(sample: Union[int, float]) -> Optional[Callable[[], bool]]:
+    """
+    Make sampler function.
+
+    :param      sample:      1 in N calls (int) or probability (float)
+    :type       sample:      Union[int, float]
+
+    :returns:   sampler or None if every call is traced
+    :rtype:     Optional[Callable[[], bool]]
+
+    :raises     ValueError:  invalid sample value
+    """
+    if isinstance(sample, bool):
+        raise ValueError("sample must be int or float")
+
+    if isinstance(sample, int):
+        if sample < 1:
+            raise ValueError("sample rate must be positive")
+        elif sample == 1:
+            return None
+
+        counter = itertools.count()
+        return lambda: next(counter) % sample == 0
+
+    if not 0.0 < sample <= 1.0:
+        raise ValueError("sample probability must be in (0, 1]")
+    elif sample == 1.0:
+        return None
+
+    return lambda: random.random() < sample
+
+
+def _format_call(name: str, args: tuple, kwargs: dict) -> str:
+    """
+    Format call signature.
+
+    :param      name:    The function name
+    :type       name:    str
+    :param      args:    The arguments
+    :type       args:    tuple
+    :param      kwargs:  The keywords arguments
+    :type       kwargs:  dict
+
+    :returns:   call
+    :rtype:     str
+    """
+    params = [_argsRepr.repr(arg) for arg in args]
+    params.extend(f"{key}={_argsRepr.repr(value)}" for key, value in kwargs.items())
+
+    return f"{name}({', '.join(params)})"
+
+
+def debug_func(
+    func: Optional[Callable] = None,
+    *,
+    sample: Union[int, float] = 1,
+    level: str = "DEBUG",
+) -> Callable:
+    """Decorator for tracing every call of function through loguru.
+
+    Logs entry (with arguments), exit (with result) and duration or the raised
+    exception. Can be used as `@debug_func` or `@debug_func(sample=100)`.
+
+    Arguments:
+    ---------
+    + func - executed func
+    + sample - trace 1 in N calls (int) or calls with probability (float)
+    + level - loguru level of trace messages
+
+    """
+    sampler = _make_sampler(sample)
+
+    if func is None:
+        return functools.partial(debug_func, sample=sample, level=level)
+
+    switch = tracing
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not switch.enabled:
+            return func(*args, **kwargs)
+        if sampler is not None and not sampler():
+            return func(*args, **kwargs)
+
+        log = logger.opt(depth=1)
+        call = _format_call(name, args, kwargs)
+        log.log(level, "debug @ call {}", call)
+
+        start = perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            elapsed = format_duration(perf_counter_ns() - start)
+            log.log(level, "debug @ {} raised {!r} after {}", call, exc, elapsed)
+            raise
+
+        elapsed = format_duration(perf_counter_ns() - start)
+        log.log(
+            level,
+            "debug @ {} returned {} in {}",
+            call,
+            _argsRepr.repr(result),
+            elapsed,
+        )
+        return result
+
+    return wrapper
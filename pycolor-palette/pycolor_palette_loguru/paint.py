@@ -1,8 +1,21 @@
 #!/usr/bin/python3
+from contextvars import copy_context
 from datetime import datetime
+from functools import lru_cache, partial
 from sys import stdout, stdin
-from time import sleep
+from time import sleep, time
+from typing import Optional, TextIO, Tuple
 import os
+import sys
+
+from pycolor_palette_loguru import terminal
+from pycolor_palette_loguru.colors import BG_256, COLOR_MODES, FG_256, RGB_ESCAPES
+from pycolor_palette_loguru.context import context_items, context_text
+from pycolor_palette_loguru.ratelimit import RateLimiter, repeated_message
+from pycolor_palette_loguru.sinks import get_sink
+
+_color_mode = "truecolor"
+_fg_rgb, _bg_rgb = RGB_ESCAPES[_color_mode]
 
 
 def cls():
@@ -12,6 +25,63 @@ def cls():
     os.system("clear")
 
 
+def _no_color(r: int, g: int, b: int) -> str:
+    return ""
+
+
+def set_color_mode(mode: Optional[str]) -> None:
+    """
+    Set color mode: "truecolor", quantization of FG.rgb and BG.rgb to the
+    nearest "256" (xterm) or "16" (ANSI) color, or None to disable colors.
+
+    Without colors FG, BG, Style attributes and all *_message functions emit no
+    escape sequences at all.
+
+    :param      mode:        The mode
+    :type       mode:        Optional[str]
+
+    :raises     ValueError:  unknown mode
+    """
+    global _color_mode, _fg_rgb, _bg_rgb
+
+    if mode is not None and mode not in COLOR_MODES:
+        raise ValueError(f"color mode must be one of {COLOR_MODES} or None")
+
+    _color_mode = mode
+    _fg_rgb, _bg_rgb = (_no_color, _no_color) if mode is None else RGB_ESCAPES[mode]
+
+    for cls, escapes in _ESCAPE_ATTRIBUTES.items():
+        for name, escape in escapes.items():
+            setattr(cls, name, "" if mode is None else escape)
+
+    message_template.cache_clear()
+
+
+def get_color_mode() -> Optional[str]:
+    """
+    Get color mode (None if colors are disabled).
+
+    :returns:   mode
+    :rtype:     Optional[str]
+    """
+    return _color_mode
+
+
+def auto_color_mode(stream: Optional[TextIO] = None) -> Optional[str]:
+    """
+    Set color mode detected for stream (see terminal.color_mode).
+
+    :param      stream:  The stream (sys.stdout if None)
+    :type       stream:  Optional[TextIO]
+
+    :returns:   mode
+    :rtype:     Optional[str]
+    """
+    mode = terminal.color_mode(stream)
+    set_color_mode(mode)
+    return mode
+
+
 class FG:
     """
     Foreground class.
@@ -41,7 +111,20 @@ class FG:
         :returns:   color
         :rtype:     str
         """
-        return f"\u001b[38;2;{r};{g};{b}m"
+        return _fg_rgb(r, g, b)
+
+    @staticmethod
+    def color256(index: int) -> str:
+        """
+        Function for get ansi code of xterm-256 color.
+
+        :param      index:  color index (0-255)
+        :type       index:  int
+
+        :returns:   color
+        :rtype:     str
+        """
+        return FG_256[index] if _color_mode is not None else ""
 
 
 class BG:
@@ -73,7 +156,20 @@ class BG:
         :returns:   color
         :rtype:     str
         """
-        return f"\u001b[48;2;{r};{g};{b}m"
+        return _bg_rgb(r, g, b)
+
+    @staticmethod
+    def color256(index: int) -> str:
+        """
+        Function for get ansi code of xterm-256 color.
+
+        :param      index:  color index (0-255)
+        :type       index:  int
+
+        :returns:   color
+        :rtype:     str
+        """
+        return BG_256[index] if _color_mode is not None else ""
 
 
 class Style:
@@ -110,7 +206,7 @@ class Style:
         :returns:   cursor
         :rtype:     string
         """
-        return f"\u001b[{y};{x}H"
+        return f"\u001b[{y};{x}H" if _color_mode is not None else ""
 
     @staticmethod
     def write(text="\n"):
@@ -120,8 +216,7 @@ class Style:
         :param      text:  The text
         :type       text:  str
         """
-        stdout.write(text)
-        stdout.flush()
+        get_sink().write(text)
 
     @staticmethod
     def writew(text="\n", wait=0.01):
@@ -133,6 +228,7 @@ class Style:
         :param      wait:  The wait
         :type       wait:  float
         """
+        get_sink().flush()
         for char in text:
             stdout.write(char)
             stdout.flush()
@@ -147,6 +243,7 @@ class Style:
         :type       begin:  str
         """
         text = ""
+        get_sink().flush()
         stdout.write(begin)
         stdout.flush()
         while True:
@@ -170,6 +267,7 @@ class Style:
         :type       wait:   float
         """
         text = ""
+        get_sink().flush()
 
         for char in begin:
             stdout.write(char)
@@ -187,6 +285,294 @@ class Style:
                 text += chr(char)
 
 
+# escape attributes of classes, restored when colors are enabled again
+_ESCAPE_ATTRIBUTES = {
+    cls: {
+        name: value
+        for name, value in vars(cls).items()
+        if not name.startswith("_") and isinstance(value, str)
+    }
+    for cls in (FG, BG, Style)
+}
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMESTAMP_WIDTH = 20
+LEVEL_WIDTH = 20
+
+# (second, rendered timestamp), replaced as a whole so readers never see a mix
+_timestamp_cache = (None, "")
+
+# (format, Record, encoder) of structured output, None for colored text
+_record_output = None
+_rate_limiter = None
+
+
+def timestamp() -> str:
+    """
+    Get padded timestamp of message, rendered at most once per second.
+
+    :returns:   timestamp
+    :rtype:     str
+    """
+    global _timestamp_cache
+    second = int(time())
+    cached_second, rendered = _timestamp_cache
+
+    if second != cached_second:
+        rendered = "%-*s" % (
+            TIMESTAMP_WIDTH,
+            datetime.fromtimestamp(second).strftime(TIMESTAMP_FORMAT),
+        )
+        _timestamp_cache = (second, rendered)
+
+    return rendered
+
+
+@lru_cache(maxsize=256)
+def message_template(
+    color: str, level: str, highlight: bool = False, exception: bool = False
+) -> Tuple[str, str]:
+    """
+    Render constant parts of message: the part before timestamp and the part
+    between timestamp and text.
+
+    :param      color:      The color name (FG/BG attribute)
+    :type       color:      str
+    :param      level:      The level name
+    :type       level:      str
+    :param      highlight:  The highlight
+    :type       highlight:  bool
+    :param      exception:  Use exception layout (bold, no reset after level)
+    :type       exception:  bool
+
+    :returns:   head and tail of message
+    :rtype:     Tuple[str, str]
+    """
+    prefix = f"{getattr(BG, color)}{FG.black}" if highlight else getattr(FG, color)
+
+    if exception:
+        return f"{Style.bold}{prefix}", " | %-*s ::: " % (LEVEL_WIDTH, level)
+
+    return prefix, " | %-*s%s ::: " % (LEVEL_WIDTH, level, Style.reset)
+
+
+def emit(message: str) -> None:
+    """
+    Write message line to the current paint sink.
+
+    :param      message:  The message
+    :type       message:  str
+    """
+    get_sink().write(f"{message}\n")
+
+
+def set_record_format(record_format: Optional[str]) -> None:
+    """
+    Write messages as structured records instead of colored text: one JSON
+    line or msgpack object per message, without padding and escapes. None
+    switches back to colored text.
+
+    msgpack objects are written to the binary buffer of stdout after flushing
+    the sink. The aio message functions always write colored text.
+
+    :param      record_format:  The record format ("json", "msgpack" or None)
+    :type       record_format:  Optional[str]
+
+    :raises     ValueError:   unknown record format
+    :raises     ImportError:  msgpack is not installed
+    """
+    global _record_output
+
+    if record_format is None:
+        _record_output = None
+        return
+
+    from pycolor_palette_loguru.structured import Record, get_encoder
+
+    _record_output = (record_format, Record, get_encoder(record_format))
+
+
+def get_record_format() -> Optional[str]:
+    """
+    Get record format (None if messages are colored text).
+
+    :returns:   record format
+    :rtype:     Optional[str]
+    """
+    return None if _record_output is None else _record_output[0]
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """
+    Limit messages with rate limiter, keyed by level and text: repeats over
+    the limit are dropped and reported by periodic summaries. None disables
+    limiting. The aio message functions are not limited.
+
+    :param      limiter:  The limiter
+    :type       limiter:  Optional[RateLimiter]
+    """
+    global _rate_limiter
+
+    _rate_limiter = limiter
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """
+    Get rate limiter of messages (None if messages are not limited).
+
+    :returns:   limiter
+    :rtype:     Optional[RateLimiter]
+    """
+    return _rate_limiter
+
+
+@lru_cache(maxsize=256)
+def code_context(code) -> Tuple[str, str]:
+    """
+    Get file name and function name of code object, memoized per code object.
+
+    :param      code:  The code object
+    :type       code:  code
+
+    :returns:   (file name, function name)
+    :rtype:     Tuple[str, str]
+    """
+    return os.path.basename(code.co_filename), code.co_name
+
+
+def frame_context(frame) -> Tuple[str, int, str]:
+    """
+    Get context of record from call frame: (file name, line, function).
+
+    :param      frame:  The call frame
+    :type       frame:  frame
+
+    :returns:   context
+    :rtype:     Tuple[str, int, str]
+    """
+    file, function = code_context(frame.f_code)
+    return file, frame.f_lineno, function
+
+
+def emit_record(
+    level: str, text: str, context: Optional[Tuple[str, int, str]] = None
+) -> None:
+    """
+    Write message record to the current paint sink.
+
+    :param      level:    The level name
+    :type       level:    str
+    :param      text:     The text
+    :type       text:     str
+    :param      context:  The call site (file name, line, function), see
+                          frame_context
+    :type       context:  Optional[Tuple[str, int, str]]
+    """
+    _, record_type, encoder = _record_output
+    data = encoder(record_type(time(), level, text, context, extra=context_items()))
+
+    if isinstance(data, bytes):
+        from pycolor_palette_loguru.structured import write_record
+
+        get_sink().flush()
+        write_record(data, sys.stdout)
+    else:
+        get_sink().write(f"{data}\n")
+
+
+def write_message(
+    color: str, level: str, text: str, highlight: bool = False, exception: bool = False
+) -> None:
+    """
+    Write message as colored text or as record, see set_record_format and
+    set_rate_limiter. Summary of suppressed repeats is written with the next
+    message let through, or by the flush timer of the limiter. The context of
+    records is the caller of the message function (info_message, ...) which
+    calls write_message.
+
+    :param      color:      The color name (FG/BG attribute)
+    :type       color:      str
+    :param      level:      The level name
+    :type       level:      str
+    :param      text:       The text
+    :type       text:       str
+    :param      highlight:  The highlight
+    :type       highlight:  bool
+    :param      exception:  Use exception layout
+    :type       exception:  bool
+    """
+    # messages may be any objects, but keys and records need text
+    text = str(text)
+    level = str(level)
+
+    # caller of the message function, only records show it
+    context = None if _record_output is None else frame_context(sys._getframe(2))
+
+    limiter = _rate_limiter
+    if limiter is not None:
+        summary = partial(
+            copy_context().run,
+            _write_summary,
+            color,
+            level,
+            text,
+            highlight,
+            exception,
+            context,
+        )
+        repeated = limiter.check(hash((level, text)), summary)
+        if repeated is None:
+            return
+        elif repeated:
+            text = repeated_message(text, repeated)
+
+    _write_message(color, level, text, highlight, exception, context)
+
+
+def _write_summary(
+    color: str,
+    level: str,
+    text: str,
+    highlight: bool,
+    exception: bool,
+    context: Optional[Tuple[str, int, str]],
+    repeated: int,
+) -> None:
+    text = repeated_message(text, repeated)
+    _write_message(color, level, text, highlight, exception, context)
+
+
+def _write_message(
+    color: str,
+    level: str,
+    text: str,
+    highlight: bool,
+    exception: bool,
+    context: Optional[Tuple[str, int, str]],
+) -> None:
+    if _record_output is not None:
+        emit_record(level, text, context)
+    else:
+        template = message_template(color, level, highlight, exception)
+        emit(render_message(template, text))
+
+
+def render_message(template: Tuple[str, str], text: str) -> str:
+    """
+    Render message from template, with values bound by context.bind_context.
+
+    :param      template:  The template (see message_template)
+    :type       template:  Tuple[str, str]
+    :param      text:      The text
+    :type       text:      str
+
+    :returns:   message
+    :rtype:     str
+    """
+    head, tail = template
+    return f"{head}{timestamp()}{tail}{context_text()}{text}{Style.reset}"
+
+
 def info_message(text: str, highlight: bool = False) -> str:
     """
     print info message
@@ -199,18 +585,7 @@ def info_message(text: str, highlight: bool = False) -> str:
     :returns:   message
     :rtype:     str
     """
-    prefix = f"{BG.green}{FG.black}" if highlight else f"{FG.green}"
-    message = "%s%-*s | %-*s%s ::: %s%s" % (
-        prefix,
-        20,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        20,
-        "INFO",
-        Style.reset,
-        text,
-        Style.reset,
-    )
-    print(message)
+    write_message("green", "INFO", text, highlight)
 
 
 def warn_message(text: str, highlight: bool = False) -> str:
@@ -225,18 +600,7 @@ def warn_message(text: str, highlight: bool = False) -> str:
     :returns:   message
     :rtype:     str
     """
-    prefix = f"{BG.yellow}{FG.black}" if highlight else f"{FG.yellow}"
-    message = "%s%-*s | %-*s%s ::: %s%s" % (
-        prefix,
-        20,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        20,
-        "WARNING",
-        Style.reset,
-        text,
-        Style.reset,
-    )
-    print(message)
+    write_message("yellow", "WARNING", text, highlight)
 
 
 def error_message(text: str, highlight: bool = False) -> str:
@@ -251,18 +615,7 @@ def error_message(text: str, highlight: bool = False) -> str:
     :returns:   message
     :rtype:     str
     """
-    prefix = f"{BG.red}{FG.black}" if highlight else f"{FG.red}"
-    message = "%s%-*s | %-*s%s ::: %s%s" % (
-        prefix,
-        20,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        20,
-        "ERROR",
-        Style.reset,
-        text,
-        Style.reset,
-    )
-    print(message)
+    write_message("red", "ERROR", text, highlight)
 
 
 def debug_message(text: str, highlight: bool = False) -> str:
@@ -277,18 +630,7 @@ def debug_message(text: str, highlight: bool = False) -> str:
     :returns:   message
     :rtype:     str
     """
-    prefix = f"{BG.blue}{FG.black}" if highlight else f"{FG.blue}"
-    message = "%s%-*s | %-*s%s ::: %s%s" % (
-        prefix,
-        20,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        20,
-        "DEBUG",
-        Style.reset,
-        text,
-        Style.reset,
-    )
-    print(message)
+    write_message("blue", "DEBUG", text, highlight)
 
 
 def other_message(text: str, msg_type: str, highlight: bool = False) -> str:
@@ -303,18 +645,7 @@ def other_message(text: str, msg_type: str, highlight: bool = False) -> str:
     :returns:   message
     :rtype:     str
     """
-    prefix = f"{BG.magenta}{FG.black}" if highlight else f"{FG.magenta}"
-    message = "%s%-*s | %-*s%s ::: %s%s" % (
-        prefix,
-        20,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        20,
-        msg_type,
-        Style.reset,
-        text,
-        Style.reset,
-    )
-    print(message)
+    write_message("magenta", msg_type, text, highlight)
 
 
 def run_exception(text: str, highlight: bool = False):
@@ -329,16 +660,9 @@ def run_exception(text: str, highlight: bool = False):
     :returns:   message
     :rtype:     str
     """
-    prefix = f"{BG.red}{FG.black}" if highlight else f"{FG.red}"
-    message = "%s%s%-*s | %-*s ::: %s%s" % (
-        Style.bold,
-        prefix,
-        20,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        20,
-        "EXCEPTION",
-        text,
-        Style.reset,
-    )
-    print(message)
+    write_message("red", "EXCEPTION", text, highlight, exception=True)
+    get_sink().flush()
     raise Exception(text)
+
+
+auto_color_mode()
@@ -0,0 +1,293 @@
+"""
+Rate limiting and duplicate suppression of output.
+
+Every key (a hash of message text, a PyDBG_Obj call site) has a token bucket:
+burst messages pass at once, then rate messages per second. Suppressed
+messages are counted, and at most once per summary_interval a message is let
+through as a summary "... (message repeated N times)". When no message of the
+key comes after the interval, the summary callback given to check is called by
+the flush timer thread shared with buffered sinks (and at interpreter exit).
+Buckets are kept in a bounded LRU cache, so a check is a hash lookup and some
+arithmetic.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import atexit
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from typing import Callable, Hashable, Optional
+
+from pycolor_palette_loguru.cache import LRUCache
+from pycolor_palette_loguru.sinks import _flush_timer
+
+DEFAULT_RATE = 1.0  # Messages per second of one key.
+DEFAULT_BURST = 10
+DEFAULT_SUMMARY_INTERVAL = 5.0  # Seconds.
+DEFAULT_MAX_KEYS = 1024
+# fields of suppressed loguru record copied to its flushed summary
+SUMMARY_RECORD_KEYS = ("name", "module", "function", "line", "file", "extra")
+
+# limiters flushed by the single atexit hook of the module
+_limiters = weakref.WeakSet()
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "suppressed", "reported", "summary")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        self.suppressed = 0
+        self.reported = now
+        self.summary = None
+
+
+class RateLimiter:
+    """
+    Per-key token bucket limiter which collapses suppressed messages into
+    periodic summaries.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        summary_interval: float = DEFAULT_SUMMARY_INTERVAL,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialization.
+
+        :param      rate:              The messages per second of one key
+        :type       rate:              float
+        :param      burst:             The messages of one key passed at once
+        :type       burst:             int
+        :param      summary_interval:  The minimal interval of summaries (sec)
+        :type       summary_interval:  float
+        :param      max_keys:          The number of keys kept (LRU)
+        :type       max_keys:          int
+        :param      clock:             The clock (sec)
+        :type       clock:             Callable[[], float]
+
+        :raises     ValueError:        rate is negative or burst is not positive
+        """
+        if rate < 0:
+            raise ValueError("rate must not be negative")
+        elif burst < 1:
+            raise ValueError("burst must be positive")
+
+        self.rate = rate
+        self.burst = burst
+        self.summary_interval = summary_interval
+        self.clock = clock
+
+        self._buckets = LRUCache(max_keys)
+        # buckets with suppressed messages and summary callback, by key
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        _limiters.add(self)
+
+    def check(
+        self, key: Hashable, summary: Optional[Callable[[int], None]] = None
+    ) -> Optional[int]:
+        """
+        Check message of key.
+
+        :param      key:      The key
+        :type       key:      Hashable
+        :param      summary:  The callback which outputs summary of suppressed
+                              messages (gets their number), called by flush
+                              if no message of key is let through in time
+        :type       summary:  Optional[Callable[[int], None]]
+
+        :returns:   None if message is suppressed, otherwise the number of
+                    messages suppressed since the last one of key (show the
+                    message as summary if it is not 0)
+        :rtype:     Optional[int]
+        """
+        now = self.clock()
+        repeated = 0
+        delay = None
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = _Bucket(self.burst, now)
+                self._buckets.put(key, bucket)
+            else:
+                tokens = bucket.tokens + (now - bucket.updated) * self.rate
+                bucket.tokens = tokens if tokens < self.burst else self.burst
+                bucket.updated = now
+
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+            elif now - bucket.reported < self.summary_interval:
+                bucket.suppressed += 1
+                if summary is not None:
+                    bucket.summary = summary
+                    if self._pending.get(key) is not bucket:
+                        self._pending[key] = bucket
+                        delay = bucket.reported + self.summary_interval - now
+                repeated = None
+
+            if repeated is not None:
+                repeated = bucket.suppressed
+                bucket.suppressed = 0
+                bucket.reported = now
+                if bucket.summary is not None:
+                    bucket.summary = None
+                    self._pending.pop(key, None)
+
+        if delay is not None:
+            _flush_timer.schedule(self, delay)
+
+        return repeated
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Output summaries of keys with suppressed messages, whose summary
+        interval passed since the last message let through.
+
+        :param      force:  Output all pending summaries (at exit)
+        :type       force:  bool
+        """
+        now = self.clock()
+        summaries = []
+        delay = None
+
+        with self._lock:
+            for key, bucket in list(self._pending.items()):
+                wait = bucket.reported + self.summary_interval - now
+
+                if force or wait <= 0:
+                    summaries.append((bucket.summary, bucket.suppressed))
+                    bucket.summary = None
+                    bucket.suppressed = 0
+                    bucket.reported = now
+                    del self._pending[key]
+                elif delay is None or wait < delay:
+                    delay = wait
+
+        if delay is not None:
+            _flush_timer.schedule(self, delay)
+
+        for summary, repeated in summaries:
+            try:
+                summary(repeated)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def clear(self) -> None:
+        """
+        Forget all keys, pending summaries are dropped.
+        """
+        with self._lock:
+            self._buckets.clear()
+            self._pending.clear()
+
+        _flush_timer.cancel(self)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._pending.clear()
+
+
+def _flush_limiters() -> None:
+    for limiter in list(_limiters):
+        limiter.flush(force=True)
+
+
+def _reset_limiters_after_fork() -> None:
+    for limiter in list(_limiters):
+        limiter._reset_after_fork()
+
+
+# registered after the hook of sinks, so summaries are written before sinks close
+atexit.register(_flush_limiters)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_limiters_after_fork)
+
+
+def repeated_summary(repeated: int) -> str:
+    """
+    Render summary of suppressed messages.
+
+    :param      repeated:  The number of suppressed messages
+    :type       repeated:  int
+
+    :returns:   summary
+    :rtype:     str
+    """
+    return f"message repeated {repeated} times"
+
+
+def repeated_message(text: str, repeated: int) -> str:
+    """
+    Render message with summary of suppressed messages.
+
+    :param      text:      The text of message
+    :type       text:      str
+    :param      repeated:  The number of suppressed messages
+    :type       repeated:  int
+
+    :returns:   summary
+    :rtype:     str
+    """
+    return f"{text} ({repeated_summary(repeated)})"
+
+
+def loguru_filter(limiter: RateLimiter) -> Callable[[dict], bool]:
+    """
+    Make loguru filter which limits records by level and message. A record
+    is checked once even if several handlers use the filter, a summary
+    replaces the record message. Summaries flushed without a next record are
+    logged with the call site and extra values of the last suppressed record.
+
+    :param      limiter:  The limiter
+    :type       limiter:  RateLimiter
+
+    :returns:   filter
+    :rtype:     Callable[[dict], bool]
+    """
+    # loguru runs filters of all handlers in the thread which logs the record
+    last = threading.local()
+
+    def log_summary(record: dict, repeated: int) -> None:
+        from loguru import logger
+
+        site = {key: record[key] for key in SUMMARY_RECORD_KEYS}
+        last.summary = True
+        try:
+            logger.patch(lambda patched: patched.update(site)).log(
+                record["level"].name, repeated_message(record["message"], repeated)
+            )
+        finally:
+            last.summary = False
+
+    def limit(record: dict) -> bool:
+        if getattr(last, "summary", False):
+            return True
+        elif getattr(last, "record", None) is record:
+            return last.allowed
+
+        repeated = limiter.check(
+            hash((record["level"].no, record["message"])),
+            functools.partial(log_summary, record),
+        )
+        if repeated:
+            record["message"] = repeated_message(record["message"], repeated)
+
+        last.record = record
+        last.allowed = repeated is not None
+        return last.allowed
+
+    return limit
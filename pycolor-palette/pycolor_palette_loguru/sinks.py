@@ -0,0 +1,594 @@
+"""
+Output sinks of paint messages.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Optional, TextIO, Union
+
+DEFAULT_MAX_BUFFER_BYTES = 64 * 1024
+DEFAULT_MAX_LATENCY = 0.05  # Seconds.
+DEFAULT_QUEUE_SIZE = 10000
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_new")
+
+
+def write_atomic(stream: TextIO, data: Union[str, bytes]) -> None:
+    """
+    Write data to stream with one system call, so output of concurrent threads
+    and processes is not interleaved (pipes keep writes up to PIPE_BUF bytes
+    whole, files opened in append mode keep every write whole). Streams
+    without a file descriptor (and all streams on Windows, where they may be
+    wrapped by colorama) get a single write call instead.
+
+    :param      stream:  The stream
+    :type       stream:  TextIO
+    :param      data:    The text or encoded bytes
+    :type       data:    Union[str, bytes]
+    """
+    try:
+        fd = None if sys.platform == "win32" else stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = None
+
+    if fd is None:
+        if isinstance(data, bytes):
+            stream.flush()
+            stream.buffer.write(data)
+            stream.buffer.flush()
+        else:
+            stream.write(data)
+            stream.flush()
+        return
+
+    if isinstance(data, str):
+        data = data.encode(
+            getattr(stream, "encoding", None) or "utf-8",
+            getattr(stream, "errors", None) or "strict",
+        )
+
+    # keep order with text written earlier through the stream buffer
+    stream.flush()
+
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+class _FlushTimer:
+    """
+    One daemon thread which flushes buffered sinks (and rate limiters, see
+    ratelimit.RateLimiter.flush) at their deadlines, shared by all instances.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._deadlines = {}
+        self._thread = None
+
+    def schedule(self, sink, delay: float) -> None:
+        """
+        Flush sink after delay, unless it is already scheduled earlier.
+
+        :param      sink:   The sink (any object with flush method)
+        :type       sink:   BufferedSink
+        :param      delay:  The delay (sec)
+        :type       delay:  float
+        """
+        deadline = time.monotonic() + delay
+
+        with self._lock:
+            scheduled = self._deadlines.get(sink)
+            if scheduled is not None and scheduled <= deadline:
+                return
+
+            self._deadlines[sink] = deadline
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="pycolor-palette-flush", daemon=True
+                )
+                self._thread.start()
+
+            self._wakeup.notify()
+
+    def cancel(self, sink) -> None:
+        """
+        Cancel scheduled flush of sink.
+
+        :param      sink:  The sink
+        :type       sink:  BufferedSink
+        """
+        with self._lock:
+            self._deadlines.pop(sink, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while True:
+                    now = time.monotonic()
+                    due = [s for s, d in self._deadlines.items() if d <= now]
+                    if due:
+                        break
+
+                    timeout = None
+                    if self._deadlines:
+                        timeout = min(self._deadlines.values()) - now
+                    self._wakeup.wait(timeout)
+
+                for sink in due:
+                    del self._deadlines[sink]
+
+            for sink in due:
+                try:
+                    sink.flush()
+                except Exception:
+                    traceback.print_exc(file=sys.stderr)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._deadlines = {}
+        self._thread = None
+
+
+_flush_timer = _FlushTimer()
+
+# sinks handled by the single atexit hook and fork handler of the module
+_buffered_sinks = weakref.WeakSet()
+_queue_sinks = weakref.WeakSet()
+
+
+class BufferedSink:
+    """
+    Buffered writer which batches many messages into a single stream write.
+    Opt-in: text is delayed in its own buffer, so it may come out after text
+    written later to the stream directly (print, stderr).
+
+    Buffer is flushed when it grows over max_buffer_bytes, when the oldest
+    buffered message is older than max_latency seconds (checked by a timer
+    thread shared by all sinks), on explicit flush() and at interpreter exit.
+    When line_buffering is set (by default, when the stream is a terminal)
+    every write is flushed at once.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        max_buffer_bytes: int = DEFAULT_MAX_BUFFER_BYTES,
+        max_latency: float = DEFAULT_MAX_LATENCY,
+        line_buffering: Optional[bool] = None,
+    ):
+        """
+        Initialization.
+
+        :param      stream:            The stream (sys.stdout at write time if None)
+        :type       stream:            Optional[TextIO]
+        :param      max_buffer_bytes:  The maximum buffer size before flush
+        :type       max_buffer_bytes:  int
+        :param      max_latency:       The maximum delay of buffered text (sec)
+        :type       max_latency:       float
+        :param      line_buffering:    Flush every write (auto-detect if None)
+        :type       line_buffering:    Optional[bool]
+        """
+        self._stream = stream
+        self.max_buffer_bytes = max_buffer_bytes
+        self.max_latency = max_latency
+        self.line_buffering = line_buffering
+
+        self._buffer = []
+        self._size = 0
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+        self._probed = (None, False)
+
+        _buffered_sinks.add(self)
+
+    @property
+    def stream(self) -> TextIO:
+        """
+        Target stream.
+
+        :returns:   stream
+        :rtype:     TextIO
+        """
+        return self._stream if self._stream is not None else sys.stdout
+
+    def _is_line_buffered(self) -> bool:
+        if self.line_buffering is not None:
+            return self.line_buffering
+
+        stream = self.stream
+        probed_stream, isatty = self._probed
+
+        if stream is not probed_stream:
+            try:
+                isatty = stream.isatty()
+            except (AttributeError, ValueError):
+                isatty = False
+            self._probed = (stream, isatty)
+
+        return isatty
+
+    def write(self, text: str) -> None:
+        """
+        Write text to buffer.
+
+        :param      text:  The text
+        :type       text:  str
+        """
+        with self._lock:
+            self._buffer.append(text)
+            self._size += len(text)
+
+            if self._batch_depth:
+                return
+
+            if self._size >= self.max_buffer_bytes or self._is_line_buffered():
+                self._flush()
+            else:
+                _flush_timer.schedule(self, self.max_latency)
+
+    def flush(self) -> None:
+        """
+        Write buffered text to stream and flush it.
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+
+        _flush_timer.cancel(self)
+
+        data = "".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+
+        stream = self.stream
+        stream.write(data)
+        stream.flush()
+
+    @contextmanager
+    def batch(self):
+        """
+        Collect all messages written inside the block and emit them with one
+        write when the outermost block exits.
+        """
+        with self._lock:
+            self._batch_depth += 1
+
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+
+                if not self._batch_depth:
+                    self._flush()
+
+
+class StreamSink:
+    """
+    Sink without its own buffer, every message is written to the stream at
+    once, so it keeps its order with print() and other writes to the stream.
+    With autoflush the stream is flushed after every message, otherwise the
+    stream buffering applies (line buffered on terminals, block buffered on
+    pipes and files).
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, autoflush: bool = True):
+        """
+        Initialization.
+
+        :param      stream:     The stream (sys.stdout at write time if None)
+        :type       stream:     Optional[TextIO]
+        :param      autoflush:  Flush the stream after every message
+        :type       autoflush:  bool
+        """
+        self._stream = stream
+        self.autoflush = autoflush
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def write(self, text: str) -> None:
+        stream = self.stream
+        stream.write(text)
+        if self.autoflush:
+            stream.flush()
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+
+class QueueSink:
+    """
+    Asynchronous sink: callers only enqueue records, a single background thread
+    formats them and writes them to the target sink.
+
+    A record is either a ready text (write) or a formatter with its arguments
+    (submit), so expensive formatting runs off the caller's thread; with
+    PyDBG_Obj(queue=sink) callers enqueue only raw arguments and call site.
+    Records queued at interpreter exit are drained.
+    """
+
+    def __init__(
+        self,
+        target=None,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        overflow: str = "block",
+    ):
+        """
+        Initialization.
+
+        :param      target:      The target sink (StreamSink of stdout if None)
+        :type       target:      StreamSink
+        :param      maxsize:     The maximum number of queued records
+        :type       maxsize:     int
+        :param      overflow:    Policy of full queue: block, drop_oldest, drop_new
+        :type       overflow:    str
+
+        :raises     ValueError:  invalid maxsize or overflow policy
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+
+        self.target = target if target is not None else StreamSink()
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+
+        self._queue = deque()
+        self._unfinished = 0
+        self._closed = False
+        self._thread = None
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+
+        _queue_sinks.add(self)
+
+    def write(self, text: str) -> None:
+        """
+        Enqueue ready text.
+
+        :param      text:  The text
+        :type       text:  str
+        """
+        self._put((None, (text,)))
+
+    def submit(self, formatter: Callable[..., str], *args) -> None:
+        """
+        Enqueue record which is formatted by formatter(*args) on the writer thread.
+
+        :param      formatter:  The formatter returning text
+        :type       formatter:  Callable[..., str]
+        :param      args:       The arguments of formatter
+        :type       args:       list
+        """
+        self._put((formatter, args))
+
+    def wrap(self, formatter: Callable[..., str]) -> Callable[..., None]:
+        """
+        Make output function which defers formatter to the writer thread, e.g.
+        highlighting of ready text: sink.wrap(colorizeOutput).
+
+        :param      formatter:  The formatter returning text
+        :type       formatter:  Callable[..., str]
+
+        :returns:   output function
+        :rtype:     Callable[..., None]
+        """
+
+        def output(*args):
+            self._put((formatter, args))
+
+        return output
+
+    def _put(self, record) -> None:
+        with self._lock:
+            enqueued = self._enqueue(record)
+
+        if not enqueued:
+            # closed: written synchronously, without holding the lock
+            self._write_records([record])
+
+    def _enqueue(self, record) -> bool:
+        """
+        Append record to queue, must be called with the lock held.
+
+        :param      record:  The record
+        :type       record:  tuple
+
+        :returns:   False if the sink is closed and record must be written
+                    synchronously
+        :rtype:     bool
+        """
+        if self._closed:
+            return False
+
+        if self._thread is None:
+            self._start()
+
+        if len(self._queue) >= self.maxsize:
+            if self.overflow == "drop_new":
+                self.dropped += 1
+                return True
+            elif self.overflow == "drop_oldest":
+                self._queue.popleft()
+                self._unfinished -= 1
+                self.dropped += 1
+            else:
+                while len(self._queue) >= self.maxsize and not self._closed:
+                    self._not_full.wait()
+
+                if self._closed:
+                    return False
+
+        self._queue.append(record)
+        self._unfinished += 1
+        self._not_empty.notify()
+        return True
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="pycolor-palette-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+
+                if not self._queue:
+                    return
+
+                records = list(self._queue)
+                self._queue.clear()
+                self._not_full.notify_all()
+
+            self._write_records(records)
+
+            with self._lock:
+                self._unfinished -= len(records)
+                if self._unfinished <= 0:
+                    self._unfinished = 0
+                    self._all_done.notify_all()
+
+    def _write_records(self, records) -> None:
+        texts = []
+
+        for formatter, args in records:
+            try:
+                texts.append(args[0] if formatter is None else formatter(*args))
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+        try:
+            self.target.write("".join(texts))
+            self.target.flush()
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+
+    def flush(self) -> None:
+        """
+        Wait until all queued records are written.
+        """
+        with self._lock:
+            while self._unfinished and self._thread is not None and not self._closed:
+                self._all_done.wait()
+
+        self.target.flush()
+
+    def close(self) -> None:
+        """
+        Drain the queue and stop the writer thread. Records written after close
+        are written synchronously.
+        """
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            thread = self._thread
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        self.target.flush()
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+        self._queue.clear()
+        self._unfinished = 0
+        self._thread = None
+
+
+def _close_sinks() -> None:
+    for sink in list(_queue_sinks):
+        sink.close()
+
+    for sink in list(_buffered_sinks):
+        sink.flush()
+
+
+def _reset_sinks_after_fork() -> None:
+    _flush_timer._reset_after_fork()
+
+    for sink in list(_queue_sinks):
+        sink._reset_after_fork()
+
+
+atexit.register(_close_sinks)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_sinks_after_fork)
+
+# writes to the buffer of sys.stdout, which is flushed by the stream itself
+_sink = StreamSink(autoflush=False)
+
+
+def get_sink():
+    """
+    Get current sink of paint output.
+
+    :returns:   sink
+    :rtype:     StreamSink
+    """
+    return _sink
+
+
+def set_sink(sink) -> None:
+    """
+    Set sink of paint output. Sink is any object with write(text) and flush()
+    methods, the previous sink is flushed.
+
+    :param      sink:  The sink
+    :type       sink:  BufferedSink
+    """
+    global _sink
+
+    _sink.flush()
+    _sink = sink
+
+
+@contextmanager
+def batch():
+    """
+    Emit all paint messages of the block with one write to the stream.
+    """
+    sink = _sink
+    batch_method = getattr(sink, "batch", None)
+
+    if batch_method is None:
+        yield sink
+        sink.flush()
+        return
+
+    with batch_method():
+        yield sink
@@ -0,0 +1,175 @@
+"""
+Structured records of paint messages and PyDBG_Obj calls.
+
+A record is written as one JSON line or one msgpack object per call, without
+padding, line wrapping and highlighting, so log pipelines can ingest it
+without parsing colored text. msgpack is optional.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import json
+import sys
+from typing import Callable, NamedTuple, Optional, TextIO, Tuple, Union
+
+from pycolor_palette_loguru.sinks import write_atomic
+
+RECORD_FORMATS = ("json", "msgpack")
+
+# C implementation of JSON string escaping (with quotes)
+_encode_string = json.encoder.encode_basestring
+
+
+class Record(NamedTuple):
+    """
+    Record of one paint message or PyDBG_Obj call.
+
+    context is (file, line, function), args are (label, repr) pairs, label is
+    None for literals and arguments without source, extra are (key, value)
+    pairs of values bound with context.bind_context.
+    """
+
+    timestamp: float
+    level: str
+    message: Optional[str] = None
+    context: Optional[Tuple[str, int, str]] = None
+    args: Tuple[Tuple[Optional[str], str], ...] = ()
+    extra: Tuple[Tuple[str, str], ...] = ()
+
+
+def record_to_dict(record: Record) -> dict:
+    """
+    Convert record to dict, fields which are not set are omitted. Level and
+    message are converted to str.
+
+    :param      record:  The record
+    :type       record:  Record
+
+    :returns:   record dict
+    :rtype:     dict
+    """
+    result = {"timestamp": record.timestamp, "level": str(record.level)}
+
+    if record.message is not None:
+        result["message"] = str(record.message)
+
+    if record.context is not None:
+        file, line, function = record.context
+        result["context"] = {"file": file, "line": line, "function": function}
+
+    if record.args:
+        result["args"] = [
+            {"label": label, "repr": value} for label, value in record.args
+        ]
+
+    if record.extra:
+        result["extra"] = dict(record.extra)
+
+    return result
+
+
+def encode_json(record: Record) -> str:
+    """
+    Encode record as compact JSON, keys are in record_to_dict order. Level and
+    message are converted to str.
+
+    :param      record:  The record
+    :type       record:  Record
+
+    :returns:   JSON text (without newline)
+    :rtype:     str
+    """
+    parts = [
+        f'{{"timestamp":{record.timestamp!r},'
+        f'"level":{_encode_string(str(record.level))}'
+    ]
+
+    if record.message is not None:
+        parts.append(f',"message":{_encode_string(str(record.message))}')
+
+    if record.context is not None:
+        file, line, function = record.context
+        parts.append(
+            f',"context":{{"file":{_encode_string(file)},"line":{line:d},'
+            f'"function":{_encode_string(function)}}}'
+        )
+
+    if record.args:
+        parts.append(',"args":[')
+        parts.append(
+            ",".join(
+                f'{{"label":{"null" if label is None else _encode_string(label)},'
+                f'"repr":{_encode_string(value)}}}'
+                for label, value in record.args
+            )
+        )
+        parts.append("]")
+
+    if record.extra:
+        parts.append(',"extra":{')
+        parts.append(
+            ",".join(
+                f"{_encode_string(key)}:{_encode_string(value)}"
+                for key, value in record.extra
+            )
+        )
+        parts.append("}")
+
+    parts.append("}")
+    return "".join(parts)
+
+
+def encode_msgpack(record: Record) -> bytes:
+    """
+    Encode record with msgpack.
+
+    :param      record:  The record
+    :type       record:  Record
+
+    :returns:   msgpack object
+    :rtype:     bytes
+    """
+    import msgpack
+
+    return msgpack.packb(record_to_dict(record))
+
+
+def get_encoder(record_format: str) -> Callable[[Record], Union[str, bytes]]:
+    """
+    Get encoder of record format.
+
+    :param      record_format:  The record format ("json" or "msgpack")
+    :type       record_format:  str
+
+    :returns:   encoder
+    :rtype:     Callable[[Record], Union[str, bytes]]
+
+    :raises     ValueError:   unknown record format
+    :raises     ImportError:  msgpack is not installed
+    """
+    if record_format not in RECORD_FORMATS:
+        raise ValueError(f"record format must be one of {RECORD_FORMATS}")
+
+    if record_format == "msgpack":
+        try:
+            import msgpack  # noqa: F401
+        except ImportError:
+            raise ImportError("msgpack record format requires msgpack") from None
+
+        return encode_msgpack
+
+    return encode_json
+
+
+def write_record(data: Union[str, bytes], stream: Optional[TextIO] = None) -> None:
+    """
+    Write encoded record with one write (see sinks.write_atomic): JSON as a
+    line, msgpack as bytes.
+
+    :param      data:    The encoded record
+    :type       data:    Union[str, bytes]
+    :param      stream:  The stream (sys.stderr if None)
+    :type       stream:  Optional[TextIO]
+    """
+    stream = sys.stderr if stream is None else stream
+    write_atomic(stream, data if isinstance(data, bytes) else f"{data}\n")
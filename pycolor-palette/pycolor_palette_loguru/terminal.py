@@ -0,0 +1,133 @@
+"""
+Terminal color capability detection.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+import os
+import sys
+import weakref
+from typing import Mapping, Optional, TextIO
+
+FORCE_COLOR_LEVELS = {"1": "16", "2": "256", "3": "truecolor"}
+
+_cache = weakref.WeakKeyDictionary()
+
+
+def _hinted_mode(environ: Mapping[str, str]) -> str:
+    """
+    Get color mode from COLORTERM and TERM hints.
+
+    :param      environ:  The environment
+    :type       environ:  Mapping[str, str]
+
+    :returns:   mode
+    :rtype:     str
+    """
+    colorterm = environ.get("COLORTERM", "").lower()
+    term = environ.get("TERM", "").lower()
+
+    if colorterm in ("truecolor", "24bit") or term.endswith("-direct"):
+        return "truecolor"
+    elif "256" in term:
+        return "256"
+    elif sys.platform == "win32" and not term:
+        return "truecolor"
+
+    return "16"
+
+
+def probe_color_mode(
+    stream: Optional[TextIO] = None, environ: Optional[Mapping[str, str]] = None
+) -> Optional[str]:
+    """
+    Detect color mode of stream without caching.
+
+    NO_COLOR disables colors, FORCE_COLOR enables them even if stream is not a
+    terminal (FORCE_COLOR=0 disables, 1/2/3 select 16/256/truecolor), TERM=dumb
+    and non-terminal streams disable colors. The mode is taken from COLORTERM
+    and TERM.
+
+    :param      stream:   The stream (sys.stdout if None)
+    :type       stream:   Optional[TextIO]
+    :param      environ:  The environment (os.environ if None)
+    :type       environ:  Optional[Mapping[str, str]]
+
+    :returns:   None (no colors), "16", "256" or "truecolor"
+    :rtype:     Optional[str]
+    """
+    stream = sys.stdout if stream is None else stream
+    environ = os.environ if environ is None else environ
+
+    if environ.get("NO_COLOR"):
+        return None
+
+    force = environ.get("FORCE_COLOR")
+    if force is not None:
+        force = force.strip().lower()
+
+        if force in ("0", "false", "no"):
+            return None
+        elif force in FORCE_COLOR_LEVELS:
+            return FORCE_COLOR_LEVELS[force]
+
+        return _hinted_mode(environ)
+
+    if environ.get("TERM", "").lower() == "dumb":
+        return None
+
+    try:
+        isatty = stream.isatty()
+    except (AttributeError, ValueError):
+        isatty = False
+
+    return _hinted_mode(environ) if isatty else None
+
+
+def color_mode(stream: Optional[TextIO] = None) -> Optional[str]:
+    """
+    Detect color mode of stream, the result is cached per stream.
+
+    :param      stream:  The stream (sys.stdout if None)
+    :type       stream:  Optional[TextIO]
+
+    :returns:   None (no colors), "16", "256" or "truecolor"
+    :rtype:     Optional[str]
+    """
+    stream = sys.stdout if stream is None else stream
+
+    try:
+        return _cache[stream]
+    except KeyError:
+        pass
+    except TypeError:
+        return probe_color_mode(stream)
+
+    mode = probe_color_mode(stream)
+
+    try:
+        _cache[stream] = mode
+    except TypeError:
+        pass
+
+    return mode
+
+
+def supports_color(stream: Optional[TextIO] = None) -> bool:
+    """
+    Check if stream supports colors (cached per stream).
+
+    :param      stream:  The stream (sys.stdout if None)
+    :type       stream:  Optional[TextIO]
+
+    :returns:   True if colors are supported, False otherwise.
+    :rtype:     bool
+    """
+    return color_mode(stream) is not None
+
+
+def clear_cache() -> None:
+    """
+    Forget cached capabilities, e.g. after environment changes.
+    """
+    _cache.clear()
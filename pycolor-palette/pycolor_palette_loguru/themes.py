@@ -0,0 +1,79 @@
+"""
+Compiled highlighting themes.
+
+Terminal256Formatter resolves every style color to the nearest 256-color index
+when it is created. Themes are compiled once per (style, mode) into a flat
+token type -> escapes table and shared by all highlighting paths, so switching
+themes is a dict lookup.
+
+Copyright Alexeev Bronislav (C) 2024
+"""
+
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple, Type
+
+from pygments.formatters import Terminal256Formatter, TerminalTrueColorFormatter
+from pygments.style import Style
+from pygments.token import _TokenType
+
+THEME_CACHE_SIZE = 32
+THEME_FORMATTERS = {
+    "256": Terminal256Formatter,
+    "truecolor": TerminalTrueColorFormatter,
+}
+
+EscapeTable = Dict[_TokenType, Tuple[str, str]]
+
+
+class CompiledTheme(NamedTuple):
+    """
+    Pygments style compiled for one color mode.
+    """
+
+    style: Type[Style]
+    mode: str
+    formatter: Terminal256Formatter
+    escapes: EscapeTable
+
+    def escape(self, ttype: _TokenType) -> Tuple[str, str]:
+        """
+        Get escapes of token type, resolved through parent types the same way
+        the formatter does it.
+
+        :param      ttype:  The token type
+        :type       ttype:  _TokenType
+
+        :returns:   (on, off), ("", "") if the type has no style
+        :rtype:     Tuple[str, str]
+        """
+        while ttype:
+            try:
+                return self.escapes[ttype]
+            except KeyError:
+                ttype = ttype.parent
+
+        return ("", "")
+
+
+@lru_cache(maxsize=THEME_CACHE_SIZE)
+def compile_theme(style: Type[Style], mode: str = "256") -> CompiledTheme:
+    """
+    Compile style into escape table, the result is cached per (style, mode).
+
+    :param      style:  The style (e.g. CatppuccinMocha)
+    :type       style:  Type[Style]
+    :param      mode:   The color mode ("256" or "truecolor")
+    :type       mode:   str
+
+    :returns:   compiled theme
+    :rtype:     CompiledTheme
+
+    :raises     ValueError:  unknown mode
+    """
+    if mode not in THEME_FORMATTERS:
+        raise ValueError(f"mode must be one of {', '.join(THEME_FORMATTERS)}")
+
+    formatter = THEME_FORMATTERS[mode](style=style)
+    escapes = {ttype: formatter.style_string[str(ttype)] for ttype, _ in style}
+
+    return CompiledTheme(style, mode, formatter, escapes)
@@ -0,0 +1,30 @@
+import io
+
+import pytest
+
+from pycolor_palette_loguru import paint, sinks
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.fixture(autouse=True)
+def line_buffered_paint():
+    previous = sinks.get_sink()
+    sinks.set_sink(sinks.StreamSink())
+    yield
+    sinks.set_sink(previous)
+
+
+@pytest.fixture(autouse=True)
+def truecolor_paint():
+    paint.set_color_mode("truecolor")
+    yield
+    paint.set_color_mode("truecolor")
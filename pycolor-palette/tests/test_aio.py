@@ -0,0 +1,56 @@
+import asyncio
+
+from conftest import CountingStream
+from pycolor_palette_loguru import aio
+from pycolor_palette_loguru.aio import AsyncSink
+from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+
+
+def test_writes_in_one_tick_are_coalesced():
+    stream = CountingStream()
+    sink = AsyncSink(stream)
+
+    async def main():
+        for i in range(100):
+            sink.write(f"{i}\n")
+        await asyncio.sleep(0)
+        await sink.aclose()
+
+    asyncio.run(main())
+
+    assert stream.writes == 1
+    assert stream.getvalue().count("\n") == 100
+
+
+def test_message_functions(monkeypatch):
+    stream = CountingStream()
+    monkeypatch.setattr(aio, "stdout_sink", AsyncSink(stream))
+
+    async def main():
+        await asyncio.gather(
+            aio.ainfo_message("one"),
+            aio.awarn_message("two"),
+            aio.aother_message("three", "OTHER", True),
+        )
+        await aio.aclose()
+
+    asyncio.run(main())
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3
+    assert "INFO" in lines[0] and lines[0].endswith("one\x1b[0m")
+    assert stream.writes == 1
+
+
+def test_pydbg_acall(monkeypatch):
+    stream = CountingStream()
+    monkeypatch.setattr(aio, "stderr_sink", AsyncSink(stream, high_water=0))
+    pydbg_obj = PyDBG_Obj(outputFunction=aio.acolorized_stderr_print)
+
+    async def main():
+        value = 42
+        result = await pydbg_obj.acall(value)
+        return result
+
+    assert asyncio.run(main()) == 42
+    assert "value" in stream.getvalue()
@@ -0,0 +1,92 @@
+import pytest
+
+from pycolor_palette_loguru.logger import timing
+from pycolor_palette_loguru.logger.timing import TimingStats, benchmark
+
+
+def test_stats_values():
+    stats = TimingStats()
+
+    for elapsed in (10, 20, 30, 40, 50):
+        stats.add(elapsed)
+
+    assert stats.count == 5
+    assert stats.min == 10
+    assert stats.max == 50
+    assert stats.mean == 30
+    assert stats.stddev == pytest.approx(15.811, rel=1e-3)
+    assert stats.p50 == 30
+    assert stats.p99 == pytest.approx(49.6)
+
+
+def test_stats_reservoir_is_bounded():
+    stats = TimingStats(reservoir_size=16)
+
+    for elapsed in range(1000):
+        stats.add(elapsed)
+
+    assert stats.count == 1000
+    assert len(stats._reservoir) == 16
+    assert stats.max == 999
+
+
+def test_benchmark_passes_arguments_and_result(capsys):
+    @benchmark
+    def add(a, b=0):
+        return a + b
+
+    assert add(1, b=2) == 3
+    assert add(5) == 5
+    assert add.stats.count == 2
+    assert add.__name__ == "add"
+    assert capsys.readouterr().out == ""
+
+    add.report()
+    assert "benchmark" in capsys.readouterr().out
+
+
+def test_benchmark_reports_every_n_calls(capsys):
+    @benchmark(report_every=3)
+    def noop():
+        pass
+
+    for _ in range(7):
+        noop()
+
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+
+def test_percentiles_sort_once(monkeypatch):
+    stats = TimingStats()
+    for elapsed in (10, 20, 30, 40, 50):
+        stats.add(elapsed)
+
+    sorts = []
+    monkeypatch.setattr(
+        timing, "sorted", lambda v: sorts.append(1) or sorted(v), raising=False
+    )
+    assert stats.percentiles(50, 99) == (30, pytest.approx(49.6))
+    stats.summary()
+    assert len(sorts) == 2
+
+
+def test_benchmark_repeat_and_warmup(capsys):
+    calls = []
+
+    @benchmark(repeat=10, warmup=3, report=None)
+    def work(value):
+        calls.append(value)
+        return value * 2
+
+    assert work(2) == 4
+    assert len(calls) == 13
+    assert work.stats.count == 10
+    assert capsys.readouterr().out == ""
+
+
+def test_benchmark_invalid_arguments():
+    with pytest.raises(ValueError):
+        benchmark(repeat=0)
+
+    with pytest.raises(ValueError):
+        benchmark(report="stdout")
@@ -0,0 +1,26 @@
+import json
+
+from benchmarks import run
+
+
+def test_find_regressions():
+    baseline = {"fast": 100.0, "slow": 100.0, "new": 0.0}
+    results = {"fast": 110.0, "slow": 150.0, "new": 10.0, "added": 5.0}
+
+    assert run.find_regressions(results, baseline, threshold=0.2) == {"slow": 0.5}
+
+
+def test_main_saves_results_and_checks_baseline(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({"results": {"PyDBG_Obj.disabled": 1e-3}}), encoding="utf-8"
+    )
+
+    assert run.main(["PyDBG_Obj.disabled", "--quick", "--output", str(output)]) == 0
+    saved = json.loads(output.read_text(encoding="utf-8"))
+    assert saved["unit"] == "ns"
+    assert saved["results"]["PyDBG_Obj.disabled"] > 0
+
+    assert run.main(["PyDBG_Obj.disabled", "--quick", "--baseline", str(baseline)]) == 1
+    assert "regression: PyDBG_Obj.disabled" in capsys.readouterr().out
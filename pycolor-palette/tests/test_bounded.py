@@ -0,0 +1,147 @@
+import collections
+
+import pytest
+
+from pycolor_palette_loguru.logger.bounded import ReprLimits, clip, truncate
+from pycolor_palette_loguru.logger.logger import PyDBG_Obj, argumentToString
+
+
+def test_small_objects_are_not_copied():
+    value = {"a": [1, 2, (3, 4)], "b": {"c", "d"}}
+
+    assert truncate(value) is value
+
+
+def test_items_limit_is_shared():
+    value = [list(range(10)), list(range(10))]
+
+    assert repr(truncate(value, ReprLimits(max_items=6))) == (
+        "[[0, 1, 2, 3, <6 more items>], [<10 more items>]]"
+    )
+
+
+def test_depth_limit():
+    value = [[[[1]]]]
+
+    assert repr(truncate(value, ReprLimits(max_depth=2))) == "[[<list with 1 items>]]"
+
+
+def test_dict_limit():
+    value = {i: str(i) for i in range(5)}
+
+    assert repr(truncate(value, ReprLimits(max_items=2))) == (
+        "{0: '0', 1: '1', <3 more items>: ...}"
+    )
+
+
+def test_summaries():
+    limits = ReprLimits(max_length=4)
+
+    assert repr(truncate("abcdefgh", limits)) == "'abcd'... <8 characters>"
+    assert repr(truncate(b"abcdefgh", limits)) == "b'abcd'... <8 bytes>"
+
+
+def test_container_subclasses_are_truncated():
+    limits = ReprLimits(max_items=4)
+    Point = collections.namedtuple("Point", "x y")
+    ordered = collections.OrderedDict((i, "x" * 20) for i in range(3))
+    nested = collections.defaultdict(list, {"a": collections.deque(range(10))})
+
+    assert repr(truncate(collections.deque(range(10)), limits)) == (
+        "[0, 1, 2, 3, <6 more items>]"
+    )
+    assert repr(truncate(Point(list(range(10)), 2), limits)) == (
+        "([0, 1, <8 more items>], 2)"
+    )
+    assert repr(truncate(ordered, ReprLimits(max_length=2))) == (
+        "{0: 'xx'... <20 characters>, "
+        "1: 'xx'... <20 characters>, "
+        "2: 'xx'... <20 characters>}"
+    )
+    assert repr(truncate(nested, limits)) == "{'a': [0, 1, 2, <7 more items>]}"
+
+
+def test_subclasses_within_limits_are_not_copied():
+    Point = collections.namedtuple("Point", "x y")
+    value = collections.OrderedDict(a=Point(1, 2), b=collections.deque([3]))
+
+    assert truncate(value) is value
+
+
+def test_dict_keys_are_truncated():
+    value = {"k" * 20: 1, ("a", "b" * 20): 2}
+
+    assert repr(truncate(value, ReprLimits(max_length=2))) == (
+        "{'kk'... <20 characters>: 1, ('a', 'bb'... <20 characters>): 2}"
+    )
+
+
+def test_ndarray_summary():
+    np = pytest.importorskip("numpy")
+
+    small = np.arange(3)
+    assert truncate(small) is small
+    assert repr(truncate(np.zeros((100, 100)))) == (
+        "<ndarray shape=(100, 100) dtype=float64>"
+    )
+
+
+def test_clip():
+    assert clip("abc", 3) == "abc"
+    assert clip("abcdef", 3) == "abc... <6 characters>"
+
+
+def test_argument_to_string_default_limits():
+    text = argumentToString(list(range(100000)))
+
+    assert text.endswith("<99000 more items>]")
+
+
+def test_configure_output_limits():
+    lines = []
+    pydbg_obj = PyDBG_Obj(outputFunction=lines.append, maxItems=3)
+    value = list(range(10))
+
+    pydbg_obj(value)
+    pydbg_obj.configureOutput(maxItems=100, maxLength=10)
+    pydbg_obj(value)
+
+    assert lines == [
+        "pydbg_obj | value: [0, 1, 2, <7 more items>]",
+        "pydbg_obj | value: [0, 1, 2, ... <30 characters>",
+    ]
+
+
+class HashableSequence(collections.abc.Sequence):
+    def __init__(self, size):
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if index >= self.size:
+            raise IndexError(index)
+        return index
+
+    def __hash__(self):
+        return self.size
+
+
+def test_keys_and_set_elements_stay_hashable():
+    key = HashableSequence(3000)
+    value = {key: 1, (key, "b"): {key}}
+
+    assert repr(truncate(value)) == (
+        "{<HashableSequence with 3000 items>: 1, "
+        "(<HashableSequence with 3000 items>, 'b'): "
+        "{<HashableSequence with 3000 items>}}"
+    )
+    assert "HashableSequence with 3000 items" in PyDBG_Obj().format(value)
+
+
+def test_compact_sequences_are_not_copied():
+    value = range(10**9)
+
+    assert truncate(value) is value
+    assert argumentToString(value) == "range(0, 1000000000)"
@@ -0,0 +1,34 @@
+import pycolor_palette_loguru.logger.logger as pydbg_logger
+from pycolor_palette_loguru.pygments_colorschemes import (
+    CatppuccinMocha,
+    GruvboxDark,
+)
+
+
+def test_colorize_is_cached():
+    pydbg_logger.highlightCache.clear()
+
+    first = pydbg_logger.colorize("value: 12")
+    second = pydbg_logger.colorize("value: 12")
+
+    assert first is second
+    info = pydbg_logger.highlightCacheInfo()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_theme_change_clears_cache():
+    try:
+        catppuccin = pydbg_logger.colorize("value: 'text'")
+        pydbg_logger.set_default_theme(GruvboxDark)
+
+        assert pydbg_logger.highlightCacheInfo().currsize == 0
+        assert pydbg_logger.colorize("value: 'text'") != catppuccin
+    finally:
+        pydbg_logger.set_default_theme(CatppuccinMocha)
+
+
+def test_long_text_is_not_cached():
+    pydbg_logger.highlightCache.clear()
+    pydbg_logger.colorize("x" * (pydbg_logger.MAX_CACHED_HIGHLIGHT_LENGTH + 1))
+
+    assert pydbg_logger.highlightCacheInfo().currsize == 0
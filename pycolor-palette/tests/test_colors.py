@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from pycolor_palette_loguru import paint
+from pycolor_palette_loguru.colors import (
+    ANSI_16_PALETTE,
+    XTERM_256_PALETTE,
+    rgb_to_16,
+    rgb_to_256,
+)
+from pycolor_palette_loguru.paint import BG, FG
+
+
+def distance(first, second):
+    return sum((a - b) ** 2 for a, b in zip(first, second))
+
+
+def brute_force(color, palette, start=0):
+    return min(range(start, len(palette)), key=lambda i: distance(color, palette[i]))
+
+
+@pytest.fixture
+def colors():
+    rng = random.Random(0)
+    return [tuple(rng.randrange(256) for _ in range(3)) for _ in range(500)]
+
+
+def test_rgb_to_256_is_nearest(colors):
+    for color in colors:
+        expected = brute_force(color, XTERM_256_PALETTE, start=16)
+        assert distance(color, XTERM_256_PALETTE[rgb_to_256(*color)]) == distance(
+            color, XTERM_256_PALETTE[expected]
+        )
+
+
+def test_rgb_to_256_exact_colors():
+    assert rgb_to_256(0, 0, 0) == 16
+    assert rgb_to_256(255, 255, 255) == 231
+    assert rgb_to_256(128, 128, 128) == 244
+
+
+def test_rgb_to_16_lookup(colors):
+    for color in colors:
+        # lookup table holds the nearest color of every 16x16x16 grid cell center
+        center = tuple((channel & 0xF0) + 8 for channel in color)
+        assert rgb_to_16(*color) == brute_force(center, ANSI_16_PALETTE)
+
+
+def test_color_modes():
+    try:
+        assert FG.rgb(255, 0, 0) == "\x1b[38;2;255;0;0m"
+        assert BG.rgb(255, 0, 0) == "\x1b[48;2;255;0;0m"
+
+        paint.set_color_mode("256")
+        assert FG.rgb(255, 0, 0) == "\x1b[38;5;196m"
+        assert BG.rgb(255, 0, 0) == "\x1b[48;5;196m"
+
+        paint.set_color_mode("16")
+        assert FG.rgb(255, 0, 0) == "\x1b[91m"
+        assert BG.rgb(0, 0, 0) == "\x1b[40m"
+    finally:
+        paint.set_color_mode("truecolor")
+
+    with pytest.raises(ValueError):
+        paint.set_color_mode("1000")
+
+
+def test_color256():
+    assert FG.color256(196) == "\x1b[38;5;196m"
+    assert BG.color256(16) == "\x1b[48;5;16m"
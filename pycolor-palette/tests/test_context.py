@@ -0,0 +1,94 @@
+import asyncio
+import json
+import threading
+
+from pycolor_palette_loguru import paint
+from pycolor_palette_loguru.context import (
+    bind_context,
+    context_text,
+    get_context,
+    push_context,
+    reset_context,
+)
+from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+
+
+def test_bind_context_is_rendered_once():
+    assert context_text() == ""
+
+    with bind_context(request_id=42, task="worker"):
+        assert context_text() == "[request_id=42 task=worker] "
+
+        with bind_context(request_id=43):
+            assert get_context() == {"request_id": "43", "task": "worker"}
+
+        assert context_text() == "[request_id=42 task=worker] "
+
+    assert get_context() == {}
+
+
+def test_push_and_reset_context():
+    token = push_context(user="alice")
+    try:
+        assert context_text() == "[user=alice] "
+    finally:
+        reset_context(token)
+
+    assert context_text() == ""
+
+
+def test_context_is_per_thread():
+    texts = {}
+
+    def work(number):
+        with bind_context(thread=number):
+            barrier.wait()
+            texts[number] = context_text()
+
+    barrier = threading.Barrier(4)
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert texts == {n: f"[thread={n}] " for n in range(4)}
+
+
+def test_context_is_per_task():
+    lines = []
+    pydbg_obj = PyDBG_Obj(outputFunction=lines.append)
+
+    async def handle(request_id):
+        with bind_context(request_id=request_id):
+            await asyncio.sleep(0)
+            pydbg_obj(request_id)
+
+    async def main():
+        with bind_context(app="server"):
+            await asyncio.gather(handle(1), handle(2))
+
+    asyncio.run(main())
+
+    assert sorted(lines) == [
+        "pydbg_obj | [app=server request_id=1] request_id: 1",
+        "pydbg_obj | [app=server request_id=2] request_id: 2",
+    ]
+
+
+def test_paint_message_context(capsys):
+    with bind_context(request_id=7):
+        paint.info_message("text")
+
+    assert "::: [request_id=7] text" in capsys.readouterr().out
+
+
+def test_record_context(capsys):
+    try:
+        paint.set_record_format("json")
+        with bind_context(request_id=7):
+            paint.info_message("text")
+    finally:
+        paint.set_record_format(None)
+
+    assert json.loads(capsys.readouterr().out)["extra"] == {"request_id": "7"}
@@ -0,0 +1,59 @@
+import pytest
+
+from pycolor_palette_loguru import gradient
+from pycolor_palette_loguru.paint import FG, Style
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "python":
+        monkeypatch.setattr(gradient, "np", None)
+    elif gradient.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def as_tuples(colors):
+    return [tuple(int(c) for c in color) for color in colors]
+
+
+def test_linear_gradient(backend):
+    colors = as_tuples(gradient.linear_gradient(RED, BLUE, 5))
+
+    assert colors[0] == RED
+    assert colors[-1] == BLUE
+    assert colors[2] == (128, 0, 128)
+    assert len(colors) == 5
+
+
+def test_multi_stop_gradient(backend):
+    colors = as_tuples(
+        gradient.multi_stop_gradient([RED, (0, 255, 0), BLUE], 5, [0, 0.25, 1])
+    )
+
+    assert colors == [RED, (0, 255, 0), (0, 170, 85), (0, 85, 170), BLUE]
+
+
+def test_colorize_cells_shares_escapes(backend):
+    rendered = gradient.colorize_cells(["a", "b", "c", "d"], [RED, RED, BLUE, BLUE])
+
+    assert rendered == f"{FG.rgb(*RED)}ab{FG.rgb(*BLUE)}cd{Style.reset}"
+
+
+def test_colorize_cells_string(backend):
+    rendered = gradient.colorize_cells("abc", [RED, BLUE, RED], reset=False)
+
+    assert rendered == f"{FG.rgb(*RED)}a{FG.rgb(*BLUE)}b{FG.rgb(*RED)}c"
+
+
+def test_colorize_cells_length_mismatch(backend):
+    with pytest.raises(ValueError):
+        gradient.colorize_cells("abc", [RED])
+
+
+def test_gradient_text(backend):
+    assert gradient.gradient_text("", [RED, BLUE]) == ""
+    assert gradient.gradient_text("ab", [RED, BLUE]).count("\x1b[38;2;") == 2
@@ -0,0 +1,65 @@
+import pprint
+
+import pytest
+from pygments import highlight
+from pygments.formatters import Terminal256Formatter, TerminalTrueColorFormatter
+from pygments.lexers import Python3Lexer
+
+from pycolor_palette_loguru.highlight import fast_highlight
+from pycolor_palette_loguru.pygments_colorschemes import (
+    CatppuccinMocha,
+    GruvboxDark,
+    SolarizedDark,
+)
+from pycolor_palette_loguru.themes import compile_theme
+
+VALUES = [
+    12,
+    -3,
+    12.12,
+    1.5e-7,
+    10**30,
+    "Hello",
+    "",
+    True,
+    None,
+    (1,),
+    [1, 2, 3, "Hi", True, 12.2],
+    {1: "HELLO", 2: "WORLD"},
+    {"a": [1, {"b": (2, 3)}]},
+    list(range(40)),
+]
+LABELS = ["num", "obj.attr", "x[0]", "f(x)", "a + b", "lst[1:2]", "x == y"]
+
+
+@pytest.mark.parametrize(
+    "mode,formatter_class",
+    [("256", Terminal256Formatter), ("truecolor", TerminalTrueColorFormatter)],
+)
+@pytest.mark.parametrize("theme", [CatppuccinMocha, SolarizedDark, GruvboxDark])
+def test_same_output_as_pygments(theme, mode, formatter_class):
+    formatter = formatter_class(style=theme)
+    lexer = Python3Lexer(ensurenl=False)
+    table = compile_theme(theme, mode).escapes
+
+    for value in VALUES:
+        for label in LABELS:
+            text = f"pydbg_obj |  | {label}: {pprint.pformat(value)}"
+            assert fast_highlight(text, table) == highlight(text, lexer, formatter)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "len(x): 1",
+        "s: 'it\\'s'",
+        "b: b'x'",
+        "o: <object object at 0x7f>",
+        "c: (3+4j)",
+        "\nx: 1",
+        "s: 'a%s'",
+    ],
+)
+def test_unsupported_text(text):
+    table = compile_theme(CatppuccinMocha).escapes
+    assert fast_highlight(text, table) is None
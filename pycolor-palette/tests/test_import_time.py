@@ -0,0 +1,61 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("pygments", "executing", "asttokens", "colorama", "loguru")
+IMPORT_TIME_BUDGET = 0.25  # Seconds, the best of IMPORT_RUNS.
+IMPORT_RUNS = 5
+
+SCRIPT = """
+import json, sys, time
+
+started = time.perf_counter()
+import pycolor_palette_loguru
+from pycolor_palette_loguru.paint import info_message
+elapsed = time.perf_counter() - started
+
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def import_in_subprocess():
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, check=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_paint_does_not_import_heavy_modules():
+    modules = import_in_subprocess()["modules"]
+
+    assert not [name for name in modules if name.split(".")[0] in HEAVY_MODULES]
+
+
+def test_import_time_budget():
+    best = min(import_in_subprocess()["elapsed"] for _ in range(IMPORT_RUNS))
+
+    assert best < IMPORT_TIME_BUDGET
+
+
+def test_lazy_attributes():
+    import pycolor_palette_loguru
+
+    assert "PyDBG_Obj" in dir(pycolor_palette_loguru)
+    assert pycolor_palette_loguru.PyDBG_Obj.__name__ == "PyDBG_Obj"
+    assert pycolor_palette_loguru.GruvboxDark.__name__ == "GruvboxDark"
+
+    with pytest.raises(AttributeError):
+        pycolor_palette_loguru.missing
+
+
+def test_lazy_attributes_of_logger():
+    from pycolor_palette_loguru import logger
+
+    assert "TimingStats" in dir(logger)
+    assert logger.TimingStats.__name__ == "TimingStats"
+    assert logger.__dict__["TimingStats"] is logger.TimingStats
+
+    with pytest.raises(AttributeError, match="pycolor_palette_loguru.logger"):
+        logger.missing
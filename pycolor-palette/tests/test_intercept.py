@@ -0,0 +1,79 @@
+import logging
+import sys
+
+import pytest
+from loguru import logger
+
+import pycolor_palette_loguru.logger.logger as pydbg_logger
+from pycolor_palette_loguru.logger.logger import InterceptHandler
+
+
+@pytest.fixture
+def records():
+    messages = []
+    logger.remove()
+    logger.add(messages.append, level="INFO", format="{message}")
+    handler = InterceptHandler()
+    stdlib_logger = logging.getLogger("pycolor-intercept-test")
+    stdlib_logger.addHandler(handler)
+    stdlib_logger.setLevel(logging.DEBUG)
+    stdlib_logger.propagate = False
+
+    yield stdlib_logger, handler, messages
+
+    stdlib_logger.removeHandler(handler)
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+def test_caller_is_reported(records):
+    stdlib_logger, handler, messages = records
+
+    for _ in range(3):
+        stdlib_logger.warning("hello %s", "world")
+        line = test_caller_is_reported.__code__.co_firstlineno + 4
+
+    assert [m.record["message"] for m in messages] == ["hello world"] * 3
+    assert {m.record["function"] for m in messages} == {"test_caller_is_reported"}
+    assert {m.record["line"] for m in messages} == {line}
+    assert {m.record["level"].name for m in messages} == {"WARNING"}
+    assert handler.depths.info().hits == 2
+
+
+def test_records_below_level_are_rejected(records):
+    stdlib_logger, handler, messages = records
+
+    stdlib_logger.debug("hidden")
+
+    assert messages == []
+    assert len(handler.depths) == 0
+
+
+def test_added_levels_are_mapped(records):
+    stdlib_logger, handler, messages = records
+
+    stdlib_logger.log(25, "before")
+    logging.addLevelName(25, "NOTICE25")
+    logger.level("NOTICE25", no=25)
+    stdlib_logger.log(25, "after")
+
+    assert [m.record["level"].name for m in messages] == ["Level 25", "NOTICE25"]
+
+
+def test_public_api_without_loguru_internals(records, monkeypatch):
+    stdlib_logger, handler, messages = records
+
+    class PublicLogger:
+        level = staticmethod(logger.level)
+        opt = staticmethod(logger.opt)
+
+    monkeypatch.setattr(pydbg_logger, "logger", PublicLogger())
+    stdlib_logger.debug("hidden")
+    stdlib_logger.warning("hello %s", "world")
+    stdlib_logger.log(26, "custom")
+
+    assert [m.record["message"] for m in messages] == ["hello world", "custom"]
+    assert [m.record["level"].name for m in messages] == ["WARNING", "Level 26"]
+    assert {m.record["function"] for m in messages} == {
+        "test_public_api_without_loguru_internals"
+    }
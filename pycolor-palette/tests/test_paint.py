@@ -0,0 +1,77 @@
+import pytest
+
+from pycolor_palette_loguru import paint
+from pycolor_palette_loguru.paint import BG, FG, Style
+
+
+def legacy_message(prefix, stamp, level, text):
+    return "%s%-*s | %-*s%s ::: %s%s" % (
+        prefix,
+        20,
+        stamp,
+        20,
+        level,
+        Style.reset,
+        text,
+        Style.reset,
+    )
+
+
+def stamp_of(line):
+    return line[line.index("20") :][:19]
+
+
+@pytest.mark.parametrize(
+    "function, color, level",
+    [
+        (paint.info_message, "green", "INFO"),
+        (paint.warn_message, "yellow", "WARNING"),
+        (paint.error_message, "red", "ERROR"),
+        (paint.debug_message, "blue", "DEBUG"),
+    ],
+)
+@pytest.mark.parametrize("highlight", [False, True])
+def test_message_bytes(capsys, function, color, level, highlight):
+    function("text", highlight)
+    line = capsys.readouterr().out
+
+    prefix = f"{getattr(BG, color)}{FG.black}" if highlight else f"{getattr(FG, color)}"
+    assert line == legacy_message(prefix, stamp_of(line), level, "text") + "\n"
+
+
+def test_other_message_bytes(capsys):
+    paint.other_message("text", "CUSTOM", True)
+    line = capsys.readouterr().out
+
+    prefix = f"{BG.magenta}{FG.black}"
+    assert line == legacy_message(prefix, stamp_of(line), "CUSTOM", "text") + "\n"
+
+
+def test_run_exception_bytes(capsys):
+    with pytest.raises(Exception, match="boom"):
+        paint.run_exception("boom")
+
+    line = capsys.readouterr().out
+    expected = "%s%s%-*s | %-*s ::: %s%s" % (
+        Style.bold,
+        FG.red,
+        20,
+        stamp_of(line),
+        20,
+        "EXCEPTION",
+        "boom",
+        Style.reset,
+    )
+    assert line == expected + "\n"
+
+
+def test_timestamp_is_cached_per_second(monkeypatch):
+    now = [1700000000.1]
+    monkeypatch.setattr(paint, "time", lambda: now[0])
+
+    first = paint.timestamp()
+    now[0] += 0.5
+    assert paint.timestamp() is first
+
+    now[0] += 1
+    assert paint.timestamp() != first
@@ -0,0 +1,235 @@
+import asyncio
+import io
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import pycolor_palette_loguru.logger.logger as pydbg_logger
+from pycolor_palette_loguru.logger.logger import PyDBG_Obj, callSiteCache
+
+
+def make_pydbg(lines):
+    return PyDBG_Obj(outputFunction=lines.append)
+
+
+def test_pydbg_passthrough():
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+
+    assert pydbg_obj() is None
+    assert pydbg_obj(1) == 1
+    assert pydbg_obj(1, 2) == (1, 2)
+
+
+def test_pydbg_labels():
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+    value = 12
+
+    pydbg_obj(value, 42, "text")
+
+    assert lines == ["pydbg_obj | value: 12; 42; 'text'"]
+
+
+def test_pydbg_call_site_is_cached():
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+    callSiteCache.clear()
+
+    for i in range(10):
+        pydbg_obj(i)
+
+    info = PyDBG_Obj.callSiteCacheInfo()
+    assert info.misses == 1
+    assert info.hits == 9
+    assert lines[-1] == "pydbg_obj | i: 9"
+
+
+def test_call_site_cache_hit_makes_no_system_call(monkeypatch):
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+    stats = []
+
+    def stat(*args, **kwargs):
+        stats.append(args)
+        return os_stat(*args, **kwargs)
+
+    os_stat = os.stat
+    for i in range(3):
+        if i == 1:
+            monkeypatch.setattr(os, "stat", stat)
+        pydbg_obj(i)
+
+    assert stats == []
+    assert lines[-1] == "pydbg_obj | i: 2"
+
+
+def test_colorized_stderr_print_writes_to_stderr(capsys, monkeypatch):
+    monkeypatch.setattr(pydbg_logger.colorama, "init", None)
+    monkeypatch.setattr(pydbg_logger.colorama, "deinit", None)
+
+    pydbg_logger.colorized_stderr_print("value: 12; 42")
+    pydbg_logger.stderrPrint("text")
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == pydbg_logger.colorizeOutput("value: 12; 42") + "text\n"
+
+
+def test_colorized_stderr_print_to_chosen_stream():
+    stream = io.StringIO()
+
+    pydbg_logger.colorized_stderr_print("value: 12", stream)
+    assert "value" in stream.getvalue()
+
+    other = io.StringIO()
+    pydbg_logger.setOutputStream(other)
+    try:
+        pydbg_logger.colorized_stderr_print("value: 13")
+    finally:
+        pydbg_logger.setOutputStream(None)
+
+    assert "13" in other.getvalue()
+
+
+def test_production_mode():
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+
+    try:
+        pydbg_logger.setProductionMode(True)
+        pydbg_obj.enable()
+
+        assert pydbg_obj() is None
+        assert pydbg_obj(1) == 1
+        assert pydbg_obj(1, 2) == (1, 2)
+        assert asyncio.run(pydbg_obj.acall(3)) == 3
+    finally:
+        pydbg_logger.setProductionMode(False)
+
+    assert lines == []
+    pydbg_obj(1)
+    assert lines == ["pydbg_obj | 1"]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(value, "True") for value in pydbg_logger.PRODUCTION_VALUES]
+    + [("1", "False"), ("on", "False")],
+)
+def test_production_mode_environment_variable(value, expected):
+    script = (
+        "import pycolor_palette_loguru.logger.logger as pydbg_logger;"
+        "print(pydbg_logger.productionMode)"
+    )
+    environ = dict(os.environ, PYCOLOR_PYDBG=value.upper())
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        env=environ,
+        text=True,
+    ).stdout
+
+    assert output.strip() == expected
+
+
+def test_concurrent_calls_write_whole_records():
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+    values = {"key": "x" * 200}
+
+    def work(number):
+        for i in range(50):
+            pydbg_obj(number, values)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(lines) == 400
+    assert len(set(lines)) == 8
+    assert all(line.startswith("pydbg_obj | ") for line in lines)
+    assert all(line.endswith("x'}") for line in lines)
+
+
+def test_configure_output_during_calls():
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+    stop = threading.Event()
+
+    def reconfigure():
+        while not stop.is_set():
+            pydbg_obj.configureOutput(prefix="a | ", outputFunction=lines.append)
+            pydbg_obj.configureOutput(prefix="b | ", outputFunction=lines.append)
+
+    thread = threading.Thread(target=reconfigure)
+    thread.start()
+    try:
+        for i in range(300):
+            pydbg_obj(i)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert len(lines) == 300
+    assert all(line.split(" | ")[0] in ("pydbg_obj", "a", "b") for line in lines)
+
+
+def test_config_is_replaced_as_a_whole():
+    pydbg_obj = PyDBG_Obj()
+    config = pydbg_obj.config
+
+    pydbg_obj.configureOutput(prefix="debug | ", maxItems=10)
+    pydbg_obj.includeContext = True
+
+    assert config.prefix == pydbg_logger.DEFAULT_PREFIX
+    assert pydbg_obj.prefix == "debug | "
+    assert pydbg_obj.reprLimits.max_items == 10
+    assert pydbg_obj.config.includeContext
+
+
+def test_context_without_getframeinfo(monkeypatch):
+    lines = []
+    pydbg_obj = PyDBG_Obj(outputFunction=lines.append, includeContext=True)
+
+    def getframeinfo(*args, **kwargs):
+        raise AssertionError("getframeinfo called")
+
+    monkeypatch.setattr(pydbg_logger.inspect, "getframeinfo", getframeinfo)
+    value = 1
+    pydbg_obj(value)
+
+    line = sys._getframe().f_lineno - 2
+    assert lines == [
+        f"pydbg_obj | test_pydbg.py:{line} in test_context_without_getframeinfo()"
+        f"{pydbg_logger.DEFAULT_CONTEXT_DELIMITER}value: 1"
+    ]
+
+
+def test_context_is_computed_only_when_shown(monkeypatch):
+    lines = []
+    pydbg_obj = make_pydbg(lines)
+
+    def getContext(*args, **kwargs):
+        raise AssertionError("context computed")
+
+    monkeypatch.setattr(pydbg_obj, "_getContext", getContext)
+    pydbg_obj(1)
+
+    assert lines == ["pydbg_obj | 1"]
+
+
+def test_code_context_is_memoized():
+    code = test_code_context_is_memoized.__code__
+
+    context = pydbg_logger.codeContext(code, False)
+
+    assert context == ("test_pydbg.py", "test_code_context_is_memoized")
+    assert pydbg_logger.codeContext(code, False) is context
+    assert pydbg_logger.codeContext(code, True)[0] == os.path.realpath(__file__)
@@ -0,0 +1,241 @@
+import io
+import json
+import threading
+
+import pytest
+
+from pycolor_palette_loguru import paint
+from pycolor_palette_loguru.context import bind_context
+from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+from pycolor_palette_loguru.ratelimit import RateLimiter, loguru_filter
+from pycolor_palette_loguru.sinks import QueueSink, StreamSink
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_token_bucket(clock):
+    limiter = RateLimiter(rate=2, burst=3, summary_interval=60, clock=clock)
+
+    assert [limiter.check("key") for _ in range(5)] == [0, 0, 0, None, None]
+    assert limiter.check("other") == 0
+
+    clock.now = 0.5
+    assert limiter.check("key") == 2
+    assert limiter.check("key") is None
+
+
+def test_periodic_summary(clock):
+    limiter = RateLimiter(rate=0, burst=1, summary_interval=5, clock=clock)
+
+    assert limiter.check("key") == 0
+    for _ in range(1000):
+        assert limiter.check("key") is None
+
+    clock.now = 5
+    assert limiter.check("key") == 1000
+    assert limiter.check("key") is None
+
+
+def test_keys_are_bounded(clock):
+    limiter = RateLimiter(rate=0, burst=1, max_keys=2, clock=clock)
+
+    for key in ("a", "b", "c"):
+        assert limiter.check(key) == 0
+
+    assert limiter.check("a") == 0
+    assert limiter.check("c") is None
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=-1)
+    with pytest.raises(ValueError):
+        RateLimiter(burst=0)
+
+
+def test_paint_messages(capsys, clock):
+    paint.set_rate_limiter(
+        RateLimiter(rate=0, burst=2, summary_interval=5, clock=clock)
+    )
+    try:
+        paint.set_record_format("json")
+        for _ in range(100):
+            paint.error_message("broken")
+        paint.info_message("broken")
+        clock.now = 5
+        paint.error_message("broken")
+        with bind_context(request=7):
+            paint.error_message("broken")
+            paint.error_message("broken")
+        clock.now = 10
+        paint.get_rate_limiter().flush()
+    finally:
+        paint.set_record_format(None)
+        paint.set_rate_limiter(None)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["level"], r["message"]) for r in records] == [
+        ("ERROR", "broken"),
+        ("ERROR", "broken"),
+        ("INFO", "broken"),
+        ("ERROR", "broken (message repeated 98 times)"),
+        ("ERROR", "broken (message repeated 2 times)"),
+    ]
+    assert records[-1]["extra"] == {"request": "7"}
+    assert paint.get_rate_limiter() is None
+
+
+def test_paint_messages_which_are_not_text(capsys, clock):
+    limiter = RateLimiter(rate=0, burst=1, clock=clock)
+    paint.set_rate_limiter(limiter)
+    try:
+        paint.set_record_format("json")
+        paint.info_message(["not", "hashable"])
+        paint.info_message(["not", "hashable"])
+        paint.other_message(12, 3)
+    finally:
+        limiter.clear()
+        paint.set_record_format(None)
+        paint.set_rate_limiter(None)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["level"], r["message"]) for r in records] == [
+        ("INFO", "['not', 'hashable']"),
+        ("3", "12"),
+    ]
+
+
+def test_pydbg_is_limited_by_call_site_and_arguments(clock):
+    lines = []
+    limiter = RateLimiter(rate=0, burst=1, summary_interval=5, clock=clock)
+    pydbg_obj = PyDBG_Obj(outputFunction=lines.append, rateLimiter=limiter)
+
+    for now in [0] * 9 + [5]:
+        clock.now = now
+        assert pydbg_obj(now) == now
+    for _ in range(4):
+        pydbg_obj("other")
+
+    assert lines == [
+        "pydbg_obj | now: 0",
+        "pydbg_obj | now: 5",
+        "pydbg_obj | 'other'",
+    ]
+
+    limiter.flush()
+    assert lines[3:] == ["pydbg_obj | now: 0 (message repeated 8 times)"]
+
+    limiter.flush(force=True)
+    assert lines[4:] == ["pydbg_obj | 'other' (message repeated 3 times)"]
+
+
+def test_pydbg_formats_arguments_once(clock):
+    formatted = []
+
+    def argToString(obj):
+        formatted.append(obj)
+        return repr(obj)
+
+    lines = []
+    limiter = RateLimiter(rate=0, burst=1, summary_interval=5, clock=clock)
+    pydbg_obj = PyDBG_Obj(
+        outputFunction=lines.append,
+        argToStringFunction=argToString,
+        rateLimiter=limiter,
+    )
+
+    for _ in range(5):
+        pydbg_obj(42)
+    assert formatted == [42]
+
+    formatted.clear()
+    for _ in range(5):
+        pydbg_obj([1])
+    assert formatted == [[1]] * 5
+    assert lines == ["pydbg_obj | 42", "pydbg_obj | [1]"]
+
+
+def test_pydbg_queue_is_limited_on_writer_thread(clock):
+    stream = io.StringIO()
+    sink = QueueSink(StreamSink(stream))
+    limiter = RateLimiter(rate=0, burst=1, summary_interval=5, clock=clock)
+    pydbg_obj = PyDBG_Obj(queue=sink, recordFormat="json", rateLimiter=limiter)
+
+    for _ in range(3):
+        pydbg_obj("spam")
+    sink.flush()
+    limiter.flush(force=True)
+    sink.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [r.get("message") for r in records] == [None, "message repeated 2 times"]
+
+
+def test_flush_outputs_pending_summaries(clock):
+    summaries = []
+    limiter = RateLimiter(rate=0, burst=1, summary_interval=5, clock=clock)
+
+    for _ in range(4):
+        limiter.check("key", summaries.append)
+    limiter.check("quiet")
+    limiter.check("quiet")
+
+    clock.now = 4
+    limiter.flush()
+    assert summaries == []
+
+    clock.now = 5
+    limiter.flush()
+    limiter.flush()
+    assert summaries == [3]
+    assert limiter.check("key", summaries.append) is None
+
+    limiter.clear()
+    limiter.flush(force=True)
+    assert summaries == [3]
+
+
+def test_summary_is_flushed_by_timer():
+    flushed = threading.Event()
+    summaries = []
+
+    def summary(repeated):
+        summaries.append(repeated)
+        flushed.set()
+
+    limiter = RateLimiter(rate=0, burst=1, summary_interval=0.05)
+    for _ in range(5):
+        limiter.check("key", summary)
+
+    assert flushed.wait(5)
+    assert summaries == [4]
+
+
+def test_loguru_filter_checks_record_once(clock):
+    limit = loguru_filter(RateLimiter(rate=0, burst=1, summary_interval=5, clock=clock))
+    level = type("Level", (), {"no": 40})()
+
+    def record():
+        return {"level": level, "message": "broken"}
+
+    first = record()
+    assert limit(first) and limit(first)
+
+    second = record()
+    assert not limit(second) and not limit(second)
+
+    clock.now = 5
+    third = record()
+    assert limit(third)
+    assert third["message"] == "broken (message repeated 1 times)"
@@ -0,0 +1,149 @@
+import gzip
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+from loguru import logger
+
+from pycolor_palette_loguru.logger.compression import wait_compression
+from pycolor_palette_loguru.logger.logger import bufferedStderrSink, setup_logger
+from pycolor_palette_loguru.ratelimit import RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    root_handlers = logging.root.handlers[:]
+    root_level = logging.root.level
+
+    yield
+
+    logger.remove()
+    logger.add(sys.stderr)
+    logging.root.handlers[:] = root_handlers
+    logging.root.setLevel(root_level)
+
+
+def test_file_sink_with_background_compression(tmp_path):
+    path = tmp_path / "app.log"
+    setup_logger("INFO", files=[path], stderr=False, rotation="200 B", compression="gz")
+
+    for i in range(10):
+        logger.info("message {} {}", i, "x" * 40)
+    logger.remove()
+    wait_compression()
+
+    compressed = sorted(tmp_path.glob("app.*.log.gz"))
+    assert compressed
+    assert not list(tmp_path.glob("app.*.log"))
+    logged = b"".join(gzip.decompress(file.read_bytes()) for file in compressed)
+    assert b"message 0" in logged
+
+
+def test_file_options_override_defaults(tmp_path):
+    path = tmp_path / "errors.log"
+    setup_logger("DEBUG", files=[{"sink": path, "level": "ERROR"}], stderr=False)
+
+    logger.warning("skipped")
+    logger.error("written")
+    logger.remove()
+
+    assert "written" in path.read_text()
+    assert "skipped" not in path.read_text()
+
+
+def test_buffered_stderr_sink(capsys):
+    setup_logger("INFO", buffered=True, format="{level} {message}")
+
+    logger.info("buffered")
+    logger.error("flushed")
+
+    assert capsys.readouterr().err.splitlines()[-2:] == [
+        "INFO buffered",
+        "ERROR flushed",
+    ]
+
+
+def test_stderr_sink_keeps_order_with_pydbg(tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text(
+        "from loguru import logger\n"
+        "from pycolor_palette_loguru.logger.logger import PyDBG_Obj, setup_logger\n"
+        "setup_logger('DEBUG', format='{message}')\n"
+        "logger.debug('first')\n"
+        "PyDBG_Obj()('second')\n"
+        "logger.debug('third')\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    err = subprocess.run(
+        [sys.executable, str(script)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=dict(os.environ, PYTHONPATH=root),
+    ).stderr
+
+    lines = [line for line in err.splitlines() if "configured" not in line]
+    assert len(lines) == 3
+    assert lines[0] == "first"
+    assert "second" in lines[1]
+    assert lines[2] == "third"
+
+
+def test_buffered_stderr_sink_is_reused():
+    from pycolor_palette_loguru import sinks
+
+    buffered = len(sinks._buffered_sinks)
+    for _ in range(3):
+        setup_logger("INFO", buffered=True, format="{level} {message}")
+
+    assert bufferedStderrSink() is bufferedStderrSink()
+    assert len(sinks._buffered_sinks) <= buffered + 1
+
+
+def test_stdlib_loggers_are_silenced():
+    noisy = logging.getLogger("pycolor-noisy-library")
+    noisy.setLevel(logging.DEBUG)
+    ignored = logging.getLogger("pycolor-ignored-library")
+
+    try:
+        setup_logger("WARNING", ignored=["pycolor-ignored-library"], stderr=False)
+
+        assert not noisy.isEnabledFor(logging.INFO)
+        assert noisy.isEnabledFor(logging.WARNING)
+        assert not ignored.isEnabledFor(logging.CRITICAL)
+
+        setup_logger("ERROR", ignored=["pycolor-ignored-library"], stderr=False)
+        assert noisy.level == logging.ERROR
+
+        setup_logger("DEBUG", stderr=False)
+        assert noisy.level == logging.DEBUG
+        assert ignored.level == logging.NOTSET
+        assert ignored.isEnabledFor(logging.DEBUG)
+    finally:
+        noisy.setLevel(logging.NOTSET)
+        ignored.setLevel(logging.NOTSET)
+        logger.enable("pycolor-ignored-library")
+
+
+def test_rate_limiter(tmp_path):
+    path = tmp_path / "app.log"
+    limiter = RateLimiter(burst=3)
+    setup_logger(
+        "INFO",
+        files=[path, tmp_path / "copy.log"],
+        stderr=False,
+        rate_limiter=limiter,
+    )
+
+    for i in range(100):
+        logger.error("broken")
+    limiter.flush(force=True)
+    logger.remove()
+
+    for file in (path, tmp_path / "copy.log"):
+        lines = file.read_text(encoding="utf-8").splitlines()
+        assert sum("broken" in line for line in lines) == 4
+        assert lines[-1].endswith("broken (message repeated 97 times)")
+        assert "test_rate_limiter" in lines[-1]
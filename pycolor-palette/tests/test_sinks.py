@@ -0,0 +1,315 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import CountingStream
+from pycolor_palette_loguru import paint, sinks
+from pycolor_palette_loguru.sinks import (
+    BufferedSink,
+    QueueSink,
+    StreamSink,
+    write_atomic,
+)
+
+
+def test_buffer_is_flushed_when_full():
+    stream = CountingStream()
+    sink = BufferedSink(stream, max_buffer_bytes=10, max_latency=60)
+
+    sink.write("12345")
+    assert stream.getvalue() == ""
+
+    sink.write("67890")
+    assert stream.getvalue() == "1234567890"
+    assert stream.writes == 1
+
+
+def test_buffer_is_flushed_after_latency():
+    stream = CountingStream()
+    sink = BufferedSink(stream, max_latency=0.01)
+
+    sink.write("text")
+    deadline = time.monotonic() + 2
+
+    while not stream.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert stream.getvalue() == "text"
+
+
+def test_buffered_sinks_share_flush_thread():
+    streams = [CountingStream() for _ in range(5)]
+    buffered = [BufferedSink(stream, max_latency=0.01) for stream in streams]
+
+    for sink in buffered:
+        sink.write("text")
+    deadline = time.monotonic() + 2
+
+    while not all(s.getvalue() for s in streams) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert [stream.getvalue() for stream in streams] == ["text"] * 5
+    names = [thread.name for thread in threading.enumerate()]
+    assert names.count("pycolor-palette-flush") == 1
+
+
+def test_default_sink_keeps_order_with_print():
+    code = (
+        "from pycolor_palette_loguru import paint; "
+        "paint.info_message('first'); print('second'); paint.info_message('third')"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert [line.split(" ::: ")[-1] for line in out.splitlines()] == [
+        "first",
+        "second",
+        "third",
+    ]
+
+
+def test_stream_sink_without_autoflush():
+    stream = CountingStream()
+    stream.flushes = 0
+    stream.flush = lambda: setattr(stream, "flushes", stream.flushes + 1)
+    sink = StreamSink(stream, autoflush=False)
+
+    sink.write("a\n")
+    assert stream.getvalue() == "a\n"
+    assert stream.flushes == 0
+
+
+def test_line_buffering():
+    stream = CountingStream()
+    sink = BufferedSink(stream, line_buffering=True)
+
+    sink.write("a\n")
+    sink.write("b\n")
+    assert stream.writes == 2
+
+
+def test_batch_emits_one_write():
+    stream = CountingStream()
+    sinks.set_sink(BufferedSink(stream, line_buffering=True))
+
+    with sinks.batch():
+        for i in range(100):
+            paint.info_message(f"message {i}")
+        assert stream.writes == 0
+
+    assert stream.writes == 1
+    assert stream.getvalue().count("\n") == 100
+
+
+def test_style_write_goes_through_sink():
+    stream = CountingStream()
+    sink = BufferedSink(stream, max_latency=60)
+    sinks.set_sink(sink)
+
+    paint.Style.write("text")
+    assert stream.getvalue() == ""
+
+    sink.flush()
+    assert stream.getvalue() == "text"
+
+
+class SlowStream(CountingStream):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return super().write(text)
+
+
+def test_queue_sink_formats_on_writer_thread():
+    stream = CountingStream()
+    sink = QueueSink(StreamSink(stream))
+    threads = []
+
+    def formatter(text):
+        threads.append(threading.current_thread())
+        return text.upper()
+
+    sink.submit(formatter, "a\n")
+    sink.write("b\n")
+    sink.flush()
+
+    assert stream.getvalue() == "A\nb\n"
+    assert threads[0] is not threading.current_thread()
+    sink.close()
+
+
+def test_queue_sink_drop_new():
+    stream = SlowStream(0.05)
+    sink = QueueSink(StreamSink(stream), maxsize=2, overflow="drop_new")
+
+    for i in range(50):
+        sink.write(f"{i}\n")
+    sink.close()
+
+    lines = stream.getvalue().splitlines()
+    assert sink.dropped > 0
+    assert len(lines) + sink.dropped == 50
+    assert lines[0] == "0"
+
+
+def test_queue_sink_drop_oldest():
+    stream = SlowStream(0.05)
+    sink = QueueSink(StreamSink(stream), maxsize=2, overflow="drop_oldest")
+
+    for i in range(50):
+        sink.write(f"{i}\n")
+    sink.close()
+
+    lines = stream.getvalue().splitlines()
+    assert sink.dropped > 0
+    assert len(lines) + sink.dropped == 50
+    assert lines[-1] == "49"
+
+
+def test_queue_sink_block_keeps_everything():
+    stream = SlowStream(0.001)
+    sink = QueueSink(StreamSink(stream), maxsize=2)
+
+    for i in range(50):
+        sink.write(f"{i}\n")
+    sink.close()
+
+    assert stream.getvalue().splitlines() == [str(i) for i in range(50)]
+    assert sink.dropped == 0
+
+
+def test_queue_sink_with_pydbg():
+    from pycolor_palette_loguru.context import bind_context
+    from pycolor_palette_loguru.logger.logger import PyDBG_Obj, argumentToString
+
+    stream = CountingStream()
+    sink = QueueSink(StreamSink(stream))
+    threads = []
+
+    def argToString(obj):
+        threads.append(threading.current_thread())
+        return argumentToString(obj)
+
+    pydbg_obj = PyDBG_Obj(queue=sink, argToStringFunction=argToString)
+
+    value = 1
+    with bind_context(request_id=7):
+        pydbg_obj(value)
+    sink.close()
+
+    assert "value" in stream.getvalue()
+    assert "request_id" in stream.getvalue()
+    assert "\x1b[" in stream.getvalue()
+    assert threads and threading.current_thread() not in threads
+
+
+def test_queue_sink_with_pydbg_records():
+    from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+
+    stream = CountingStream()
+    sink = QueueSink(StreamSink(stream))
+    pydbg_obj = PyDBG_Obj(queue=sink, recordFormat="json")
+
+    value = 1
+    pydbg_obj(value)
+    sink.close()
+
+    assert '"label":"value"' in stream.getvalue()
+    assert stream.getvalue().endswith("}\n")
+
+    with pytest.raises(ValueError):
+        pydbg_obj.configureOutput(recordFormat="msgpack")
+
+
+def test_queue_sink_records_time_of_call():
+    import json
+
+    from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+
+    stream = CountingStream()
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+        return ""
+
+    sink = QueueSink(StreamSink(stream))
+    pydbg_obj = PyDBG_Obj(queue=sink, recordFormat="json")
+
+    sink.submit(block)
+    started.wait()
+    called = time.time()
+    pydbg_obj(1)
+    time.sleep(0.2)
+    release.set()
+    sink.close()
+
+    record = json.loads(stream.getvalue())
+    assert called <= record["timestamp"] < called + 0.1
+
+
+def test_queue_sink_after_close_writes_without_lock():
+    stream = CountingStream()
+    sink = QueueSink(StreamSink(stream))
+    sink.close()
+    locked = []
+
+    def formatter(text):
+        locked.append(sink._lock.locked())
+        return text
+
+    sink.submit(formatter, "late\n")
+
+    assert stream.getvalue() == "late\n"
+    assert locked == [False]
+
+
+def test_write_atomic_without_file_descriptor():
+    stream = CountingStream()
+
+    write_atomic(stream, "first\nsecond\n")
+
+    assert stream.getvalue() == "first\nsecond\n"
+    assert stream.writes == 1
+
+
+def test_write_atomic_keeps_lines_of_threads_together(tmp_path):
+    path = tmp_path / "out.log"
+    record = "".join(f"line {i}\n" for i in range(20))
+
+    with open(path, "a", encoding="utf-8") as stream:
+        stream.write("header\n")
+
+        def work():
+            for _ in range(50):
+                write_atomic(stream, record)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    text = path.read_text(encoding="utf-8")
+    assert text.startswith("header\n")
+    assert text[len("header\n") :] == record * 200
+
+
+def test_write_atomic_bytes_to_pipe():
+    read_fd, write_fd = os.pipe()
+
+    with os.fdopen(write_fd, "w") as stream:
+        write_atomic(stream, b"\x81\xa5level\xa5DEBUG")
+
+    with os.fdopen(read_fd, "rb") as pipe:
+        assert pipe.read() == b"\x81\xa5level\xa5DEBUG"
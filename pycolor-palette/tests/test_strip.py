@@ -0,0 +1,76 @@
+import ast
+import sys
+
+import pytest
+
+from pycolor_palette_loguru.logger.strip import (
+    install_strip_hook,
+    strip_calls,
+    uninstall_strip_hook,
+)
+
+SOURCE = """
+async def handler(value):
+    await pydbg_obj.acall(value)
+    return value
+
+
+def compute(value):
+    for i in range(3):
+        pydbg_obj(i, value)
+    result = pydbg_obj(value * 2)
+    other.pydbg_obj(value)
+    return result
+"""
+
+
+def test_strip_calls():
+    stripped = ast.unparse(strip_calls(SOURCE))
+
+    assert "pydbg_obj(i, value)" not in stripped
+    assert "pydbg_obj.acall" not in stripped
+    assert "result = pydbg_obj(value * 2)" in stripped
+    assert "other.pydbg_obj(value)" in stripped
+
+
+def test_strip_calls_custom_names():
+    stripped = ast.unparse(strip_calls("dbg(1)\npydbg_obj(2)", names=["dbg"]))
+
+    assert stripped == "pass\npydbg_obj(2)"
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / "strip_example"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    (root / "work.py").write_text(
+        "calls = []\n"
+        "def pydbg_obj(*args):\n"
+        "    calls.append(args)\n"
+        "def run():\n"
+        "    pydbg_obj(1)\n"
+        "    return pydbg_obj(2)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "strip_example"
+
+    uninstall_strip_hook()
+    for name in [name for name in sys.modules if name.startswith("strip_example")]:
+        del sys.modules[name]
+
+
+def test_import_hook(package):
+    install_strip_hook([package])
+    from strip_example import work
+
+    work.run()
+    assert work.calls == [(2,)]
+
+
+def test_import_hook_skips_other_modules(package):
+    install_strip_hook(["other_package"])
+    from strip_example import work
+
+    work.run()
+    assert work.calls == [(1,), (2,)]
@@ -0,0 +1,114 @@
+import io
+import json
+
+import pytest
+
+from pycolor_palette_loguru import paint
+from pycolor_palette_loguru.logger.logger import PyDBG_Obj
+from pycolor_palette_loguru.structured import (
+    Record,
+    encode_json,
+    get_encoder,
+    record_to_dict,
+    write_record,
+)
+
+RECORD = Record(
+    1700000000.25,
+    "INFO",
+    'multi\nline "quoted" é \x00',
+    ("app.py", 12, "main"),
+    (("value", "12"), (None, "'text'")),
+)
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        RECORD,
+        Record(1.0, "DEBUG"),
+        RECORD._replace(message=None),
+        RECORD._replace(extra=(("request_id", "42"), ("task", 'a "b"'))),
+    ],
+)
+def test_encode_json(record):
+    text = encode_json(record)
+
+    assert "\n" not in text
+    assert json.loads(text) == record_to_dict(record)
+
+
+def test_encode_json_converts_to_text():
+    record = Record(1.0, 10, ["message"])
+
+    assert json.loads(encode_json(record)) == record_to_dict(record)
+    assert record_to_dict(record)["message"] == "['message']"
+
+
+def test_encode_msgpack():
+    msgpack = pytest.importorskip("msgpack")
+
+    data = get_encoder("msgpack")(RECORD)
+
+    assert msgpack.unpackb(data) == record_to_dict(RECORD)
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        get_encoder("xml")
+
+
+def test_write_record():
+    stream = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+
+    write_record("{}", stream)
+    write_record(b"\x80", stream)
+
+    assert stream.buffer.getvalue() == b"{}\n\x80"
+
+
+def test_paint_records(capsys):
+    try:
+        paint.set_record_format("json")
+        assert paint.get_record_format() == "json"
+
+        paint.info_message("started", highlight=True)
+        paint.other_message("done", "CUSTOM")
+        with pytest.raises(Exception):
+            paint.run_exception("failed")
+    finally:
+        paint.set_record_format(None)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["level"], r["message"]) for r in records] == [
+        ("INFO", "started"),
+        ("CUSTOM", "done"),
+        ("EXCEPTION", "failed"),
+    ]
+    line = test_paint_records.__code__.co_firstlineno + 5
+    assert records[0]["context"] == {
+        "file": "test_structured.py",
+        "line": line,
+        "function": "test_paint_records",
+    }
+    assert records[1]["context"]["line"] == line + 1
+    assert paint.get_record_format() is None
+
+
+def test_pydbg_records():
+    lines = []
+    pydbg_obj = PyDBG_Obj(recordFormat="json", recordOutputFunction=lines.append)
+    value = 12
+
+    pydbg_obj(value, "text")
+    pydbg_obj.configureOutput(recordFormat=None, outputFunction=lines.append)
+    pydbg_obj(value)
+
+    record = json.loads(lines[0])
+    assert record["level"] == "DEBUG"
+    assert record["context"]["function"] == "test_pydbg_records"
+    assert record["args"] == [
+        {"label": "value", "repr": "12"},
+        {"label": None, "repr": "'text'"},
+    ]
+    assert lines[1] == "pydbg_obj | value: 12"
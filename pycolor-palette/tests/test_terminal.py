@@ -0,0 +1,71 @@
+import io
+
+import pytest
+
+from pycolor_palette_loguru import gradient, paint, terminal
+from pycolor_palette_loguru.paint import BG, FG, Style
+
+
+class TTY(io.StringIO):
+    def isatty(self):
+        return True
+
+
+@pytest.mark.parametrize(
+    "environ, stream, mode",
+    [
+        ({"TERM": "xterm"}, TTY(), "16"),
+        ({"TERM": "xterm-256color"}, TTY(), "256"),
+        ({"TERM": "xterm", "COLORTERM": "truecolor"}, TTY(), "truecolor"),
+        ({"TERM": "xterm-256color"}, io.StringIO(), None),
+        ({"TERM": "dumb"}, TTY(), None),
+        ({"TERM": "xterm", "NO_COLOR": "1"}, TTY(), None),
+        ({"TERM": "xterm-256color", "FORCE_COLOR": "1"}, io.StringIO(), "16"),
+        ({"TERM": "xterm-256color", "FORCE_COLOR": ""}, io.StringIO(), "256"),
+        ({"TERM": "xterm", "FORCE_COLOR": "0"}, TTY(), None),
+    ],
+)
+def test_probe_color_mode(environ, stream, mode):
+    assert terminal.probe_color_mode(stream, environ) == mode
+
+
+def test_color_mode_is_cached(monkeypatch):
+    stream = TTY()
+    monkeypatch.setenv("TERM", "xterm-256color")
+    monkeypatch.delenv("NO_COLOR", raising=False)
+    monkeypatch.delenv("FORCE_COLOR", raising=False)
+    assert terminal.color_mode(stream) == "256"
+
+    monkeypatch.setenv("NO_COLOR", "1")
+    assert terminal.color_mode(stream) == "256"
+
+    terminal.clear_cache()
+    assert terminal.color_mode(stream) is None
+
+
+def test_no_escapes_without_colors(capsys):
+    paint.set_color_mode(None)
+
+    paint.info_message("info", True)
+    paint.other_message("other", "OTHER")
+    with pytest.raises(Exception):
+        paint.run_exception("boom")
+
+    rendered = (
+        FG.red
+        + BG.rgb(1, 2, 3)
+        + FG.color256(1)
+        + Style.bold
+        + Style.to(1, 1)
+        + Style.reset
+        + gradient.gradient_text("abc", [(0, 0, 0), (255, 255, 255)])
+    )
+    out = capsys.readouterr().out
+
+    assert "\x1b" not in out
+    assert rendered == "abc"
+    assert "INFO" in out
+
+    paint.set_color_mode("truecolor")
+    assert FG.red == "\x1b[31m"
+    assert Style.reset == "\x1b[0m"
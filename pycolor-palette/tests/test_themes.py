@@ -0,0 +1,50 @@
+import pytest
+from pygments.formatters import Terminal256Formatter
+from pygments.token import Name, Token
+
+import pycolor_palette_loguru.logger.logger as pydbg_logger
+from pycolor_palette_loguru.pygments_colorschemes import CatppuccinMocha, GruvboxDark
+from pycolor_palette_loguru.themes import compile_theme
+
+
+def test_compiled_once():
+    assert compile_theme(GruvboxDark) is compile_theme(GruvboxDark)
+    assert compile_theme(GruvboxDark) is not compile_theme(GruvboxDark, "truecolor")
+
+
+def test_table_matches_formatter():
+    formatter = Terminal256Formatter(style=CatppuccinMocha)
+    theme = compile_theme(CatppuccinMocha)
+
+    for ttype, _ in CatppuccinMocha:
+        assert theme.escapes[ttype] == formatter.style_string[str(ttype)]
+
+
+def test_escape_resolves_parents():
+    theme = compile_theme(CatppuccinMocha)
+
+    assert theme.escape(Name.Builtin.Custom) == theme.escapes[Name.Builtin]
+    assert theme.escape(Token) == theme.escapes[Token]
+
+
+def test_truecolor_escapes():
+    on, _ = compile_theme(CatppuccinMocha, "truecolor").escapes[Name.Builtin]
+
+    assert on.startswith("\x1b[38;2;")
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        compile_theme(CatppuccinMocha, "16")
+
+
+def test_set_default_theme_reuses_compiled_theme():
+    try:
+        pydbg_logger.set_default_theme(GruvboxDark)
+        gruvbox = pydbg_logger.default_theme
+        pydbg_logger.set_default_theme(CatppuccinMocha)
+        pydbg_logger.set_default_theme(GruvboxDark)
+
+        assert pydbg_logger.default_theme is gruvbox
+    finally:
+        pydbg_logger.set_default_theme(CatppuccinMocha)
@@ -0,0 +1,66 @@
+import pytest
+from loguru import logger
+
+from pycolor_palette_loguru.logger import tracing
+from pycolor_palette_loguru.logger.tracing import debug_func
+
+
+@pytest.fixture
+def messages():
+    records = []
+    handler_id = logger.add(records.append, format="{message}", level="DEBUG")
+    yield records
+    logger.remove(handler_id)
+    tracing.enable_tracing()
+
+
+def test_trace_entry_and_exit(messages):
+    @debug_func
+    def add(a, b=0):
+        return a + b
+
+    assert add(1, b=2) == 3
+    assert len(messages) == 2
+    assert "add(1, b=2)" in messages[0]
+    assert "returned 3" in messages[1]
+    assert messages[1].record["function"] == "test_trace_entry_and_exit"
+
+
+def test_trace_exception(messages):
+    @debug_func
+    def fail():
+        raise KeyError("boom")
+
+    with pytest.raises(KeyError):
+        fail()
+
+    assert "raised KeyError('boom')" in messages[-1]
+
+
+def test_trace_sampling(messages):
+    @debug_func(sample=10)
+    def work(value):
+        return value
+
+    for i in range(100):
+        assert work(i) == i
+
+    assert len(messages) == 20
+
+
+def test_trace_kill_switch(messages):
+    @debug_func
+    def work(value):
+        return value
+
+    tracing.disable_tracing()
+    assert work(5) == 5
+    assert messages == []
+
+
+def test_trace_invalid_sample():
+    with pytest.raises(ValueError):
+        debug_func(sample=0)
+
+    with pytest.raises(ValueError):
+        debug_func(sample=1.5)